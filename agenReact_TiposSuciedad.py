@@ -1,14 +1,23 @@
 import random
 from collections import deque
 
-class SimpleLimpiezaAgente:
+import eventos
+from cobertura import PlanificadorCobertura
+from generacion_mundo import GeneradorMundo
+from memoria_visitados import MemoriaVisitados
+from nucleo import ICONOS_SUCIEDAD, VALORES, Agente, BucleTicks, CapaValores, EntornoBase
+
+class SimpleLimpiezaAgente(Agente):
     """Agente reactivo que limpia suciedad, con memoria y que acumula puntos por valor de suciedad."""
 
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
+    def __init__(self, x, y, cobertura=None, visitados=None):
+        super().__init__(x, y)
         self.puntos_limpieza = 0  ### De 'suciedad_limpiada' a 'puntos_limpieza'
-        self.visitados = set()    # Memoria de posiciones visitadas
+        # Memoria de posiciones visitadas: set de tuplas, o una MemoriaVisitados
+        # (un byte por celda del grid, ver memoria_visitados.py)
+        self.visitados = visitados if visitados is not None else set()
+        ### Cobertura opcional ("frontera" o "barrido"), ver cobertura.py
+        self.cobertura = PlanificadorCobertura(cobertura) if cobertura else None
 
     def percibir(self, entorno):
         """Percibe el VALOR de la suciedad en su posición actual"""
@@ -20,9 +29,9 @@ class SimpleLimpiezaAgente:
         posicion_actual = (self.x, self.y)
         if posicion_actual not in self.visitados:
             self.visitados.add(posicion_actual)
-            print(f"Registrando nueva posición en memoria: {posicion_actual}") 
+            eventos.detalle("Registrando nueva posición en memoria: {}", posicion_actual)
         else:
-            print(f"Posición ya registrada: {posicion_actual}")
+            eventos.detalle("Posición ya registrada: {}", posicion_actual)
         
         ### Reacciona si la percepción es mayor que 0 (hay suciedad)
         if percepcion > 0:
@@ -46,6 +55,13 @@ class SimpleLimpiezaAgente:
             if pos not in self.visitados
         }
 
+        # Estrategia de cobertura: evita el paseo al azar sobre lo ya visitado
+        if self.cobertura is not None:
+            direccion = self.cobertura.siguiente(posicion_actual, movimientos_validos,
+                                                 self.visitados, entorno)
+            if direccion is not None:
+                return direccion
+
         if no_visitados:
             direccion = random.choice(list(no_visitados.keys()))
         elif movimientos_validos: # Asegurarse de que hay movimientos válidos
@@ -56,25 +72,19 @@ class SimpleLimpiezaAgente:
         return direccion
 
 
-class EntornoGrid:
+class EntornoGrid(EntornoBase):
     """Entorno: Grid 2D con suciedad de diferentes valores"""
-    def __init__(self, ancho, alto, num_suciedad):
-        self.ancho = ancho
-        self.alto = alto
+
+    ### Ícono según el valor de la suciedad (💧 1, 💩 2, ☣️ 3)
+    CAPAS = (CapaValores("suciedad", ICONOS_SUCIEDAD),)
+
+    def __init__(self, ancho, alto, num_suciedad, generador=None):
+        super().__init__(ancho, alto)
         ### 'suciedad' ahora es un diccionario { (x, y): valor }
         self.suciedad = {} 
 
-        # Generar suciedad aleatoria con valores
-        for _ in range(num_suciedad):
-            # Para no sobreescribir
-            while True:
-                x = random.randint(0, ancho - 1)
-                y = random.randint(0, alto - 1)
-                if (x, y) not in self.suciedad:
-                    ### Asigna un valor aleatorio (ej. 1, 2 o 3)
-                    valor_suciedad = random.randint(1, 3) 
-                    self.suciedad[(x, y)] = valor_suciedad
-                    break
+        # Generar suciedad aleatoria con valores (ej. 1, 2 o 3), sin sobreescribir
+        self.sembrar(self.suciedad, num_suciedad, VALORES, distintas=True, generador=generador)
 
     def valor_suciedad(self, x, y):
         """Retorna el valor de la suciedad en (x, y), o 0 si no hay."""
@@ -89,52 +99,59 @@ class EntornoGrid:
             return valor
         return 0 # No había suciedad
 
-    def es_valido(self, x, y):
-        """Verifica si la posición está dentro del grid"""
-        return 0 <= x < self.ancho and 0 <= y < self.alto
-
-    def mover_agente(self, agente, direccion):
-        """Mueve el agente en la dirección especificada"""
-        if direccion == "arriba" and agente.y > 0:
-            agente.y -= 1
-        elif direccion == "abajo" and agente.y < self.alto - 1:
-            agente.y += 1
-        elif direccion == "izquierda" and agente.x > 0:
-            agente.x -= 1
-        elif direccion == "derecha" and agente.x < self.ancho - 1:
-            agente.x += 1
-
-    def mostrar(self, agente):
-        """Visualización simple en consola"""
-        mapa_suciedad = {
-            1: "💧", # Suciedad valor 1
-            2: "💩", # Suciedad valor 2
-            3: "☣️"  # Suciedad valor 3
-        }
-        for y in range(self.alto):
-            for x in range(self.ancho):
-                if x == agente.x and y == agente.y:
-                    print("🤖", end=" ")
-                ### Mostrar ícono según el valor de la suciedad
-                elif (x, y) in self.suciedad:
-                    valor = self.suciedad[(x, y)]
-                    print(mapa_suciedad.get(valor, "❓"), end=" ")
-                else:
-                    print("⬜", end=" ")
-            print()
-        print()
+    def items_restantes(self):
+        """Cantidad de celdas que todavía tienen suciedad"""
+        return len(self.suciedad)
 
 
 # Simulación
-def simular_limpieza(pasos=20): 
-    entorno = EntornoGrid(5, 5, 8)
-    agente = SimpleLimpiezaAgente(2, 2)
-
-    print("=== SIMULACIÓN: AGENTE CON MEMORIA Y SUCIEDAD POR VALOR ===\n")
-    print("Estado inicial:")
-    entorno.mostrar(agente)
-
-    for paso in range(pasos):
+def simular_limpieza(pasos=20, denso=False, semilla=None, cobertura=None, memoria_compacta=False,
+                     disposicion=None, grabador=None, metricas=None, ancho=5, alto=5,
+                     ruta_checkpoint=None, checkpoint_cada=10, reanudar=None, bifurcar=None):
+    """'ruta_checkpoint' guarda el estado cada 'checkpoint_cada' pasos;
+    'reanudar' continúa desde un checkpoint (con los mismos parámetros) y
+    'bifurcar' es una semilla nueva para seguir desde ese estado."""
+    # Semilla opcional para episodios reproducibles
+    if semilla is not None:
+        random.seed(semilla)
+
+    # Disposición opcional: mundo con GeneradorMundo (ver generacion_mundo.py)
+    generador = GeneradorMundo(disposicion) if disposicion is not None else None
+    # Otro tamaño de grid mantiene la densidad de suciedad del de 5x5 (8 de 25 celdas)
+    num_suciedad = ancho * alto * 8 // 25
+    if denso:
+        ### Modo de almacenamiento con arreglos NumPy (import solo si se usa)
+        from entorno_denso import EntornoGridDenso
+        entorno = EntornoGridDenso(ancho, alto, num_suciedad, generador=generador)
+    else:
+        entorno = EntornoGrid(ancho, alto, num_suciedad, generador)
+    # Memoria de visitados compacta, un byte por celda del grid (opcional)
+    visitados = MemoriaVisitados(entorno.ancho, entorno.alto) if memoria_compacta else None
+    agente = SimpleLimpiezaAgente(ancho // 2, alto // 2, cobertura, visitados)
+
+    ### Checkpoints opcionales (ver checkpoint.py; NumPy se importa solo en este modo)
+    checkpoints = None
+    paso_inicial = 0
+    if ruta_checkpoint is not None or reanudar is not None:
+        import checkpoint as checkpoints
+    if reanudar is not None:
+        # Continuar desde el checkpoint: mundo, agente, visitados y estado de 'random'
+        paso_inicial = checkpoints.restaurar_limpieza(reanudar, entorno, agente)
+        if bifurcar is not None:
+            random.seed(bifurcar)  # Otra secuencia aleatoria desde el mismo estado
+
+    eventos.info("=== SIMULACIÓN: AGENTE CON MEMORIA Y SUCIEDAD POR VALOR ===\n")
+    eventos.info("Estado inicial:")
+    if eventos.habilitado(eventos.INFO):
+        entorno.mostrar(agente)
+
+    ### Métricas en vivo opcionales (ver metricas.py)
+    if metricas is not None:
+        metricas.iniciar(entorno.items_restantes, lambda: {0: agente.puntos_limpieza})
+    puntos_previos = agente.puntos_limpieza
+
+    def actuar(paso):
+        nonlocal puntos_previos
         percepcion = agente.percibir(entorno)
         accion = agente.decidir_y_actuar(percepcion, entorno)
 
@@ -144,28 +161,51 @@ def simular_limpieza(pasos=20):
             if valor_limpiado > 0:
                 ### Sumar el valor a los puntos del agente
                 agente.puntos_limpieza += valor_limpiado
-                print(f"Paso {paso + 1}: Limpiando en ({agente.x}, {agente.y}). ¡+{valor_limpiado} puntos!")
+                eventos.detalle("Paso {}: Limpiando en ({}, {}). ¡+{} puntos!", paso + 1, agente.x, agente.y, valor_limpiado)
         elif accion != "quieto":
             entorno.mover_agente(agente, accion)
-            print(f"Paso {paso + 1}: Moviéndose {accion}")
+            eventos.detalle("Paso {}: Moviéndose {}", paso + 1, accion)
         else:
-            print(f"Paso {paso + 1}: Quieto.")
+            eventos.detalle("Paso {}: Quieto.", paso + 1)
 
+        ### Trayectoria opcional (GrabadorTrayectorias, ver trayectorias.py)
+        if grabador is not None:
+            grabador.registrar(paso + 1, 0, agente.x, agente.y, accion,
+                               agente.puntos_limpieza - puntos_previos)
+            puntos_previos = agente.puntos_limpieza
 
+    def observar(paso):
         # Mostrar entorno cada ciertos pasos
-        if paso % 3 == 0:
+        if paso % 3 == 0 and eventos.habilitado(eventos.DETALLE):
             entorno.mostrar(agente)
 
-        if len(entorno.suciedad) == 0:
-            print("\n¡Toda la suciedad ha sido limpiada!")
-            break
-
-    print("\nEstado final:")
-    entorno.mostrar(agente)
+    guardar = None
+    if ruta_checkpoint is not None:
+        def guardar(paso):
+            if (paso + 1) % checkpoint_cada == 0:
+                checkpoints.guardar_limpieza(ruta_checkpoint, paso + 1, entorno, agente)
+
+    bucle = BucleTicks(pasos, paso_inicial, metricas)
+    bucle.ejecutar(actuar, observar, terminado=lambda: entorno.items_restantes() == 0,
+                   guardar=guardar)
+    if bucle.completado:
+        eventos.info("\n¡Toda la suciedad ha sido limpiada!")
+
+    eventos.info("\nEstado final:")
+    if eventos.habilitado(eventos.INFO):
+        entorno.mostrar(agente)
     ### Mostrar puntos en lugar de cantidad
-    print(f"Puntos de limpieza totales: {agente.puntos_limpieza}")
-    print(f"Suciedad restante (items): {len(entorno.suciedad)}")
-    print(f"Casillas visitadas: {len(agente.visitados)}")
+    eventos.info("Puntos de limpieza totales: {}", agente.puntos_limpieza)
+    eventos.info("Suciedad restante (items): {}", entorno.items_restantes())
+    eventos.info("Casillas visitadas: {}", len(agente.visitados))
+
+    return {
+        "puntos": agente.puntos_limpieza,
+        "pasos": bucle.pasos_dados,
+        "pasos_hasta_completar": bucle.pasos_dados if bucle.completado else None,
+        "casillas_visitadas": len(agente.visitados),
+        "restante": entorno.items_restantes(),
+    }
 
 
 if __name__ == "__main__":
@@ -1,23 +1,61 @@
 import random
-import numpy as np                 # Para el heatmap
 from collections import deque
-import matplotlib.pyplot as plt    # Para graficar
 
-class AgenteRecolector:
+import eventos
+from generacion_mundo import GeneradorMundo
+from mapa_calor import MapaCalor, MapaCalorDisperso
+from nucleo import VALORES, Agente, BucleTicks, CapaCeldas, EntornoBase
+from planificador import DIRECCIONES, CacheCamposFlujo, planificar
+
+class AgenteRecolector(Agente):
     """Agente que aprende un mapa de calor sobre las zonas ricas en comida,
     y actualiza el mapa al recolectar."""
 
-    def __init__(self, x, y, entorno):
-        self.x = x
-        self.y = y
+    # Lado de la ventana del mapa de calor que se grafica en modo disperso
+    LADO_VISTA_CALOR = 256
+
+    def __init__(self, x, y, entorno, a_estrella=False, cache_campos=None, calor_disperso=False):
+        super().__init__(x, y)
         self.entorno = entorno
         self.energia = 100
         self.puntos_recolectados = 0 # Se usan puntos
-        self.plan = []
+        self.plan = deque()  # Se consume con popleft(), O(1) por paso
+        self.a_estrella = a_estrella  # A* con heurística Manhattan en lugar de BFS
+
+        # Rutas a puntos del heatmap: campos de flujo cacheados por objetivo
+        # (se puede compartir una misma cache entre agentes del mismo entorno)
+        self.cache_campos = cache_campos or CacheCamposFlujo(entorno)
+        self.destino = None  # Punto caliente que se está siguiendo
+        self.campo = None
+        self.version_campo = None
 
         # Memoria espacial (mapa de calor)
-        # Inicia un mapa de 8x8 lleno de ceros.
-        self.mapa_comida = np.zeros((entorno.ancho, entorno.alto))
+        # Inicia un mapa de 8x8 lleno de ceros. La celda más caliente se
+        # consulta sin recorrer el mapa. En mapas grandes, 'calor_disperso'
+        # guarda solo los bloques explorados (float32)
+        if calor_disperso:
+            self.calor = MapaCalorDisperso(entorno.ancho, entorno.alto)
+        else:
+            self.calor = MapaCalor(entorno.ancho, entorno.alto)
+
+    @property
+    def mapa_comida(self):
+        """Arreglo denso [x, y] del mapa de calor, solo lectura: los cambios
+        pasan por 'calor' (con el modo disperso se arma en cada acceso, en
+        O(ancho x alto): para graficar, usar 'vista_calor')"""
+        return self.calor.a_denso()
+
+    def vista_calor(self):
+        """Mapa de calor para graficar: entero en modo denso (sin copia); en
+        modo disperso, una ventana de LADO_VISTA_CALOR celdas de lado que
+        sigue al agente (recortada al mapa, siempre del mismo tamaño)"""
+        if not isinstance(self.calor, MapaCalorDisperso):
+            return self.calor.valores
+        ancho = min(self.LADO_VISTA_CALOR, self.entorno.ancho)
+        alto = min(self.LADO_VISTA_CALOR, self.entorno.alto)
+        x0 = min(max(0, self.x - ancho // 2), self.entorno.ancho - ancho)
+        y0 = min(max(0, self.y - alto // 2), self.entorno.alto - alto)
+        return self.calor.ventana(x0, y0, ancho, alto)
 
     def percibir(self):
         """Percibe la comida visible y REFUERZA el mapa de calor"""
@@ -26,36 +64,45 @@ class AgenteRecolector:
         # Aprendizaje: reforzar memoria espacial
         for (cx, cy) in comida_visible:
             # Refuerza la creencia de que esta celda es buena
-            self.mapa_comida[cx, cy] += 1 
+            self.calor.incrementar(cx, cy)
             
         return comida_visible
 
     def planificar_ruta(self, objetivo):
-        """Ruta al objetivo mediante BFS"""
+        """Ruta al objetivo mediante BFS (o A* si 'a_estrella' está activo)"""
         if objetivo is None:
-            return []
-        cola = deque([(self.x, self.y, [])])
-        visitados = {(self.x, self.y)}
-        while cola:
-            x, y, camino = cola.popleft()
-            if (x, y) == objetivo:
-                return camino
-            for dx, dy, direccion in [(0, -1, "arriba"), (0, 1, "abajo"),
-                                      (-1, 0, "izquierda"), (1, 0, "derecha")]:
-                nx, ny = x + dx, y + dy
-                if (self.entorno.es_valido(nx, ny) and
-                    (nx, ny) not in visitados and
-                    not self.entorno.hay_obstaculo(nx, ny)):
-                    visitados.add((nx, ny))
-                    cola.append((nx, ny, camino + [direccion]))
-        return []
+            return deque()
+        return planificar(self.entorno.ancho, self.entorno.alto,
+                          self.cache_campos.bloqueos(), (self.x, self.y), objetivo,
+                          a_estrella=self.a_estrella)
+
+    def seguir_campo(self):
+        """Siguiente dirección hacia 'destino' según su campo de flujo,
+        o None si ya llegó o no es alcanzable."""
+        if self.version_campo != self.entorno.version_obstaculos:
+            # Cambiaron los obstáculos: pedir el campo vigente
+            self.campo = self.cache_campos.campo(self.destino)
+            self.version_campo = self.entorno.version_obstaculos
+
+        codigo = self.campo[self.y * self.entorno.ancho + self.x]
+        if codigo < len(DIRECCIONES):
+            return DIRECCIONES[codigo]
+        self.destino = None
+        self.campo = None
+        return None
 
     def decidir(self, comida_visible):
         """Decide hacia dónde ir, priorizando la comida visible,
         luego la memoria (heatmap)."""
 
         if self.plan:
-            return self.plan.pop(0)
+            return self.plan.popleft()
+
+        # Continuar hacia el punto caliente elegido antes
+        if self.destino is not None:
+            direccion = self.seguir_campo()
+            if direccion:
+                return direccion
 
         # Ir a la comida visible más cercana
         if comida_visible:
@@ -63,25 +110,25 @@ class AgenteRecolector:
                            key=lambda c: abs(c[0] - self.x) + abs(c[1] - self.y))
             self.plan = self.planificar_ruta(objetivo)
             if self.plan:
-                return self.plan.pop(0)
+                return self.plan.popleft()
 
         # Si no ve nada, consultar el "mapa de calor"
-        max_valor_memoria = np.max(self.mapa_comida)
+        # Punto más "caliente" del mapa, sin recorrerlo (ej. (3, 2))
+        max_valor_memoria, objetivo = self.calor.maximo()
         
         if max_valor_memoria > 0:
-            # Ir al punto más "caliente" del mapa
-            # np.unravel_index convierte el índice lineal en coordenadas (ej. (3, 2))
-            objetivo = np.unravel_index(np.argmax(self.mapa_comida), self.mapa_comida.shape)
-            
             # Asegurarse de que el objetivo no sea él mismo 
             if objetivo == (self.x, self.y):
                 # Si está sobre la mejor opción, pero no hay comida, la resetea
-                self.mapa_comida[self.x, self.y] = 0
+                self.calor.reiniciar(self.x, self.y)
             else:
-                print(f"Agente en ({self.x},{self.y}): No ve comida. Usando memoria: ir a {objetivo} (Valor: {max_valor_memoria})")
-                self.plan = self.planificar_ruta(objetivo)
-                if self.plan:
-                    return self.plan.pop(0)
+                eventos.detalle("Agente en ({},{}): No ve comida. Usando memoria: ir a {} (Valor: {})", self.x, self.y, objetivo, max_valor_memoria)
+                self.destino = objetivo
+                self.campo = self.cache_campos.campo(objetivo)
+                self.version_campo = self.entorno.version_obstaculos
+                direccion = self.seguir_campo()
+                if direccion:
+                    return direccion
 
         # Si no ve nada y su memoria está vacía (todo 0), explora
         return random.choice(["arriba", "abajo", "izquierda", "derecha"])
@@ -106,50 +153,57 @@ class AgenteRecolector:
         if valor_comida > 0:
             self.puntos_recolectados += valor_comida
             self.energia += 20
-            self.plan = [] # Borra el plan
+            self.plan.clear() # Borra el plan
+            self.destino = None
             
             # Resetea el valor de esta celda a 0 porque ya no es prometedora.
-            print(f"Agente: ¡Comida encontrada en ({self.x}, {self.y})! +{valor_comida}. Reseteando heatmap.")
-            self.mapa_comida[self.x, self.y] = 0
+            eventos.detalle("Agente: ¡Comida encontrada en ({}, {})! +{}. Reseteando heatmap.", self.x, self.y, valor_comida)
+            self.calor.reiniciar(self.x, self.y)
 
         self.energia -= 1
 
     def update(self):
-        """Ciclo del agente"""
+        """Ciclo del agente. Retorna la acción tomada (None sin energía)"""
         if self.energia > 0:
             comida_visible = self.percibir()
             decision = self.decidir(comida_visible)
             self.actuar(decision)
+            return decision
+        return None
 
 # ENTORNO 
-class EntornoRecoleccion:
+class EntornoRecoleccion(EntornoBase):
     """Entorno con comida (con valor) y obstáculos"""
 
-    def __init__(self, ancho, alto):
-        self.ancho = ancho
-        self.alto = alto
+    # Capas de menor a mayor prioridad: comida, obstáculos
+    CAPAS = (CapaCeldas("comida", "🍎"), CapaCeldas("obstaculos", "🧱"))
+
+    def __init__(self, ancho, alto, generador=None, num_comida=10, num_obstaculos=8):
+        super().__init__(ancho, alto)
         self.comida = {}  
         self.obstaculos = set()
+        # Cambia con cada modificación de 'obstaculos' (invalida rutas cacheadas)
+        self.version_obstaculos = 0
 
-        # Generar comida
-        for _ in range(10):
-            x, y = random.randint(0, ancho-1), random.randint(0, alto-1)
-            self.comida[(x, y)] = random.randint(1, 3) # Valor
-
-        # Generar obstáculos
-        for _ in range(8):
-            while True:
-                x, y = random.randint(0, ancho-1), random.randint(0, alto-1)
-                if (x, y) not in self.comida:
-                    self.obstaculos.add((x, y))
-                    break
+        # Generar comida (con valor; sin generador, las repetidas se pisan)
+        self.sembrar(self.comida, num_comida, VALORES, generador=generador)
 
-    def es_valido(self, x, y):
-        return 0 <= x < self.ancho and 0 <= y < self.alto
+        # Generar obstáculos fuera de la comida
+        self.sembrar(self.obstaculos, num_obstaculos, evitar=(self.comida,), generador=generador)
 
     def hay_obstaculo(self, x, y):
         return (x, y) in self.obstaculos
 
+    def agregar_obstaculo(self, x, y):
+        if (x, y) not in self.obstaculos:
+            self.obstaculos.add((x, y))
+            self.version_obstaculos += 1
+
+    def quitar_obstaculo(self, x, y):
+        if (x, y) in self.obstaculos:
+            self.obstaculos.remove((x, y))
+            self.version_obstaculos += 1
+
     def hay_comida(self, x, y):
         return (x, y) in self.comida
 
@@ -167,86 +221,144 @@ class EntornoRecoleccion:
             if dist <= radio:
                 visible.append((fx, fy))
         return visible
-    
-    # Función 'mostrar' del entorno 
-    def mostrar(self, agente):
-        """Muestra el entorno en la consola con emojis"""
-        for y in range(self.alto):
-            for x in range(self.ancho):
-                if x == agente.x and y == agente.y:
-                    print("🤖", end=" ")
-                elif (x, y) in self.obstaculos:
-                    print("🧱", end=" ")
-                elif (x, y) in self.comida:
-                    print("🍎", end=" ")
-                else:
-                    print("⬜", end=" ")
-            print()
-        print()
 
 # SIMULACIÓN 
-def simular_recoleccion(pasos=30):
-    entorno = EntornoRecoleccion(8, 8)
+def simular_recoleccion(pasos=30, semilla=None, graficar=True, ruta_grafico=None,
+                        calor_disperso=False, disposicion=None, ruta_checkpoint=None,
+                        checkpoint_cada=10, reanudar=None, bifurcar=None, grabador=None,
+                        metricas=None, ancho=8, alto=8):
+    """'graficar': False, True (ventana en vivo con pausa), "vivo", "fondo"
+    (ventana en otro proceso), "png" o "gif" (cuadros escritos al final en
+    'ruta_grafico'), o un destino de grafico_calor ya creado.
+    'calor_disperso' guarda el mapa de calor en bloques (ver MapaCalorDisperso);
+    el gráfico muestra entonces una ventana alrededor del agente.
+    'disposicion' arma el mundo con GeneradorMundo ("uniforme", "grupos",
+    "franjas"; ver generacion_mundo.py).
+    'ruta_checkpoint' guarda el estado cada 'checkpoint_cada' pasos;
+    'reanudar' continúa desde un checkpoint (con los mismos parámetros) y
+    'bifurcar' es una semilla nueva para seguir desde ese estado.
+    'grabador' (GrabadorTrayectorias) registra posición, acción y puntos por paso.
+    'metricas' (MetricasSimulacion) exporta métricas en vivo, ver metricas.py.
+    'ancho' x 'alto' es el tamaño del grid (comida y obstáculos con la
+    densidad del de 8x8)."""
+    # Semilla opcional para episodios reproducibles
+    if semilla is not None:
+        random.seed(semilla)
+
+    generador = GeneradorMundo(disposicion) if disposicion is not None else None
+    entorno = EntornoRecoleccion(ancho, alto, generador, ancho * alto * 10 // 64,
+                                 ancho * alto * 8 // 64)
     
-    while True:
-        x_ini, y_ini = random.randint(0, 7), random.randint(0, 7)
-        if (x_ini, y_ini) not in entorno.obstaculos and (x_ini, y_ini) not in entorno.comida:
-            agente = AgenteRecolector(x_ini, y_ini, entorno)
-            break
-
-    print("=== SIMULACIÓN: AGENTE CON APRENDIZAJE (HEATMAP) ===\n")
-    print("Estado inicial:")
+    if generador is not None:
+        # Una celda sin obstáculo ni comida, sin reintentos
+        (x_ini, y_ini), = generador.celdas(ancho, alto, 1, entorno.obstaculos | entorno.comida.keys())
+    else:
+        while True:
+            x_ini, y_ini = random.randint(0, ancho - 1), random.randint(0, alto - 1)
+            if (x_ini, y_ini) not in entorno.obstaculos and (x_ini, y_ini) not in entorno.comida:
+                break
+    agente = AgenteRecolector(x_ini, y_ini, entorno, calor_disperso=calor_disperso)
+
+    visitadas = {(agente.x, agente.y)}
+
+    ### Checkpoints opcionales (ver checkpoint.py)
+    checkpoints = None
+    paso_inicial = 0
+    if ruta_checkpoint is not None or reanudar is not None:
+        import checkpoint as checkpoints
+    if reanudar is not None:
+        # Continuar desde el checkpoint: mundo, agente, mapa de calor, visitadas y 'random'
+        paso_inicial = checkpoints.restaurar_recoleccion(reanudar, entorno, agente, visitadas)
+        if bifurcar is not None:
+            random.seed(bifurcar)  # Otra secuencia aleatoria desde el mismo estado
+
+    eventos.info("=== SIMULACIÓN: AGENTE CON APRENDIZAJE (HEATMAP) ===\n")
+    eventos.info("Estado inicial:")
     
-    entorno.mostrar(agente)
+    if eventos.habilitado(eventos.INFO):
+        entorno.mostrar(agente)
     
-    ### Configuración inicial de Matplotlib
-    plt.ion()  # Activar modo interactivo
-    fig, ax = plt.subplots() # Crear figura y ejes
-    # Usamos .T (transpuesto) para que (x,y) de numpy coincida con (x,y) visual
-    im = ax.imshow(agente.mapa_comida.T, cmap='viridis', vmin=0, vmax=5) 
-    fig.colorbar(im, ax=ax) # barra de color
-    ax.set_title("Mapa de Calor del Agente (Aprendizaje)")
-
-    for paso in range(pasos):
-        agente.update()
-
+    ### Gráfico del heatmap: en vivo, en otro proceso o grabado a PNG/GIF
+    grafico = None
+    if graficar:
+        from grafico_calor import GraficoEnVivo, crear_grafico
+        if graficar is True:
+            grafico = GraficoEnVivo(agente.vista_calor())
+        elif isinstance(graficar, str):
+            grafico = crear_grafico(graficar, agente.vista_calor(), ruta_grafico)
+        else:
+            grafico = graficar  # Cualquier objeto con cuadro(paso, mapa) y cerrar(mapa)
+
+    ### Métricas en vivo opcionales (ver metricas.py)
+    if metricas is not None:
+        metricas.iniciar(lambda: len(entorno.comida), lambda: {0: agente.puntos_recolectados},
+                         cache=agente.cache_campos)
+    puntos_previos = agente.puntos_recolectados
+
+    def actuar(paso):
+        nonlocal puntos_previos
+        accion = agente.update()
+        visitadas.add((agente.x, agente.y))
+
+        ### Trayectoria opcional (ver trayectorias.py)
+        if grabador is not None:
+            grabador.registrar(paso + 1, 0, agente.x, agente.y, accion,
+                               agente.puntos_recolectados - puntos_previos)
+            puntos_previos = agente.puntos_recolectados
+
+    def observar(paso):
         # Actualiza el log Y el gráfico cada 5 pasos
         if (paso + 1) % 5 == 0:
-            print(f"\nPaso {paso + 1} | Energía: {agente.energia} | Puntos: {agente.puntos_recolectados}")
+            eventos.detalle("\nPaso {} | Energía: {} | Puntos: {}", paso + 1, agente.energia, agente.puntos_recolectados)
             
-            entorno.mostrar(agente) 
+            if eventos.habilitado(eventos.DETALLE):
+                entorno.mostrar(agente)
             
             ### Actualizar el gráfico
-            ax.set_title(f"Mapa de Calor (Paso {paso + 1})")
-            im.set_data(agente.mapa_comida.T) # Actualizar datos del heatmap
-            fig.canvas.draw()
-            fig.canvas.flush_events()
-            
-            # tiempo de pausa
-            plt.pause(2.0) # Pausa de 2 segundos para ver el gráfico
-
-        if agente.energia <= 0:
-            print("\nEl agente se quedó sin energía.")
-            break
-        if len(entorno.comida) == 0:
-            print("\nToda la comida ha sido recolectada.")
-            break
-
-    print(f"\nResultado final:")
-    print(f"Puntos recolectados: {agente.puntos_recolectados}")
-    print(f"Energía restante: {agente.energia}")
-
-    # Imprimir el mapa de calor final en la consola
-    print("\nMapa de calor final (creencias del agente):\n", agente.mapa_comida.T)
-
-    # Mostrar gráfico final estático
-    plt.ioff() # Desactivar modo interactivo
-    plt.figure() # Crear una nueva figura final
-    plt.title("Mapa de Calor Final")
-    plt.imshow(agente.mapa_comida.T, cmap='viridis', vmin=0, vmax=5)
-    plt.colorbar()
-    print("Mostrando gráfico final. Cierra la ventana del gráfico para terminar.")
-    plt.show() # Mostrar hasta que el usuario cierre
+            if grafico is not None:
+                grafico.cuadro(paso + 1, agente.vista_calor())
+
+    guardar = None
+    if ruta_checkpoint is not None:
+        def guardar(paso):
+            if (paso + 1) % checkpoint_cada == 0:
+                checkpoints.guardar_recoleccion(ruta_checkpoint, paso + 1, entorno, agente, visitadas)
+
+    bucle = BucleTicks(pasos, paso_inicial, metricas)
+    bucle.ejecutar(actuar, observar, terminado=lambda: len(entorno.comida) == 0,
+                   detener=lambda: agente.energia <= 0, guardar=guardar)
+    if bucle.detenido:
+        eventos.info("\nEl agente se quedó sin energía.")
+    elif bucle.completado:
+        eventos.info("\nToda la comida ha sido recolectada.")
+
+    eventos.info("\nResultado final:")
+    eventos.info("Puntos recolectados: {}", agente.puntos_recolectados)
+    eventos.info("Energía restante: {}", agente.energia)
+
+    # Imprimir el mapa de calor final en la consola (en modo disperso, solo
+    # las celdas más calientes: el mapa entero no entra en la consola)
+    if eventos.habilitado(eventos.INFO):
+        if calor_disperso:
+            eventos.info("\nCeldas más calientes (creencias del agente):\n {}", agente.calor.top_k(10))
+        else:
+            eventos.info("\nMapa de calor final (creencias del agente):\n {}", agente.mapa_comida.T)
+
+    # Gráfico final (en vivo: estático hasta que el usuario cierre la ventana)
+    if grafico is not None:
+        if isinstance(grafico, GraficoEnVivo):
+            eventos.info("Mostrando gráfico final. Cierra la ventana del gráfico para terminar.")
+        grafico.cerrar(agente.vista_calor())
+
+    return {
+        "puntos": agente.puntos_recolectados,
+        "pasos": bucle.pasos_dados,
+        "pasos_hasta_completar": bucle.pasos_dados if bucle.completado else None,
+        "casillas_visitadas": len(visitadas),
+        "energia": agente.energia,
+        "restante": len(entorno.comida),
+        "cache_campos": agente.cache_campos.estadisticas(),
+    }
 
 
 if __name__ == "__main__":
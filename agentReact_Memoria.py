@@ -1,14 +1,23 @@
 import random
 from collections import deque
 
-class SimpleLimpiezaAgente:
+import eventos
+from cobertura import PlanificadorCobertura
+from generacion_mundo import GeneradorMundo
+from memoria_visitados import MemoriaVisitados
+from nucleo import Agente, BucleTicks, CapaCeldas, EntornoBase
+
+class SimpleLimpiezaAgente(Agente):
     """Agente reactivo que limpia suciedad cuando la detecta, con memoria de lugares visitados"""
 
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
+    def __init__(self, x, y, cobertura=None, visitados=None):
+        super().__init__(x, y)
         self.suciedad_limpiada = 0
-        self.visitados = set()  # Memoria de posiciones visitadas
+        # Memoria de posiciones visitadas: set de tuplas, o una MemoriaVisitados
+        # (un byte por celda del grid, ver memoria_visitados.py)
+        self.visitados = visitados if visitados is not None else set()
+        ### Cobertura opcional ("frontera" o "barrido"), ver cobertura.py
+        self.cobertura = PlanificadorCobertura(cobertura) if cobertura else None
 
     def percibir(self, entorno):
         """Percibe si hay suciedad en su posición actual"""
@@ -20,9 +29,9 @@ class SimpleLimpiezaAgente:
         posicion_actual = (self.x, self.y)
         if posicion_actual not in self.visitados:
             self.visitados.add(posicion_actual)
-            print(f"Registrando nueva posición en memoria: {posicion_actual}")
+            eventos.detalle("Registrando nueva posición en memoria: {}", posicion_actual)
         else:
-            print(f"Posición ya registrada: {posicion_actual}")
+            eventos.detalle("Posición ya registrada: {}", posicion_actual)
 
         if percepcion:
             return "limpiar"
@@ -47,6 +56,13 @@ class SimpleLimpiezaAgente:
             if pos not in self.visitados
         }
 
+        # Estrategia de cobertura: evita el paseo al azar sobre lo ya visitado
+        if self.cobertura is not None:
+            direccion = self.cobertura.siguiente(posicion_actual, movimientos_validos,
+                                                 self.visitados, entorno)
+            if direccion is not None:
+                return direccion
+
         # Elegir movimiento
         if no_visitados:
             direccion = random.choice(list(no_visitados.keys()))
@@ -57,18 +73,17 @@ class SimpleLimpiezaAgente:
         return direccion
 
 
-class EntornoGrid:
+class EntornoGrid(EntornoBase):
     """Entorno: Grid 2D con suciedad"""
-    def __init__(self, ancho, alto, num_suciedad):
-        self.ancho = ancho
-        self.alto = alto
+
+    CAPAS = (CapaCeldas("suciedad", "💩"),)
+
+    def __init__(self, ancho, alto, num_suciedad, generador=None):
+        super().__init__(ancho, alto)
         self.suciedad = set()
 
-        # Generar suciedad aleatoria
-        for _ in range(num_suciedad):
-            x = random.randint(0, ancho - 1)
-            y = random.randint(0, alto - 1)
-            self.suciedad.add((x, y))
+        # Generar suciedad aleatoria (sin generador, las repetidas se pierden)
+        self.sembrar(self.suciedad, num_suciedad, generador=generador)
 
     def hay_suciedad(self, x, y):
         return (x, y) in self.suciedad
@@ -79,69 +94,101 @@ class EntornoGrid:
             return True
         return False
 
-    def es_valido(self, x, y):
-        """Verifica si la posición está dentro del grid"""
-        return 0 <= x < self.ancho and 0 <= y < self.alto
-
-    def mover_agente(self, agente, direccion):
-        """Mueve el agente en la dirección especificada"""
-        if direccion == "arriba" and agente.y > 0:
-            agente.y -= 1
-        elif direccion == "abajo" and agente.y < self.alto - 1:
-            agente.y += 1
-        elif direccion == "izquierda" and agente.x > 0:
-            agente.x -= 1
-        elif direccion == "derecha" and agente.x < self.ancho - 1:
-            agente.x += 1
-
-    def mostrar(self, agente):
-        """Visualización simple en consola"""
-        for y in range(self.alto):
-            for x in range(self.ancho):
-                if x == agente.x and y == agente.y:
-                    print("🤖", end=" ")
-                elif (x, y) in self.suciedad:
-                    print("💩", end=" ")
-                else:
-                    print("⬜", end=" ")
-            print()
-        print()
+    def items_restantes(self):
+        """Cantidad de celdas que todavía tienen suciedad"""
+        return len(self.suciedad)
 
 
 # Simulación
-def simular_limpieza(pasos=20):
-    entorno = EntornoGrid(5, 5, 8)
-    agente = SimpleLimpiezaAgente(2, 2)
-
-    print("=== SIMULACIÓN: AGENTE REACTIVO CON MEMORIA ===\n")
-    print("Estado inicial:")
-    entorno.mostrar(agente)
-
-    for paso in range(pasos):
+def simular_limpieza(pasos=20, semilla=None, cobertura=None, memoria_compacta=False,
+                     disposicion=None, grabador=None, metricas=None, ancho=5, alto=5,
+                     ruta_checkpoint=None, checkpoint_cada=10, reanudar=None, bifurcar=None):
+    """'ruta_checkpoint' guarda el estado cada 'checkpoint_cada' pasos;
+    'reanudar' continúa desde un checkpoint (con los mismos parámetros) y
+    'bifurcar' es una semilla nueva para seguir desde ese estado."""
+    # Semilla opcional para episodios reproducibles
+    if semilla is not None:
+        random.seed(semilla)
+
+    # Disposición opcional: mundo con GeneradorMundo (ver generacion_mundo.py)
+    generador = GeneradorMundo(disposicion) if disposicion is not None else None
+    # Otro tamaño de grid mantiene la densidad de suciedad del de 5x5 (8 de 25 celdas)
+    entorno = EntornoGrid(ancho, alto, ancho * alto * 8 // 25, generador)
+    # Memoria de visitados compacta, un byte por celda del grid (opcional)
+    visitados = MemoriaVisitados(entorno.ancho, entorno.alto) if memoria_compacta else None
+    agente = SimpleLimpiezaAgente(ancho // 2, alto // 2, cobertura, visitados)
+
+    ### Checkpoints opcionales (ver checkpoint.py; NumPy se importa solo en este modo)
+    checkpoints = None
+    paso_inicial = 0
+    if ruta_checkpoint is not None or reanudar is not None:
+        import checkpoint as checkpoints
+    if reanudar is not None:
+        # Continuar desde el checkpoint: mundo, agente, visitados y estado de 'random'
+        paso_inicial = checkpoints.restaurar_limpieza(reanudar, entorno, agente)
+        if bifurcar is not None:
+            random.seed(bifurcar)  # Otra secuencia aleatoria desde el mismo estado
+
+    eventos.info("=== SIMULACIÓN: AGENTE REACTIVO CON MEMORIA ===\n")
+    eventos.info("Estado inicial:")
+    if eventos.habilitado(eventos.INFO):
+        entorno.mostrar(agente)
+
+    ### Métricas en vivo opcionales (ver metricas.py)
+    if metricas is not None:
+        metricas.iniciar(entorno.items_restantes, lambda: {0: agente.suciedad_limpiada})
+    puntos_previos = agente.suciedad_limpiada
+
+    def actuar(paso):
+        nonlocal puntos_previos
         percepcion = agente.percibir(entorno)
         accion = agente.decidir_y_actuar(percepcion, entorno)
 
         if accion == "limpiar":
             if entorno.limpiar(agente.x, agente.y):
                 agente.suciedad_limpiada += 1
-                print(f"Paso {paso + 1}: Limpiando en ({agente.x}, {agente.y})")
+                eventos.detalle("Paso {}: Limpiando en ({}, {})", paso + 1, agente.x, agente.y)
         else:
             entorno.mover_agente(agente, accion)
-            print(f"Paso {paso + 1}: Moviéndose {accion}")
+            eventos.detalle("Paso {}: Moviéndose {}", paso + 1, accion)
 
+        ### Trayectoria opcional (GrabadorTrayectorias, ver trayectorias.py)
+        if grabador is not None:
+            grabador.registrar(paso + 1, 0, agente.x, agente.y, accion,
+                               agente.suciedad_limpiada - puntos_previos)
+            puntos_previos = agente.suciedad_limpiada
+
+    def observar(paso):
         # Mostrar entorno cada ciertos pasos
-        if paso % 2 == 0:
+        if paso % 2 == 0 and eventos.habilitado(eventos.DETALLE):
             entorno.mostrar(agente)
 
-        if len(entorno.suciedad) == 0:
-            print("\n¡Toda la suciedad ha sido limpiada!")
-            break
-
-    print("\nEstado final:")
-    entorno.mostrar(agente)
-    print(f"Suciedad limpiada: {agente.suciedad_limpiada}")
-    print(f"Suciedad restante: {len(entorno.suciedad)}")
-    print(f"Casillas visitadas: {len(agente.visitados)}")
+    guardar = None
+    if ruta_checkpoint is not None:
+        def guardar(paso):
+            if (paso + 1) % checkpoint_cada == 0:
+                checkpoints.guardar_limpieza(ruta_checkpoint, paso + 1, entorno, agente)
+
+    bucle = BucleTicks(pasos, paso_inicial, metricas)
+    bucle.ejecutar(actuar, observar, terminado=lambda: entorno.items_restantes() == 0,
+                   guardar=guardar)
+    if bucle.completado:
+        eventos.info("\n¡Toda la suciedad ha sido limpiada!")
+
+    eventos.info("\nEstado final:")
+    if eventos.habilitado(eventos.INFO):
+        entorno.mostrar(agente)
+    eventos.info("Suciedad limpiada: {}", agente.suciedad_limpiada)
+    eventos.info("Suciedad restante: {}", len(entorno.suciedad))
+    eventos.info("Casillas visitadas: {}", len(agente.visitados))
+
+    return {
+        "puntos": agente.suciedad_limpiada,
+        "pasos": bucle.pasos_dados,
+        "pasos_hasta_completar": bucle.pasos_dados if bucle.completado else None,
+        "casillas_visitadas": len(agente.visitados),
+        "restante": len(entorno.suciedad),
+    }
 
 
 if __name__ == "__main__":
@@ -1,14 +1,23 @@
 import random
 from collections import deque
 
-class SimpleLimpiezaAgente:
+import eventos
+from cobertura import PlanificadorCobertura
+from generacion_mundo import GeneradorMundo
+from memoria_visitados import MemoriaVisitados
+from nucleo import ICONOS_SUCIEDAD, VALORES, Agente, BucleTicks, CapaValores, EntornoBase
+
+class SimpleLimpiezaAgente(Agente):
     """Agente reactivo que limpia suciedad, con memoria y que evita obstáculos."""
 
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
+    def __init__(self, x, y, cobertura=None, visitados=None):
+        super().__init__(x, y)
         self.puntos_limpieza = 0
-        self.visitados = set()    # Memoria de posiciones visitadas
+        # Memoria de posiciones visitadas: set de tuplas, o una MemoriaVisitados
+        # (un byte por celda del grid, ver memoria_visitados.py)
+        self.visitados = visitados if visitados is not None else set()
+        ### Cobertura opcional ("frontera" o "barrido"), ver cobertura.py
+        self.cobertura = PlanificadorCobertura(cobertura) if cobertura else None
 
     def percibir(self, entorno):
         """Percibe el VALOR de la suciedad en su posición actual"""
@@ -40,7 +49,7 @@ class SimpleLimpiezaAgente:
                 continue # Movimiento fuera de los límites
             
             if entorno.hay_obstaculo(*pos):
-                print(f"Paso {paso_actual}: Obstáculo percibido en {pos}, evitando.")
+                eventos.detalle("Paso {}: Obstáculo percibido en {}, evitando.", paso_actual, pos)
                 continue # Es un obstáculo, no añadir a movimientos válidos
             
             # Si llega aquí, es válido y no es obstáculo
@@ -52,6 +61,13 @@ class SimpleLimpiezaAgente:
             if pos not in self.visitados
         }
 
+        # Estrategia de cobertura: evita el paseo al azar sobre lo ya visitado
+        if self.cobertura is not None:
+            direccion = self.cobertura.siguiente(posicion_actual, movimientos_validos,
+                                                 self.visitados, entorno)
+            if direccion is not None:
+                return direccion
+
         # Lógica de decisión para evitar quedarse atrapado
         # Lógica para el "callejón sin salida"
         if no_visitados:
@@ -59,7 +75,7 @@ class SimpleLimpiezaAgente:
             direccion = random.choice(list(no_visitados.keys()))
         elif movimientos_validos: 
             # Si no hay nuevos, *debe* retroceder a un lugar ya visitado para escapar.
-            print(f"Paso {paso_actual}: No hay celdas nuevas. Retrocediendo por {posicion_actual}...")
+            eventos.detalle("Paso {}: No hay celdas nuevas. Retrocediendo por {}...", paso_actual, posicion_actual)
             direccion = random.choice(list(movimientos_validos.keys()))
         else:
             # No hay a dónde moverse
@@ -68,12 +84,14 @@ class SimpleLimpiezaAgente:
         return direccion
 
 
-class EntornoGrid:
+class EntornoGrid(EntornoBase):
     """Entorno: Grid 2D con suciedad, valores y múltiples tipos de obstáculos"""
-    
-    def __init__(self, ancho, alto, num_suciedad, num_obstaculos): 
-        self.ancho = ancho
-        self.alto = alto
+
+    # Capas de menor a mayor prioridad: suciedad, obstáculos (el valor es el ícono)
+    CAPAS = (CapaValores("suciedad", ICONOS_SUCIEDAD), CapaValores("obstaculos"))
+
+    def __init__(self, ancho, alto, num_suciedad, num_obstaculos, generador=None): 
+        super().__init__(ancho, alto)
         self.suciedad = {} 
         self.obstaculos = {} 
         
@@ -81,24 +99,11 @@ class EntornoGrid:
         self.tipos_obstaculos_posibles = ["🧱", "🌳"] 
 
         # Generar suciedad aleatoria con valores
-        for _ in range(num_suciedad):
-            while True:
-                x = random.randint(0, ancho - 1)
-                y = random.randint(0, alto - 1)
-                if (x, y) not in self.suciedad:
-                    valor_suciedad = random.randint(1, 3) 
-                    self.suciedad[(x, y)] = valor_suciedad
-                    break
+        self.sembrar(self.suciedad, num_suciedad, VALORES, distintas=True, generador=generador)
         
-        # Generar obstáculos aleatorios
-        for _ in range(num_obstaculos):
-            while True:
-                x = random.randint(0, ancho - 1)
-                y = random.randint(0, alto - 1)
-                if (x, y) not in self.suciedad and (x, y) not in self.obstaculos:
-                    tipo = random.choice(self.tipos_obstaculos_posibles)
-                    self.obstaculos[(x, y)] = tipo
-                    break
+        # Generar obstáculos aleatorios (fuera de la suciedad)
+        self.sembrar(self.obstaculos, num_obstaculos, self.tipos_obstaculos_posibles,
+                     evitar=(self.suciedad,), distintas=True, generador=generador)
 
     def valor_suciedad(self, x, y):
         return self.suciedad.get((x, y), 0)
@@ -113,56 +118,75 @@ class EntornoGrid:
             return valor
         return 0
 
-    def es_valido(self, x, y):
-        return 0 <= x < self.ancho and 0 <= y < self.alto
-
-    def mover_agente(self, agente, direccion):
-        if direccion == "arriba" and agente.y > 0:
-            agente.y -= 1
-        elif direccion == "abajo" and agente.y < self.alto - 1:
-            agente.y += 1
-        elif direccion == "izquierda" and agente.x > 0:
-            agente.x -= 1
-        elif direccion == "derecha" and agente.x < self.ancho - 1:
-            agente.x += 1
-
-    def mostrar(self, agente):
-        mapa_suciedad = {
-            1: "💧", 2: "💩", 3: "☣️"
-        }
-        for y in range(self.alto):
-            for x in range(self.ancho):
-                if x == agente.x and y == agente.y:
-                    print("🤖", end=" ")
-                elif (x, y) in self.obstaculos:
-                    print(self.obstaculos[(x, y)], end=" ")
-                elif (x, y) in self.suciedad:
-                    valor = self.suciedad[(x, y)]
-                    print(mapa_suciedad.get(valor, "❓"), end=" ")
-                else:
-                    print("⬜", end=" ")
-            print()
-        print()
+    def items_restantes(self):
+        """Cantidad de celdas que todavía tienen suciedad"""
+        return len(self.suciedad)
 
 
 # Simulación (parámetros originales de pasos)
-def simular_limpieza(pasos=20): 
+def simular_limpieza(pasos=20, denso=False, semilla=None, cobertura=None, memoria_compacta=False,
+                     disposicion=None, grabador=None, metricas=None, ancho=5, alto=5,
+                     ruta_checkpoint=None, checkpoint_cada=10, reanudar=None, bifurcar=None):
+    """'ruta_checkpoint' guarda el estado cada 'checkpoint_cada' pasos;
+    'reanudar' continúa desde un checkpoint (con los mismos parámetros) y
+    'bifurcar' es una semilla nueva para seguir desde ese estado."""
+    # Semilla opcional para episodios reproducibles
+    if semilla is not None:
+        random.seed(semilla)
+
     
-    entorno = EntornoGrid(5, 5, num_suciedad=8, num_obstaculos=5)
+    # Disposición opcional: mundo con GeneradorMundo (ver generacion_mundo.py)
+    generador = GeneradorMundo(disposicion) if disposicion is not None else None
+    # Otro tamaño de grid mantiene las densidades del de 5x5 (8 y 5 de 25 celdas)
+    num_suciedad, num_obstaculos = ancho * alto * 8 // 25, ancho * alto * 5 // 25
+    if denso:
+        ### Modo de almacenamiento con arreglos NumPy (import solo si se usa)
+        from entorno_denso import EntornoGridDenso
+        entorno = EntornoGridDenso(ancho, alto, num_suciedad, num_obstaculos, generador=generador)
+    else:
+        entorno = EntornoGrid(ancho, alto, num_suciedad, num_obstaculos, generador=generador)
     
-    while True:
-        x_ini = random.randint(0, entorno.ancho - 1)
-        y_ini = random.randint(0, entorno.alto - 1)
-        # Asegurar que no inicie sobre obstáculo O suciedad
-        if not entorno.hay_obstaculo(x_ini, y_ini) and entorno.valor_suciedad(x_ini, y_ini) == 0:
-            agente = SimpleLimpiezaAgente(x_ini, y_ini)
-            break
-
-    print("=== SIMULACIÓN: AGENTE CON MEMORIA, VALOR Y OBSTÁCULOS ===\n")
-    print("Estado inicial:")
-    entorno.mostrar(agente)
-
-    for paso in range(pasos):
+    if generador is not None:
+        # Una celda sin obstáculo ni suciedad, sin reintentos
+        if denso:
+            ocupadas = (entorno.plano_suciedad > 0) | (entorno.plano_obstaculos > 0)
+        else:
+            ocupadas = entorno.suciedad.keys() | entorno.obstaculos.keys()
+        (x_ini, y_ini), = generador.celdas(entorno.ancho, entorno.alto, 1, ocupadas)
+    else:
+        while True:
+            x_ini = random.randint(0, entorno.ancho - 1)
+            y_ini = random.randint(0, entorno.alto - 1)
+            # Asegurar que no inicie sobre obstáculo O suciedad
+            if not entorno.hay_obstaculo(x_ini, y_ini) and entorno.valor_suciedad(x_ini, y_ini) == 0:
+                break
+    # Memoria de visitados compacta, un byte por celda del grid (opcional)
+    visitados = MemoriaVisitados(entorno.ancho, entorno.alto) if memoria_compacta else None
+    agente = SimpleLimpiezaAgente(x_ini, y_ini, cobertura, visitados)
+
+    ### Checkpoints opcionales (ver checkpoint.py; NumPy se importa solo en este modo)
+    checkpoints = None
+    paso_inicial = 0
+    if ruta_checkpoint is not None or reanudar is not None:
+        import checkpoint as checkpoints
+    if reanudar is not None:
+        # Continuar desde el checkpoint: mundo, agente, visitados y estado de 'random'
+        paso_inicial = checkpoints.restaurar_limpieza(reanudar, entorno, agente)
+        if bifurcar is not None:
+            random.seed(bifurcar)  # Otra secuencia aleatoria desde el mismo estado
+
+    eventos.info("=== SIMULACIÓN: AGENTE CON MEMORIA, VALOR Y OBSTÁCULOS ===\n")
+    eventos.info("Estado inicial:")
+    if eventos.habilitado(eventos.INFO):
+        entorno.mostrar(agente)
+
+    ### Métricas en vivo opcionales (ver metricas.py)
+    if metricas is not None:
+        metricas.iniciar(entorno.items_restantes, lambda: {0: agente.puntos_limpieza})
+    puntos_previos = agente.puntos_limpieza
+
+    def actuar(paso):
+        nonlocal puntos_previos
         percepcion = agente.percibir(entorno)
         
         ### Pasar 'paso + 1' a la función de decisión
@@ -172,29 +196,52 @@ def simular_limpieza(pasos=20):
             valor_limpiado = entorno.limpiar(agente.x, agente.y)
             if valor_limpiado > 0:
                 agente.puntos_limpieza += valor_limpiado
-                print(f"Paso {paso + 1}: Limpiando en ({agente.x}, {agente.y}). ¡+{valor_limpiado} puntos!")
+                eventos.detalle("Paso {}: Limpiando en ({}, {}). ¡+{} puntos!", paso + 1, agente.x, agente.y, valor_limpiado)
         elif accion != "quieto":
             entorno.mover_agente(agente, accion)
-            print(f"Paso {paso + 1}: Moviéndose {accion}")
+            eventos.detalle("Paso {}: Moviéndose {}", paso + 1, accion)
         else:
             # Añadido número de paso
-            print(f"Paso {paso + 1}: Quieto (atrapado).")
+            eventos.detalle("Paso {}: Quieto (atrapado).", paso + 1)
 
+        ### Trayectoria opcional (GrabadorTrayectorias, ver trayectorias.py)
+        if grabador is not None:
+            grabador.registrar(paso + 1, 0, agente.x, agente.y, accion,
+                               agente.puntos_limpieza - puntos_previos)
+            puntos_previos = agente.puntos_limpieza
 
+    def observar(paso):
         # Mostrar entorno
-        if (paso + 1) % 3 == 0 or paso == pasos - 1:
-            print(f"--- Estado en paso {paso+1} ---")
+        if ((paso + 1) % 3 == 0 or paso == pasos - 1) and eventos.habilitado(eventos.DETALLE):
+            eventos.detalle("--- Estado en paso {} ---", paso+1)
             entorno.mostrar(agente)
-    
-        if len(entorno.suciedad) == 0:
-            print("\n¡Toda la suciedad ha sido limpiada!")
-            break
-
-    print("\nEstado final:")
-    entorno.mostrar(agente)
-    print(f"Puntos de limpieza totales: {agente.puntos_limpieza}")
-    print(f"Suciedad restante (items): {len(entorno.suciedad)}")
-    print(f"Casillas visitadas: {len(agente.visitados)}")
+
+    guardar = None
+    if ruta_checkpoint is not None:
+        def guardar(paso):
+            if (paso + 1) % checkpoint_cada == 0:
+                checkpoints.guardar_limpieza(ruta_checkpoint, paso + 1, entorno, agente)
+
+    bucle = BucleTicks(pasos, paso_inicial, metricas)
+    bucle.ejecutar(actuar, observar, terminado=lambda: entorno.items_restantes() == 0,
+                   guardar=guardar)
+    if bucle.completado:
+        eventos.info("\n¡Toda la suciedad ha sido limpiada!")
+
+    eventos.info("\nEstado final:")
+    if eventos.habilitado(eventos.INFO):
+        entorno.mostrar(agente)
+    eventos.info("Puntos de limpieza totales: {}", agente.puntos_limpieza)
+    eventos.info("Suciedad restante (items): {}", entorno.items_restantes())
+    eventos.info("Casillas visitadas: {}", len(agente.visitados))
+
+    return {
+        "puntos": agente.puntos_limpieza,
+        "pasos": bucle.pasos_dados,
+        "pasos_hasta_completar": bucle.pasos_dados if bucle.completado else None,
+        "casillas_visitadas": len(agente.visitados),
+        "restante": entorno.items_restantes(),
+    }
 
 
 if __name__ == "__main__":
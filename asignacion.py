@@ -0,0 +1,174 @@
+import numpy as np
+
+# Costo de un par agente-comida no permitido (más allá del radio)
+COSTO_INFACTIBLE = 1e6
+
+
+def matriz_costos(posiciones_agentes, posiciones_comida, radio=None):
+    """Distancias Manhattan agentes x comida, en una sola operación vectorizada"""
+    agentes = np.asarray(posiciones_agentes, dtype=np.int64).reshape(-1, 2)
+    comida = np.asarray(posiciones_comida, dtype=np.int64).reshape(-1, 2)
+    costos = (np.abs(agentes[:, None, 0] - comida[None, :, 0]) +
+              np.abs(agentes[:, None, 1] - comida[None, :, 1])).astype(np.float64)
+    if radio is not None:
+        costos[costos > radio] = COSTO_INFACTIBLE
+    return costos
+
+
+def hungaro(costos):
+    """Asignación de costo mínimo (método húngaro con potenciales, O(n² m)).
+
+    Retorna un arreglo con, para cada fila, la columna asignada o -1.
+    """
+    costos = np.asarray(costos, dtype=np.float64)
+    filas, columnas = costos.shape
+    transpuesta = filas > columnas
+    if transpuesta:
+        costos = costos.T
+        filas, columnas = columnas, filas
+
+    # Índices desde 1; la columna 0 es auxiliar
+    u = np.zeros(filas + 1)
+    v = np.zeros(columnas + 1)
+    fila_de = np.zeros(columnas + 1, dtype=np.int64)  # fila asignada a cada columna (0 = libre)
+    camino = np.zeros(columnas + 1, dtype=np.int64)
+
+    for i in range(1, filas + 1):
+        fila_de[0] = i
+        j0 = 0
+        minv = np.full(columnas + 1, np.inf)
+        usada = np.zeros(columnas + 1, dtype=bool)
+        while True:
+            usada[j0] = True
+            i0 = fila_de[j0]
+            libres = ~usada[1:]
+            reducido = costos[i0 - 1] - u[i0] - v[1:]
+            mejora = libres & (reducido < minv[1:])
+            minv[1:][mejora] = reducido[mejora]
+            camino[1:][mejora] = j0
+
+            candidatos = np.where(libres, minv[1:], np.inf)
+            j1 = int(np.argmin(candidatos)) + 1
+            delta = candidatos[j1 - 1]
+
+            usadas = np.nonzero(usada)[0]
+            u[fila_de[usadas]] += delta
+            v[usadas] -= delta
+            minv[1:][libres] -= delta
+            j0 = j1
+            if fila_de[j0] == 0:
+                break
+        # Invertir el camino aumentante
+        while j0:
+            j1 = camino[j0]
+            fila_de[j0] = fila_de[j1]
+            j0 = j1
+
+    asignacion = np.full(filas, -1, dtype=np.int64)
+    ocupadas = np.nonzero(fila_de[1:])[0]
+    asignacion[fila_de[ocupadas + 1] - 1] = ocupadas
+    return _descartar_infactibles(_orientar(asignacion, transpuesta, columnas), costos,
+                                  transpuesta)
+
+
+def subasta(costos, epsilon=None):
+    """Asignación por subasta (Bertsekas, versión Jacobi): en cada ronda todas
+    las filas libres pujan a la vez por su mejor columna.
+
+    Con costos enteros y epsilon < 1 / n el resultado es óptimo.
+    """
+    costos = np.asarray(costos, dtype=np.float64)
+    filas, columnas = costos.shape
+    transpuesta = filas > columnas
+    if transpuesta:
+        costos = costos.T
+        filas, columnas = columnas, filas
+    if filas == 0:
+        return np.full(costos.shape[1] if transpuesta else 0, -1, dtype=np.int64)
+
+    beneficio = -costos
+    epsilon = epsilon or 1.0 / (filas + 1)
+    precios = np.zeros(columnas)
+    asignacion = np.full(filas, -1, dtype=np.int64)
+    dueno = np.full(columnas, -1, dtype=np.int64)
+
+    while True:
+        libres = np.nonzero(asignacion == -1)[0]
+        if libres.size == 0:
+            break
+        valores = beneficio[libres] - precios
+        mejor = np.argmax(valores, axis=1)
+        rango = np.arange(libres.size)
+        primero = valores[rango, mejor]
+        if columnas > 1:
+            valores[rango, mejor] = -np.inf
+            segundo = valores.max(axis=1)
+        else:
+            segundo = primero
+        pujas = precios[mejor] + (primero - segundo) + epsilon
+
+        # Por cada columna gana la puja más alta
+        orden = np.lexsort((-pujas, mejor))
+        columnas_pujadas, primeras = np.unique(mejor[orden], return_index=True)
+        ganadores = libres[orden[primeras]]
+        pujas_ganadoras = pujas[orden[primeras]]
+
+        anteriores = dueno[columnas_pujadas]
+        asignacion[anteriores[anteriores >= 0]] = -1
+        dueno[columnas_pujadas] = ganadores
+        asignacion[ganadores] = columnas_pujadas
+        precios[columnas_pujadas] = pujas_ganadoras
+
+    return _descartar_infactibles(_orientar(asignacion, transpuesta, columnas), costos,
+                                  transpuesta)
+
+
+def _orientar(asignacion, transpuesta, columnas):
+    """Pasa una asignación de la matriz transpuesta a la original"""
+    if not transpuesta:
+        return asignacion
+    original = np.full(columnas, -1, dtype=np.int64)
+    asignadas = np.nonzero(asignacion >= 0)[0]
+    original[asignacion[asignadas]] = asignadas
+    return original
+
+
+def _descartar_infactibles(asignacion, costos, transpuesta):
+    if transpuesta:
+        costos = costos.T
+    filas = np.nonzero(asignacion >= 0)[0]
+    infactibles = costos[filas, asignacion[filas]] >= COSTO_INFACTIBLE
+    asignacion[filas[infactibles]] = -1
+    return asignacion
+
+
+METODOS = {"hungaro": hungaro, "subasta": subasta}
+
+
+class AsignadorObjetivos:
+    """Etapa de asignación centralizada: una vez por tick reparte la comida
+    visible entre los agentes resolviendo el problema de asignación."""
+
+    def __init__(self, entorno, metodo="hungaro", radio_vision=3):
+        if metodo not in METODOS:
+            raise ValueError(f"Método de asignación desconocido: {metodo}. "
+                             f"Opciones: {', '.join(METODOS)}")
+        self.entorno = entorno
+        self.resolver = METODOS[metodo]
+        self.radio_vision = radio_vision
+
+    def asignar(self, agentes):
+        """Fija 'agente.objetivo' (o None) para todos los agentes"""
+        visible = set()
+        for agente in agentes:
+            visible.update(self.entorno.obtener_comida_cercana(agente.x, agente.y,
+                                                               self.radio_vision))
+        if not visible:
+            for agente in agentes:
+                agente.objetivo = None
+            return
+
+        comida = list(visible)
+        costos = matriz_costos([(a.x, a.y) for a in agentes], comida)
+        for agente, columna in zip(agentes, self.resolver(costos).tolist()):
+            agente.objetivo = comida[columna] if columna >= 0 else None
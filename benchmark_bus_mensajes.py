@@ -0,0 +1,43 @@
+import math
+import random
+import time
+
+import eventos
+from bus_mensajes import BusMensajes
+from evitarObjetivos_multiagente import (AgenteCooperativo, EntornoMultiAgente, conectar,
+                                         ejecutar_paso)
+
+
+def medir(num_agentes, modo, ticks=3, semilla=0):
+    """Segundos por tick con 'modo' = 'directo', 'bus' o 'bus_radio'"""
+    random.seed(semilla)
+    # El mundo crece con la población: ~36 celdas y ~5 comidas por agente
+    lado = max(10, int(math.sqrt(num_agentes) * 6))
+    entorno = EntornoMultiAgente(lado, lado, num_comida=num_agentes * 5)
+    bus = None
+    if modo == "bus":
+        bus = BusMensajes()
+    elif modo == "bus_radio":
+        bus = BusMensajes(radio=10, entorno=entorno)
+    agentes = [AgenteCooperativo(i + 1, random.randrange(lado), random.randrange(lado),
+                                 entorno, bus)
+               for i in range(num_agentes)]
+    if bus is None:
+        conectar(agentes)
+
+    inicio = time.perf_counter()
+    with eventos.usar(eventos.silencioso()):
+        for _ in range(ticks):
+            ejecutar_paso(agentes, bus)
+    return (time.perf_counter() - inicio) / ticks
+
+
+if __name__ == "__main__":
+    print("=== BENCHMARK: mensajes de AgenteCooperativo (segundos por tick) ===\n")
+    print(f"{'agentes':>8} {'directo':>10} {'bus':>10} {'bus r=10':>10}")
+    for num_agentes in (3, 10, 100, 300, 1000):
+        # El envío directo es O(agentes² x comida): solo hasta 300 agentes
+        directo = (f"{medir(num_agentes, 'directo'):>10.4f}"
+                   if num_agentes <= 300 else f"{'-':>10}")
+        print(f"{num_agentes:>8} {directo} {medir(num_agentes, 'bus'):>10.4f} "
+              f"{medir(num_agentes, 'bus_radio'):>10.4f}")
@@ -0,0 +1,60 @@
+import os
+import pickle
+import random
+import tempfile
+import time
+
+import numpy as np
+
+import checkpoint
+from agentObjet_AreasComida import AgenteRecolector, EntornoRecoleccion
+
+
+def estado_recoleccion(lado, semilla=0):
+    """Recolector con un mapa de calor denso de lado x lado, 10% de celdas con valor"""
+    random.seed(semilla)
+    entorno = EntornoRecoleccion(lado, lado)
+    agente = AgenteRecolector(0, 0, entorno)
+    rng = np.random.default_rng(semilla)
+    valores = rng.random((lado, lado)) * (rng.random((lado, lado)) < 0.1)
+    agente.calor.cargar(valores)
+    return entorno, agente, {(0, 0)}
+
+
+def medir(funcion, repeticiones=3):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+if __name__ == "__main__":
+    print("=== BENCHMARK: checkpoint de una recolección con heatmap grande (segundos) ===\n")
+    directorio = tempfile.mkdtemp()
+    ruta = os.path.join(directorio, "recoleccion.ckpt")
+    ruta_pickle = os.path.join(directorio, "recoleccion.pkl")
+    print(f"{'mapa':>11} {'MiB':>7} {'guardar':>9} {'restaurar':>10} {'sin mmap':>9} "
+          f"{'pickle g/r (sin heap)':>22}")
+    for lado in (500, 2000, 4000):
+        entorno, agente, visitadas = estado_recoleccion(lado)
+        guardar = medir(lambda: checkpoint.guardar_recoleccion(ruta, 0, entorno, agente, visitadas))
+        restaurar = medir(lambda: checkpoint.restaurar_recoleccion(ruta, entorno, agente, visitadas))
+        sin_mmap = medir(lambda: checkpoint.restaurar_recoleccion(ruta, entorno, agente,
+                                                                  visitadas, mmap=False))
+
+        def con_pickle():
+            with open(ruta_pickle, "wb") as archivo:
+                pickle.dump((entorno.comida, entorno.obstaculos, agente.calor.valores,
+                             visitadas), archivo, protocol=pickle.HIGHEST_PROTOCOL)
+
+        def leer_pickle():
+            with open(ruta_pickle, "rb") as archivo:
+                pickle.load(archivo)
+
+        pickle_g, pickle_r = medir(con_pickle), medir(leer_pickle)
+        print(f"{lado:>5}x{lado:<5} {os.path.getsize(ruta) / 2 ** 20:>7.1f} {guardar:>9.3f} "
+              f"{restaurar:>10.3f} {sin_mmap:>9.3f} {pickle_g:>13.3f}/{pickle_r:.3f}")
+    print("\n'restaurar' abre el mapa con np.memmap, sin copiarlo; casi todo su tiempo es")
+    print("rehacer el heap de MapaCalor desde las celdas con valor (pickle no lo rehace).")
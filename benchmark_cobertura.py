@@ -0,0 +1,70 @@
+import random
+import statistics
+
+import agenReact_TiposSuciedad
+import agentReact_Memoria
+import agentReact_Obstaculos
+import eventos
+
+MODULOS = {
+    "memoria": agentReact_Memoria,
+    "tipos_suciedad": agenReact_TiposSuciedad,
+    "obstaculos": agentReact_Obstaculos,
+}
+
+
+def pasos_hasta_limpiar(modulo, lado, cobertura, semilla, limite_por_celda=20):
+    """Pasos hasta dejar la habitación limpia (None si no termina antes del límite)"""
+    random.seed(semilla)
+    num_suciedad = max(1, lado * lado * 3 // 10)
+    con_obstaculos = modulo is agentReact_Obstaculos
+    if con_obstaculos:
+        entorno = modulo.EntornoGrid(lado, lado, num_suciedad, lado * lado // 10)
+    else:
+        entorno = modulo.EntornoGrid(lado, lado, num_suciedad)
+
+    while True:
+        x, y = random.randrange(lado), random.randrange(lado)
+        if not (con_obstaculos and entorno.hay_obstaculo(x, y)):
+            break
+    agente = modulo.SimpleLimpiezaAgente(x, y, cobertura)
+
+    for paso in range(limite_por_celda * lado * lado):
+        if not entorno.suciedad:
+            return paso
+        percepcion = agente.percibir(entorno)
+        if con_obstaculos:
+            accion = agente.decidir_y_actuar(percepcion, entorno, paso + 1)
+        else:
+            accion = agente.decidir_y_actuar(percepcion, entorno)
+        if accion == "limpiar":
+            entorno.limpiar(agente.x, agente.y)
+        elif accion != "quieto":
+            entorno.mover_agente(agente, accion)
+    return None
+
+
+def resumir(modulo, lado, cobertura, episodios):
+    """(mediana de pasos entre los episodios terminados, tasa de terminados)"""
+    resultados = [pasos_hasta_limpiar(modulo, lado, cobertura, semilla)
+                  for semilla in range(episodios)]
+    terminados = [r for r in resultados if r is not None]
+    mediana = statistics.median(terminados) if terminados else float("nan")
+    return mediana, len(terminados) / episodios
+
+
+if __name__ == "__main__":
+    print("=== BENCHMARK: pasos hasta limpiar toda la habitación (mediana, % terminados) ===")
+    print("30% de celdas sucias; 10% de obstáculos en 'obstaculos'\n")
+    modos = (None, "frontera", "barrido")
+    with eventos.usar(eventos.silencioso()):
+        for nombre, modulo in MODULOS.items():
+            print(f"{nombre}:")
+            print(f"  {'lado':>5} " + " ".join(f"{str(modo or 'al azar'):>18}" for modo in modos))
+            for lado, episodios in ((5, 200), (10, 100), (20, 30), (40, 10)):
+                columnas = []
+                for modo in modos:
+                    mediana, tasa = resumir(modulo, lado, modo, episodios)
+                    columnas.append(f"{mediana:>10.0f} ({tasa:>4.0%})")
+                print(f"  {lado:>5} " + " ".join(f"{c:>18}" for c in columnas))
+            print()
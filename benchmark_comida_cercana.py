@@ -0,0 +1,50 @@
+import random
+import time
+
+from competirRecursos_multiagente import EntornoMultiAgente
+
+
+def busqueda_lineal(comida, x, y, radio):
+    """Versión original de obtener_comida_cercana: recorre toda la comida"""
+    return [pos for pos in comida
+            if abs(pos[0] - x) + abs(pos[1] - y) <= radio]
+
+
+def medir(funcion, consultas, radio):
+    inicio = time.perf_counter()
+    for (x, y) in consultas:
+        funcion(x, y, radio)
+    return time.perf_counter() - inicio
+
+
+def comparar(ancho, num_comida, num_agentes, radio=5, ticks=5, semilla=0):
+    random.seed(semilla)
+    entorno = EntornoMultiAgente(ancho, ancho, num_comida=num_comida)
+    consultas = [(random.randint(0, ancho - 1), random.randint(0, ancho - 1))
+                 for _ in range(num_agentes * ticks)]
+
+    # Ambas búsquedas deben encontrar exactamente las mismas posiciones
+    for (x, y) in consultas[:50]:
+        assert (sorted(busqueda_lineal(entorno.comida, x, y, radio)) ==
+                sorted(entorno.obtener_comida_cercana(x, y, radio)))
+
+    t_lineal = medir(lambda x, y, r: busqueda_lineal(entorno.comida, x, y, r),
+                     consultas, radio)
+    t_indice = medir(entorno.obtener_comida_cercana, consultas, radio)
+    return len(entorno.comida), t_lineal, t_indice
+
+
+if __name__ == "__main__":
+    print("=== BENCHMARK: obtener_comida_cercana (lineal vs índice espacial) ===\n")
+    print(f"{'grid':>11} {'comida':>8} {'agentes':>8} {'lineal (s)':>11} "
+          f"{'índice (s)':>11} {'mejora':>8}")
+    configuraciones = [
+        (10, 15, 3),
+        (100, 1_000, 100),
+        (300, 10_000, 200),
+        (500, 30_000, 300),
+    ]
+    for ancho, num_comida, num_agentes in configuraciones:
+        comida, t_lineal, t_indice = comparar(ancho, num_comida, num_agentes)
+        print(f"{ancho:>5}x{ancho:<5} {comida:>8} {num_agentes:>8} {t_lineal:>11.4f} "
+              f"{t_indice:>11.4f} {t_lineal / t_indice:>7.1f}x")
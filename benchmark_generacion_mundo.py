@@ -0,0 +1,40 @@
+import random
+import time
+
+import agentReact_Obstaculos
+from entorno_denso import EntornoGridDenso
+from generacion_mundo import GeneradorMundo
+
+
+def medir(construir, repeticiones=3):
+    """Mejor tiempo de 'repeticiones' construcciones"""
+    mejor = float("inf")
+    for semilla in range(repeticiones):
+        random.seed(semilla)
+        inicio = time.perf_counter()
+        construir()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+if __name__ == "__main__":
+    print("=== BENCHMARK: construir un EntornoGrid con obstáculos (segundos) ===")
+    print("80% de la ocupación es suciedad y 20% obstáculos\n")
+    lado = 200
+    print(f"{'ocupación':>10} {'reintentos':>11} {'GeneradorMundo':>15} {'aceleración':>12}")
+    for ocupacion in (0.1, 0.5, 0.9, 0.99):
+        total = int(lado * lado * ocupacion)
+        suciedad, obstaculos = total * 4 // 5, total - total * 4 // 5
+        anterior = medir(lambda: agentReact_Obstaculos.EntornoGrid(lado, lado, suciedad, obstaculos))
+        nuevo = medir(lambda: agentReact_Obstaculos.EntornoGrid(
+            lado, lado, suciedad, obstaculos, generador=GeneradorMundo()))
+        print(f"{ocupacion:>10.0%} {anterior:>11.4f} {nuevo:>15.4f} {anterior / nuevo:>11.1f}x")
+
+    print("\nEntornoGridDenso de 5000x5000 con 90% de ocupación (80% suciedad, 10% obstáculos):")
+    celdas = 5000 * 5000
+    for disposicion in ("uniforme", "grupos", "franjas"):
+        segundos = medir(lambda: EntornoGridDenso(5000, 5000, celdas * 8 // 10, celdas // 10,
+                                                  generador=GeneradorMundo(disposicion)), 1)
+        print(f"  {disposicion:>9}: {segundos:.3f} s")
+    segundos = medir(lambda: GeneradorMundo().mascara(5000, 5000, celdas * 9 // 10), 1)
+    print(f"  Solo la máscara uniforme del 90%: {segundos:.3f} s")
@@ -0,0 +1,88 @@
+import random
+import time
+
+import numpy as np
+
+from mapa_calor import MapaCalor, MapaCalorDisperso
+
+
+def recorrido(lado, pasos, radio=5, semilla=0):
+    """Pasos de un recolector: celdas reforzadas (comida visible) y celda reiniciada"""
+    rng = random.Random(semilla)
+    x = y = lado // 2
+    for _ in range(pasos):
+        x = min(lado - 1, max(0, x + rng.choice((-1, 0, 1))))
+        y = min(lado - 1, max(0, y + rng.choice((-1, 0, 1))))
+        visibles = [(min(lado - 1, max(0, x + rng.randint(-radio, radio))),
+                     min(lado - 1, max(0, y + rng.randint(-radio, radio))))
+                    for _ in range(rng.randint(0, 4))]
+        yield visibles, (x, y)
+
+
+def medir_denso(lado, pasos):
+    """Como antes: np.max y np.argmax sobre todo el mapa en cada paso"""
+    mapa = np.zeros((lado, lado))
+    inicio = time.perf_counter()
+    for visibles, (x, y) in recorrido(lado, pasos):
+        for cx, cy in visibles:
+            mapa[cx, cy] += 1
+        if np.max(mapa) > 0:
+            objetivo = np.unravel_index(np.argmax(mapa), mapa.shape)
+            if objetivo == (x, y):
+                mapa[x, y] = 0
+    return (time.perf_counter() - inicio) / pasos
+
+
+def medir_incremental(lado, pasos, clase=MapaCalor):
+    """Segundos por paso y bytes del mapa al final"""
+    mapa = clase(lado, lado)
+    inicio = time.perf_counter()
+    for visibles, (x, y) in recorrido(lado, pasos):
+        for cx, cy in visibles:
+            mapa.incrementar(cx, cy)
+        valor, objetivo = mapa.maximo()
+        if valor > 0 and objetivo == (x, y):
+            mapa.reiniciar(x, y)
+    return (time.perf_counter() - inicio) / pasos, mapa.memoria_bytes()
+
+
+def medir_top_k(lado, k=10, consultas=20):
+    """Segundos por consulta top-k: argpartition del mapa vs. heap"""
+    rng = np.random.default_rng(0)
+    valores = rng.integers(0, 50, size=(lado, lado)) * (rng.random((lado, lado)) < 0.01)
+    mapa = MapaCalor(lado, lado)
+    for x, y in zip(*np.nonzero(valores)):
+        mapa.incrementar(int(x), int(y), int(valores[x, y]))
+
+    inicio = time.perf_counter()
+    for _ in range(consultas):
+        plano = mapa.valores.reshape(-1)
+        mejores = np.argpartition(plano, -k)[-k:]
+        mejores[np.argsort(-plano[mejores])]
+    denso = (time.perf_counter() - inicio) / consultas
+
+    inicio = time.perf_counter()
+    for _ in range(consultas):
+        mapa.top_k(k)
+    return denso, (time.perf_counter() - inicio) / consultas
+
+
+if __name__ == "__main__":
+    print("=== BENCHMARK: celda más caliente del heatmap (segundos por paso) ===\n")
+    print(f"{'mapa':>11} {'np.max+argmax':>14} {'MapaCalor':>12} {'aceleración':>12} {'disperso':>12}")
+    for lado, pasos in ((8, 20000), (100, 5000), (1000, 200)):
+        denso = medir_denso(lado, pasos)
+        incremental, _ = medir_incremental(lado, pasos)
+        disperso, _ = medir_incremental(lado, pasos, MapaCalorDisperso)
+        print(f"{lado:>5}x{lado:<5} {denso:>14.7f} {incremental:>12.7f} "
+              f"{denso / incremental:>11.1f}x {disperso:>12.7f}")
+
+    print("\nMemoria tras 5000 pasos de exploración en 10000x10000:")
+    _, denso = medir_incremental(10000, 5000)
+    _, disperso = medir_incremental(10000, 5000, MapaCalorDisperso)
+    print(f"  MapaCalor float64 {denso / 2 ** 20:10.1f} MiB")
+    print(f"  MapaCalorDisperso {disperso / 2 ** 20:10.1f} MiB")
+
+    denso, heap = medir_top_k(1000)
+    print(f"\nTop-10 en 1000x1000: argpartition {denso:.6f} s, MapaCalor {heap:.6f} s "
+          f"({denso / heap:.0f}x)")
@@ -0,0 +1,76 @@
+import random
+import sys
+import time
+
+import numpy as np
+
+from memoria_visitados import MemoriaVisitados
+
+
+def bytes_set(visitados):
+    """Tamaño del set más el de sus tuplas y enteros (los enteros chicos están cacheados)"""
+    total = sys.getsizeof(visitados)
+    for pos in visitados:
+        total += sys.getsizeof(pos) + sum(sys.getsizeof(c) for c in pos if c > 256)
+    return total
+
+
+def llenar(memoria, lado, fraccion, semilla=0):
+    rng = random.Random(semilla)
+    for _ in range(int(lado * lado * fraccion)):
+        memoria.add((rng.randrange(lado), rng.randrange(lado)))
+    return memoria
+
+
+def medir_consultas(memoria, lado, consultas=200000, semilla=1):
+    """Segundos por consulta 'pos in memoria'"""
+    rng = random.Random(semilla)
+    posiciones = [(rng.randrange(lado), rng.randrange(lado)) for _ in range(consultas)]
+    inicio = time.perf_counter()
+    for pos in posiciones:
+        pos in memoria
+    return (time.perf_counter() - inicio) / consultas
+
+
+def medir_vecinos(conjunto, compacta, lado, num_agentes, semilla=2):
+    """Segundos por consulta de vecinos sin visitar de 'num_agentes' agentes:
+    bucle con tuplas vs. MemoriaVisitados.vecinos_no_visitados"""
+    rng = np.random.default_rng(semilla)
+    xs = rng.integers(0, lado, num_agentes)
+    ys = rng.integers(0, lado, num_agentes)
+
+    inicio = time.perf_counter()
+    for x, y in zip(xs.tolist(), ys.tolist()):
+        [0 <= x + dx < lado and 0 <= y + dy < lado and (x + dx, y + dy) not in conjunto
+         for dx, dy in MemoriaVisitados._DELTAS]
+    bucle = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    compacta.vecinos_no_visitados(xs, ys)
+    return bucle, time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    print("=== BENCHMARK: memoria de visitados, set de tuplas vs. MemoriaVisitados ===\n")
+    print(f"{'habitación':>11} {'visitado':>9} {'set':>12} {'compacta':>10} {'in set':>10} "
+          f"{'in compacta':>12}")
+    for lado, fraccion in ((20, 0.5), (200, 0.5), (1000, 0.3)):
+        conjunto = llenar(set(), lado, fraccion)
+        compacta = llenar(MemoriaVisitados(lado, lado), lado, fraccion)
+        assert len(conjunto) == len(compacta) == compacta.contar()
+        print(f"{lado:>5}x{lado:<5} {fraccion:>9.0%} {bytes_set(conjunto) / 1024:>9.1f} KiB "
+              f"{len(compacta.celdas) / 1024:>6.1f} KiB {medir_consultas(conjunto, lado) * 1e9:>7.0f} ns "
+              f"{medir_consultas(compacta, lado) * 1e9:>9.0f} ns")
+
+    print("\nVecinos sin visitar en 1000x1000 (30% visitado):")
+    conjunto = llenar(set(), 1000, 0.3)
+    compacta = llenar(MemoriaVisitados(1000, 1000), 1000, 0.3)
+    for num_agentes in (100, 10000, 100000):
+        bucle, vectorizado = medir_vecinos(conjunto, compacta, 1000, num_agentes)
+        print(f"  {num_agentes:>6} agentes: bucle con set {bucle:.5f} s, "
+              f"vectorizado {vectorizado:.5f} s ({bucle / vectorizado:.0f}x)")
+
+    print("\nMemoria de 1000 agentes que recorrieron toda una habitación de 200x200:")
+    conjunto = {(x, y) for x in range(200) for y in range(200)}
+    print(f"  sets:      {1000 * bytes_set(conjunto) / 2 ** 20:8.1f} MiB")
+    print(f"  compactas: {1000 * len(MemoriaVisitados(200, 200).celdas) / 2 ** 20:8.1f} MiB")
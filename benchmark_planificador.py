@@ -0,0 +1,85 @@
+import random
+import time
+from collections import deque
+
+from planificador import mapa_bloqueos, planificar
+
+
+class _Mapa:
+    """Mapa mínimo con obstáculos para medir el planificador"""
+
+    def __init__(self, ancho, alto, densidad, semilla=0):
+        rng = random.Random(semilla)
+        self.ancho = ancho
+        self.alto = alto
+        self.obstaculos = {(x, y) for x in range(ancho) for y in range(alto)
+                           if rng.random() < densidad}
+
+    def es_valido(self, x, y):
+        return 0 <= x < self.ancho and 0 <= y < self.alto
+
+    def hay_obstaculo(self, x, y):
+        return (x, y) in self.obstaculos
+
+
+def bfs_original(entorno, inicio, objetivo):
+    """planificar_ruta original: copia el camino en cada entrada de la cola"""
+    cola = deque([(inicio[0], inicio[1], [])])
+    visitados = {inicio}
+    while cola:
+        x, y, camino = cola.popleft()
+        if (x, y) == objetivo:
+            return camino
+        for dx, dy, direccion in [(0, -1, "arriba"), (0, 1, "abajo"),
+                                  (-1, 0, "izquierda"), (1, 0, "derecha")]:
+            nx, ny = x + dx, y + dy
+            if (entorno.es_valido(nx, ny) and
+                (nx, ny) not in visitados and
+                not entorno.hay_obstaculo(nx, ny)):
+                visitados.add((nx, ny))
+                cola.append((nx, ny, camino + [direccion]))
+    return []
+
+
+def celda_libre(mapa, rng):
+    while True:
+        pos = (rng.randrange(mapa.ancho), rng.randrange(mapa.alto))
+        if pos not in mapa.obstaculos:
+            return pos
+
+
+def comparar(lado, densidad=0.2, consultas=5, original=True):
+    mapa = _Mapa(lado, lado, densidad)
+    rng = random.Random(1)
+    pares = [(celda_libre(mapa, rng), celda_libre(mapa, rng)) for _ in range(consultas)]
+    tiempos = {"original": None, "bfs": 0.0, "a*": 0.0}
+
+    if original:
+        inicio = time.perf_counter()
+        rutas_originales = [bfs_original(mapa, a, b) for a, b in pares]
+        tiempos["original"] = (time.perf_counter() - inicio) / consultas
+
+    for nombre, a_estrella in (("bfs", False), ("a*", True)):
+        inicio = time.perf_counter()
+        rutas = [planificar(lado, lado, mapa_bloqueos(mapa), a, b, a_estrella)
+                 for a, b in pares]
+        tiempos[nombre] = (time.perf_counter() - inicio) / consultas
+        if original:
+            for ruta, ruta_original in zip(rutas, rutas_originales):
+                # BFS da la misma ruta; A* una ruta de la misma longitud
+                assert len(ruta) == len(ruta_original)
+                if not a_estrella:
+                    assert list(ruta) == ruta_original
+    return tiempos
+
+
+if __name__ == "__main__":
+    print("=== BENCHMARK: planificar_ruta (ms por replanificación, 20% obstáculos) ===\n")
+    print(f"{'mapa':>9} {'original':>10} {'BFS':>10} {'A*':>10}")
+    for lado in (8, 50, 200, 500):
+        # La versión original es inviable en mapas grandes
+        tiempos = comparar(lado, original=lado <= 200)
+        original = (f"{tiempos['original'] * 1000:>10.2f}"
+                    if tiempos["original"] is not None else f"{'-':>10}")
+        print(f"{lado:>4}x{lado:<4} {original} {tiempos['bfs'] * 1000:>10.2f} "
+              f"{tiempos['a*'] * 1000:>10.2f}")
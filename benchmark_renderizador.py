@@ -0,0 +1,50 @@
+import io
+import random
+import time
+from contextlib import redirect_stdout
+
+from renderizador import RenderizadorConsola
+
+
+def cuadros_aleatorios(lado, cuadros, cambios=5, semilla=0):
+    """Cuadros de un agente limpiando: pocas celdas cambian entre uno y otro"""
+    rng = random.Random(semilla)
+    grid = [["💩" if rng.random() < 0.3 else "⬜" for _ in range(lado)] for _ in range(lado)]
+    for _ in range(cuadros):
+        for _ in range(cambios):
+            grid[rng.randrange(lado)][rng.randrange(lado)] = "⬜"
+        yield [fila[:] for fila in grid]
+
+
+def por_celda(filas):
+    """Como los 'mostrar' anteriores: un print por celda"""
+    for fila in filas:
+        for celda in fila:
+            print(celda, end=" ")
+        print()
+    print()
+
+
+def medir(lado, modo, cuadros=20):
+    """Segundos por cuadro y bytes escritos con 'modo' = 'por_celda', 'completo' o 'diferencial'"""
+    salida = io.StringIO()
+    renderizador = RenderizadorConsola(salida, diferencial=(modo == "diferencial"))
+    inicio = time.perf_counter()
+    with redirect_stdout(salida):
+        for filas in cuadros_aleatorios(lado, cuadros):
+            if modo == "por_celda":
+                por_celda(filas)
+            else:
+                renderizador.dibujar(filas)
+    return (time.perf_counter() - inicio) / cuadros, len(salida.getvalue()) // cuadros
+
+
+if __name__ == "__main__":
+    print("=== BENCHMARK: dibujo de cuadros en consola (segundos y caracteres por cuadro) ===\n")
+    print(f"{'lado':>6} {'por celda':>18} {'completo':>18} {'diferencial':>18}")
+    for lado in (10, 50, 200):
+        columnas = []
+        for modo in ("por_celda", "completo", "diferencial"):
+            segundos, caracteres = medir(lado, modo)
+            columnas.append(f"{segundos:>9.5f} {caracteres:>8}")
+        print(f"{lado:>6} " + " ".join(columnas))
@@ -0,0 +1,389 @@
+"""Suite de benchmarks de los caminos calientes de agentes y entornos.
+
+Cada caso mide una operación a varios tamaños (lado del grid, mensajes,
+agentes, pasos) y reporta segundos por unidad: por consulta, por ruta, por
+decisión, por cuadro o por episodio. Los resultados se guardan como JSON y
+se pueden comparar contra una base guardada antes:
+
+    python benchmark_suite.py --guardar-base           # fija benchmark_base.json
+    python benchmark_suite.py --comparar               # sale con 1 si hay regresiones
+    python benchmark_suite.py --grafico escalado.png   # curvas de escalado
+    python benchmark_suite.py --rapido --casos mostrar planificar_ruta
+
+Los JSON de resultados y de base no se versionan (ver .gitignore).
+La base depende de la máquina: conviene guardarla y compararla en el mismo
+equipo y con la máquina quieta. Se compara el mínimo de cada medición, que
+es lo menos ruidoso; en máquinas compartidas conviene subir '--tolerancia'
+(25% por defecto). matplotlib se importa solo para '--grafico'.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import timeit
+
+import eventos
+import renderizador
+from agentObjet_AreasComida import AgenteRecolector, EntornoRecoleccion
+from agentReact_Memoria import EntornoGrid, SimpleLimpiezaAgente
+from bus_mensajes import BusMensajes, Mensaje
+from competirRecursos_multiagente import EntornoMultiAgente
+from evitarObjetivos_multiagente import AgenteCooperativo
+from experimentos import ejecutar_episodio
+from memoria_visitados import MemoriaVisitados
+
+VERSION = 1
+RUTA_BASE = "benchmark_base.json"
+RUTA_RESULTADOS = "benchmark_resultados.json"
+CONSULTAS = 100  # Consultas por llamada en los casos de percepción y decisión
+
+
+def _consultas(lado, rng, cantidad=CONSULTAS):
+    return [(rng.randrange(lado), rng.randrange(lado)) for _ in range(cantidad)]
+
+
+# Cada 'preparar_*' arma el estado con semilla fija y retorna
+# (operación sin argumentos, unidades que hace cada llamada), y opcionalmente
+# una función que libera lo abierto, llamada al terminar de medir
+
+def preparar_comida_cercana(lado):
+    """EntornoMultiAgente (índice espacial) con comida en el 5% de las celdas"""
+    random.seed(0)
+    entorno = EntornoMultiAgente(lado, lado, num_comida=max(1, lado * lado // 20))
+    consultas = _consultas(lado, random.Random(1))
+    obtener = entorno.obtener_comida_cercana
+
+    def operacion():
+        for x, y in consultas:
+            obtener(x, y, 3)
+    return operacion, len(consultas)
+
+
+def preparar_comida_visible(lado):
+    """EntornoRecoleccion (recorrido lineal) con comida en el 5% de las celdas"""
+    random.seed(0)
+    entorno = EntornoRecoleccion(lado, lado)
+    rng = random.Random(1)
+    for _ in range(lado * lado // 20):
+        pos = (rng.randrange(lado), rng.randrange(lado))
+        if pos not in entorno.obstaculos:
+            entorno.comida[pos] = 1
+    consultas = _consultas(lado, rng)
+    obtener = entorno.obtener_comida_visible
+
+    def operacion():
+        for x, y in consultas:
+            obtener(x, y, 5)
+    return operacion, len(consultas)
+
+
+def preparar_planificar_ruta(lado, a_estrella=False):
+    """Rutas desde una esquina a 10 celdas al azar, con 20% de obstáculos"""
+    random.seed(0)
+    entorno = EntornoRecoleccion(lado, lado)
+    rng = random.Random(1)
+    for _ in range(lado * lado // 5):
+        pos = (rng.randrange(lado), rng.randrange(lado))
+        if pos != (0, 0) and pos not in entorno.comida:
+            entorno.agregar_obstaculo(*pos)
+    agente = AgenteRecolector(0, 0, entorno, a_estrella=a_estrella)
+    objetivos = [pos for pos in _consultas(lado, rng, 10) if pos not in entorno.obstaculos]
+
+    def operacion():
+        for objetivo in objetivos:
+            agente.planificar_ruta(objetivo)
+    return operacion, len(objetivos)
+
+
+def preparar_procesar_mensajes(mensajes, bus=False):
+    """Bandeja de AgenteCooperativo con 'mensajes' mensajes.
+
+    Sin bus, la mitad son 'voy_a'; con bus los reclamos van al registro del
+    bus y en la bandeja solo hay 'comida_encontrada'.
+    """
+    rng = random.Random(0)
+    entorno = EntornoMultiAgente(10, 10, num_comida=0)
+    agente = AgenteCooperativo(1, 0, 0, entorno, BusMensajes() if bus else None)
+    for i in range(mensajes):
+        tipo = "voy_a" if not bus and i % 2 else "comida_encontrada"
+        agente.mensajes.append(Mensaje(i + 2, tipo, (rng.randrange(100), rng.randrange(100))))
+    return agente.procesar_mensajes, mensajes
+
+
+def preparar_decidir_y_actuar(lado, memoria="set"):
+    """SimpleLimpiezaAgente (memoria) con la mitad del grid ya visitada"""
+    random.seed(0)
+    entorno = EntornoGrid(lado, lado, 0)
+    agente = SimpleLimpiezaAgente(0, 0, visitados=(MemoriaVisitados(lado, lado)
+                                                   if memoria == "compacta" else None))
+    rng = random.Random(1)
+    for _ in range(lado * lado // 2):
+        agente.visitados.add((rng.randrange(lado), rng.randrange(lado)))
+    consultas = _consultas(lado, rng)
+
+    def operacion():
+        for x, y in consultas:
+            agente.x, agente.y = x, y
+            agente.decidir_y_actuar(False, entorno)
+    return operacion, len(consultas)
+
+
+def preparar_mostrar(lado):
+    """Un cuadro completo de EntornoGrid (10% de suciedad) hacia os.devnull"""
+    random.seed(0)
+    entorno = EntornoGrid(lado, lado, lado * lado // 10)
+    agente = SimpleLimpiezaAgente(lado // 2, lado // 2)
+    salida = open(os.devnull, "w", encoding="utf-8")
+    destino = renderizador.RenderizadorConsola(salida)
+
+    def operacion():
+        with renderizador.usar(destino):
+            entorno.mostrar(agente)
+    return operacion, 1, salida.close
+
+
+def _preparar_episodio(escenario, **parametros):
+    return lambda: ejecutar_episodio(escenario, 0, parametros), 1
+
+
+def preparar_simular_limpieza(pasos, escenario="memoria"):
+    return _preparar_episodio(escenario, pasos=pasos)
+
+
+def preparar_simular_recoleccion(pasos):
+    return _preparar_episodio("areas_comida", pasos=pasos)
+
+
+def preparar_simular_multi_agente(num_agentes, escenario="competencia"):
+    return _preparar_episodio(escenario, num_agentes=num_agentes, pasos=50)
+
+
+# Casos: nombre -> (preparar, parámetro del eje x, tamaños, variantes)
+CASOS = {
+    "obtener_comida_cercana": (preparar_comida_cercana, "lado", (10, 100, 1000), [{}]),
+    "obtener_comida_visible": (preparar_comida_visible, "lado", (10, 50, 200), [{}]),
+    "planificar_ruta": (preparar_planificar_ruta, "lado", (10, 50, 200),
+                        [{"a_estrella": False}, {"a_estrella": True}]),
+    "procesar_mensajes": (preparar_procesar_mensajes, "mensajes", (10, 100, 1000, 10000),
+                          [{"bus": False}, {"bus": True}]),
+    "decidir_y_actuar": (preparar_decidir_y_actuar, "lado", (10, 100, 1000),
+                         [{"memoria": "set"}, {"memoria": "compacta"}]),
+    "mostrar": (preparar_mostrar, "lado", (10, 50, 200), [{}]),
+    "simular_limpieza": (preparar_simular_limpieza, "pasos", (20, 100, 500),
+                         [{"escenario": "memoria"}, {"escenario": "tipos_suciedad"},
+                          {"escenario": "obstaculos"}]),
+    "simular_recoleccion": (preparar_simular_recoleccion, "pasos", (30, 100, 300), [{}]),
+    "simular_multi_agente": (preparar_simular_multi_agente, "num_agentes", (3, 10, 50),
+                             [{"escenario": "competencia"}, {"escenario": "cooperacion"}]),
+}
+
+
+def medir(operacion, unidades, repeticiones=5, minimo=0.05):
+    """Segundos por unidad: mínimo y mediana de 'repeticiones' mediciones.
+
+    Como timeit.autorange: cada medición repite la operación las vueltas
+    necesarias para durar al menos 'minimo' segundos.
+    """
+    temporizador = timeit.Timer(operacion)
+    vueltas = 1
+    while temporizador.timeit(vueltas) < minimo:  # También calienta caches
+        vueltas *= 2
+    tiempos = sorted(t / (vueltas * unidades)
+                     for t in temporizador.repeat(repeticiones, vueltas))
+    return {"segundos": tiempos[0], "mediana": tiempos[len(tiempos) // 2],
+            "vueltas": vueltas, "unidades": unidades}
+
+
+def ejecutar(casos=None, rapido=False, repeticiones=5, progreso=None):
+    """Corre los casos (todos por defecto) y retorna el documento JSON.
+
+    'rapido' omite el tamaño más grande de cada caso.
+    """
+    documento = {
+        "version": VERSION,
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "maquina": {"python": platform.python_version(), "sistema": platform.platform(),
+                    "procesador": platform.processor() or platform.machine(),
+                    "cpus": os.cpu_count()},
+        "casos": {},
+    }
+    with eventos.usar(eventos.silencioso()):
+        for nombre in casos or CASOS:
+            preparar, eje, tamanos, variantes = CASOS[nombre]
+            if rapido:
+                tamanos = tamanos[:-1]
+            mediciones = []
+            for variante in variantes:
+                for tamano in tamanos:
+                    parametros = dict(variante, **{eje: tamano})
+                    operacion, unidades, *cerrar = preparar(**parametros)
+                    try:
+                        medicion = medir(operacion, unidades, repeticiones=repeticiones)
+                    finally:
+                        for funcion in cerrar:
+                            funcion()
+                    mediciones.append(dict(parametros=parametros, **medicion))
+                    if progreso:
+                        progreso(nombre, mediciones[-1])
+            documento["casos"][nombre] = {"eje": eje, "mediciones": mediciones}
+    return documento
+
+
+def guardar(documento, ruta):
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(documento, archivo, indent=1)
+
+
+def cargar(ruta):
+    with open(ruta, encoding="utf-8") as archivo:
+        documento = json.load(archivo)
+    if documento.get("version") != VERSION:
+        raise ValueError(f"{ruta}: versión de resultados {documento.get('version')}, "
+                         f"se esperaba {VERSION}")
+    return documento
+
+
+def _clave(parametros):
+    return json.dumps(parametros, sort_keys=True)
+
+
+def comparar(actual, base, tolerancia=0.25):
+    """Compara los mínimos de cada medición presente en ambos documentos.
+
+    Retorna filas {caso, parametros, base, actual, razon, estado}, con
+    'razon' = actual / base y 'estado' "regresión" (más lento que la base
+    por más de 'tolerancia'), "mejora" (más rápido por el mismo margen) o
+    "igual".
+    """
+    filas = []
+    for nombre, caso in actual["casos"].items():
+        anteriores = {_clave(m["parametros"]): m
+                      for m in base["casos"].get(nombre, {}).get("mediciones", ())}
+        for medicion in caso["mediciones"]:
+            anterior = anteriores.get(_clave(medicion["parametros"]))
+            if anterior is None:
+                continue
+            razon = medicion["segundos"] / anterior["segundos"]
+            if razon > 1 + tolerancia:
+                estado = "regresión"
+            elif razon < 1 / (1 + tolerancia):
+                estado = "mejora"
+            else:
+                estado = "igual"
+            filas.append({"caso": nombre, "parametros": medicion["parametros"],
+                          "base": anterior["segundos"], "actual": medicion["segundos"],
+                          "razon": razon, "estado": estado})
+    return filas
+
+
+def _formato_parametros(parametros):
+    return " ".join(f"{clave}={valor}" for clave, valor in parametros.items())
+
+
+def _formato_tiempo(segundos):
+    for unidad, escala in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if segundos >= escala:
+            return f"{segundos / escala:.2f} {unidad}"
+    return f"{segundos / 1e-9:.0f} ns"
+
+
+def mostrar_medicion(nombre, medicion):
+    print(f"{nombre:<24} {_formato_parametros(medicion['parametros']):<34} "
+          f"{_formato_tiempo(medicion['segundos']):>10} {_formato_tiempo(medicion['mediana']):>10}")
+
+
+def mostrar_comparacion(filas):
+    print(f"\n{'caso':<24} {'parámetros':<34} {'base':>10} {'actual':>10} {'razón':>7}  estado")
+    for fila in filas:
+        print(f"{fila['caso']:<24} {_formato_parametros(fila['parametros']):<34} "
+              f"{_formato_tiempo(fila['base']):>10} {_formato_tiempo(fila['actual']):>10} "
+              f"{fila['razon']:>6.2f}x  {fila['estado']}")
+    conteo = {estado: sum(f["estado"] == estado for f in filas)
+              for estado in ("regresión", "mejora", "igual")}
+    print(f"\n{conteo['regresión']} regresiones, {conteo['mejora']} mejoras, "
+          f"{conteo['igual']} sin cambios")
+
+
+def graficar(documento, ruta, base=None):
+    """Curvas de escalado (log-log), un panel por caso y una curva por
+    variante; la base, si se da, va con línea punteada. Sin ventana (Agg)."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    casos = documento["casos"]
+    columnas = 3
+    filas = -(-len(casos) // columnas)
+    fig = Figure(figsize=(5 * columnas, 3.6 * filas))
+    FigureCanvasAgg(fig)
+    for i, (nombre, caso) in enumerate(casos.items()):
+        ax = fig.add_subplot(filas, columnas, i + 1)
+        eje = caso["eje"]
+        colores = {}
+        fuentes = [(caso, "-o", "")]
+        if base is not None and nombre in base["casos"]:
+            fuentes.append((base["casos"][nombre], ":x", " (base)"))
+        for fuente, estilo, sufijo in fuentes:
+            curvas = {}
+            for medicion in fuente["mediciones"]:
+                variante = {k: v for k, v in medicion["parametros"].items() if k != eje}
+                curvas.setdefault(_formato_parametros(variante), []).append(
+                    (medicion["parametros"][eje], medicion["segundos"]))
+            for etiqueta, puntos in curvas.items():
+                puntos.sort()
+                # La base de cada variante, del mismo color que la medición actual
+                linea, = ax.plot([p[0] for p in puntos], [p[1] for p in puntos], estilo,
+                                 color=colores.get(etiqueta), label=(etiqueta or nombre) + sufijo)
+                colores.setdefault(etiqueta, linea.get_color())
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+        ax.set_title(nombre)
+        ax.set_xlabel(eje)
+        ax.set_ylabel("segundos por unidad")
+        ax.legend(fontsize="small")
+    fig.tight_layout()
+    fig.savefig(ruta)
+    return ruta
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks de agentes y entornos")
+    parser.add_argument("--casos", nargs="+", choices=list(CASOS), default=None)
+    parser.add_argument("--rapido", action="store_true", help="Omite el tamaño más grande")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--salida", default=RUTA_RESULTADOS, help="JSON de resultados")
+    parser.add_argument("--cargar", default=None,
+                        help="No medir: usar un JSON de resultados ya guardado")
+    parser.add_argument("--base", default=RUTA_BASE)
+    parser.add_argument("--guardar-base", action="store_true",
+                        help="Guarda también los resultados como base")
+    parser.add_argument("--comparar", action="store_true", help="Compara contra la base")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="Margen relativo antes de marcar regresión o mejora")
+    parser.add_argument("--grafico", default=None, help="PNG con las curvas de escalado")
+    args = parser.parse_args()
+
+    if args.cargar:
+        documento = cargar(args.cargar)
+    else:
+        print("=== BENCHMARK: suite de agentes y entornos (segundos por unidad) ===\n")
+        print(f"{'caso':<24} {'parámetros':<34} {'mínimo':>10} {'mediana':>10}")
+        documento = ejecutar(args.casos, args.rapido, args.repeticiones, mostrar_medicion)
+        guardar(documento, args.salida)
+        print(f"\nResultados en {args.salida}")
+    if args.guardar_base:
+        guardar(documento, args.base)
+        print(f"Base guardada en {args.base}")
+
+    base = None
+    if args.comparar or (args.grafico and os.path.exists(args.base)):
+        base = cargar(args.base)
+    if args.grafico:
+        print(f"Gráfico en {graficar(documento, args.grafico, base)}")
+    if args.comparar:
+        filas = comparar(documento, base, args.tolerancia)
+        mostrar_comparacion(filas)
+        if any(fila["estado"] == "regresión" for fila in filas):
+            sys.exit(1)
@@ -0,0 +1,36 @@
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import eventos
+from competirRecursos_multiagente import AgenteCompetitivo, EntornoMultiAgente, ejecutar_paso
+
+
+def medir(num_agentes, modo, ejecutor=None, ticks=3, semilla=0):
+    """Segundos por tick de AgenteCompetitivo con 'modo' = 'secuencial' o 'sincrono'"""
+    random.seed(semilla)
+    # El mundo crece con la población: ~36 celdas y ~5 comidas por agente
+    lado = max(10, int(math.sqrt(num_agentes) * 6))
+    entorno = EntornoMultiAgente(lado, lado, num_comida=num_agentes * 5)
+    agentes = [AgenteCompetitivo(i + 1, random.randrange(lado), random.randrange(lado), entorno)
+               for i in range(num_agentes)]
+
+    inicio = time.perf_counter()
+    with eventos.usar(eventos.silencioso()):
+        for tick in range(ticks):
+            ejecutar_paso(agentes, modo == "sincrono", tick, ejecutor)
+    return (time.perf_counter() - inicio) / ticks
+
+
+if __name__ == "__main__":
+    trabajadores = os.cpu_count() or 1
+    print("=== BENCHMARK: tick secuencial vs. sincrónico (segundos por tick) ===\n")
+    print(f"{'agentes':>8} {'secuencial':>11} {'sincrono':>10} {'hilos':>10} {'procesos':>10}")
+    with ThreadPoolExecutor(trabajadores) as hilos, ProcessPoolExecutor(trabajadores) as procesos:
+        for num_agentes in (100, 1000, 10000):
+            print(f"{num_agentes:>8} {medir(num_agentes, 'secuencial'):>11.4f} "
+                  f"{medir(num_agentes, 'sincrono'):>10.4f} "
+                  f"{medir(num_agentes, 'sincrono', hilos):>10.4f} "
+                  f"{medir(num_agentes, 'sincrono', procesos):>10.4f}")
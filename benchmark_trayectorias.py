@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import eventos
+from competirRecursos_multiagente import simular_multi_agente
+from trayectorias import GrabadorTrayectorias, leer
+
+
+def grabar_filas(directorio, filas, agentes=100):
+    """Segundos en registrar 'filas' filas y cerrar la grabación"""
+    inicio = time.perf_counter()
+    with GrabadorTrayectorias(directorio) as grabador:
+        registrar = grabador.registrar
+        for fila in range(filas):
+            registrar(fila // agentes, fila % agentes, fila & 63, fila & 127, "arriba", 0)
+    return time.perf_counter() - inicio
+
+
+def pico_memoria(directorio, filas):
+    """Pico de memoria de Python (bytes) al grabar 'filas' filas
+
+    Se mide aparte porque tracemalloc hace mucho más lenta la grabación.
+    """
+    tracemalloc.start()
+    grabar_filas(directorio, filas)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico
+
+
+def episodios(directorio, cantidad):
+    """Segundos de 'cantidad' episodios de competencia, sin y con grabador"""
+    with eventos.usar(eventos.silencioso()):
+        inicio = time.perf_counter()
+        for semilla in range(cantidad):
+            simular_multi_agente(num_agentes=10, pasos=100, semilla=semilla)
+        sin = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        with GrabadorTrayectorias(directorio) as grabador:
+            for semilla in range(cantidad):
+                simular_multi_agente(num_agentes=10, pasos=100, semilla=semilla,
+                                     grabador=grabador)
+        return sin, time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    print("=== BENCHMARK: grabador de trayectorias ===\n")
+    directorio = tempfile.mkdtemp()
+    try:
+        for filas in (10 ** 5, 10 ** 6, 10 ** 7):
+            segundos = grabar_filas(directorio, filas)
+            columnas = leer(directorio)
+            assert len(columnas["tick"]) == filas
+            disco = sum(os.path.getsize(os.path.join(directorio, f"{nombre}.col"))
+                        for nombre in columnas)
+            print(f"{filas:>10} filas: {segundos:6.2f} s ({filas / segundos / 1e6:.2f} M filas/s, "
+                  f"{segundos / filas * 1e9:.0f} ns/fila), disco {disco / 2 ** 20:6.1f} MiB")
+
+        inicio = time.perf_counter()
+        columnas = leer(directorio)
+        total = columnas["x"].sum(dtype="int64")
+        print(f"\nLeer y sumar la columna 'x' de {len(columnas['x'])} filas con np.memmap: "
+              f"{time.perf_counter() - inicio:.3f} s (suma {total})")
+        print(f"\nPico de memoria de Python grabando 2 M filas: "
+              f"{pico_memoria(directorio, 2 * 10 ** 6) / 2 ** 20:.1f} MiB")
+
+        sin, con = episodios(directorio, 50)
+        print(f"\n50 episodios de competencia (10 agentes, 100 pasos): {sin:.2f} s sin grabador, "
+              f"{con:.2f} s con grabador ({(con / sin - 1) * 100:+.0f}%)")
+    finally:
+        shutil.rmtree(directorio)
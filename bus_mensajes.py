@@ -0,0 +1,96 @@
+from collections import namedtuple
+
+from indice_espacial import IndiceEspacial
+
+# Registro compacto de un mensaje (reemplaza al dict {'de', 'tipo', 'contenido'})
+Mensaje = namedtuple("Mensaje", "de tipo contenido")
+
+
+class RegistroReclamos:
+    """Objetivos reclamados ('voy_a'): posición -> id del agente que la reclamó"""
+
+    def __init__(self):
+        self.duenos = {}
+
+    def reclamar(self, agente_id, pos):
+        self.duenos[pos] = agente_id
+
+    def liberar(self, agente_id, pos):
+        """Quita el reclamo solo si sigue siendo de 'agente_id'"""
+        if self.duenos.get(pos) == agente_id:
+            del self.duenos[pos]
+
+    def __contains__(self, pos):
+        return pos in self.duenos
+
+    def __len__(self):
+        return len(self.duenos)
+
+
+class BusMensajes:
+    """Bus de mensajes con suscripción por tipo y entrega en lote una vez por tick.
+
+    Los mensajes publicados durante el tick se acumulan (los repetidos, como
+    la misma comida reportada por varios agentes, se guardan una sola vez) y
+    'entregar()' los reparte a los suscriptores. Con 'radio', cada agente solo
+    recibe lo publicado por agentes a esa distancia Manhattan o menos.
+    """
+
+    def __init__(self, radio=None, entorno=None):
+        if radio is not None and entorno is None:
+            raise ValueError("Un bus con radio de comunicación necesita el entorno")
+        self.radio = radio
+        self.entorno = entorno
+        self.suscriptores = {}  # tipo -> [agentes]
+        self.pendientes = {}    # clave -> (Mensaje, x, y) del remitente
+        self.reclamos = RegistroReclamos()
+        # Estadísticas acumuladas
+        self.publicados = 0
+        self.entregados = 0
+
+    def suscribir(self, agente, tipos):
+        for tipo in tipos:
+            self.suscriptores.setdefault(tipo, []).append(agente)
+
+    def publicar(self, remitente, tipo, contenido):
+        self.publicados += 1
+        if self.radio is None:
+            clave = (tipo, contenido)
+        else:
+            # Con radio importa desde dónde se envió
+            clave = (tipo, contenido, remitente.x, remitente.y)
+        if clave not in self.pendientes:
+            self.pendientes[clave] = (Mensaje(remitente.id, tipo, contenido),
+                                      remitente.x, remitente.y)
+
+    def entregar(self):
+        """Reparte lo publicado en este tick y vacía la cola"""
+        por_tipo = {}
+        for entrada in self.pendientes.values():
+            por_tipo.setdefault(entrada[0].tipo, []).append(entrada)
+        self.pendientes = {}
+
+        for tipo, agentes in self.suscriptores.items():
+            entradas = por_tipo.get(tipo)
+            if not entradas:
+                continue
+            if self.radio is None:
+                # Un único lote compartido por todos los suscriptores
+                lote = tuple(msg for msg, _, _ in entradas)
+                for agente in agentes:
+                    agente.mensajes.extend(lote)
+                self.entregados += len(lote) * len(agentes)
+            else:
+                self._entregar_por_radio(entradas, agentes)
+
+    def _entregar_por_radio(self, entradas, agentes):
+        por_posicion = {}
+        for msg, x, y in entradas:
+            por_posicion.setdefault((x, y), []).append(msg)
+        indice = IndiceEspacial(self.entorno.ancho, self.entorno.alto,
+                                self.radio, por_posicion)
+        for agente in agentes:
+            for pos in indice.consultar_radio(agente.x, agente.y, self.radio):
+                mensajes = por_posicion[pos]
+                agente.mensajes.extend(mensajes)
+                self.entregados += len(mensajes)
@@ -0,0 +1,386 @@
+import json
+import os
+import random
+import struct
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from bus_mensajes import Mensaje
+from indice_espacial import IndiceEspacial
+from mapa_calor import MapaCalor, MapaCalorDisperso
+from memoria_visitados import MemoriaVisitados
+from planificador import CacheCamposFlujo
+
+# Formato del archivo:
+#   cabecera: magia, versión del formato, reservado, bytes de metadatos
+#   metadatos: JSON en UTF-8 (tipo, datos chicos e índice de arreglos)
+#   arreglos: bytes crudos en orden C, cada uno alineado a ALINEACION bytes
+# Los arreglos se leen como np.memmap en modo copia-al-escribir: cargar un
+# mundo grande no lo lee entero, y varias variantes bifurcadas del mismo
+# checkpoint comparten las páginas que no modifican.
+MAGIA = b"AGNTCKPT"
+VERSION = 1
+_CABECERA = struct.Struct("<8sHHQ")
+ALINEACION = 64
+
+
+def _alinear(n):
+    return -(-n // ALINEACION) * ALINEACION
+
+
+def guardar(ruta, tipo, datos, arreglos):
+    """Escribe un checkpoint. 'datos' debe ser serializable a JSON y
+    'arreglos' es {nombre: arreglo de NumPy}.
+
+    Se escribe a 'ruta.tmp' y se renombra: si el proceso muere a mitad de
+    la escritura, el checkpoint anterior queda intacto.
+    """
+    arreglos = {nombre: np.ascontiguousarray(a) for nombre, a in arreglos.items()}
+    indice = {}
+    desplazamiento = 0
+    for nombre, arreglo in arreglos.items():
+        indice[nombre] = {"dtype": arreglo.dtype.str, "forma": list(arreglo.shape),
+                          "offset": desplazamiento}
+        desplazamiento = _alinear(desplazamiento + arreglo.nbytes)
+    meta = json.dumps({"tipo": tipo, "datos": datos, "arreglos": indice}).encode("utf-8")
+    inicio = _alinear(_CABECERA.size + len(meta))
+
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(_CABECERA.pack(MAGIA, VERSION, 0, len(meta)))
+        archivo.write(meta)
+        for nombre, arreglo in arreglos.items():
+            archivo.seek(inicio + indice[nombre]["offset"])
+            arreglo.tofile(archivo)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(temporal, ruta)
+
+
+def cargar(ruta, tipo=None, mmap=True):
+    """Lee un checkpoint y retorna (datos, arreglos).
+
+    Con 'mmap' los arreglos son np.memmap copia-al-escribir (modificarlos no
+    cambia el archivo); sin 'mmap' se leen a memoria.
+    """
+    with open(ruta, "rb") as archivo:
+        magia, version, _, tam_meta = _CABECERA.unpack(archivo.read(_CABECERA.size))
+        if magia != MAGIA:
+            raise ValueError(f"{ruta} no es un checkpoint")
+        if version > VERSION:
+            raise ValueError(f"{ruta} tiene el formato {version}; "
+                             f"esta versión lee hasta el {VERSION}")
+        meta = json.loads(archivo.read(tam_meta).decode("utf-8"))
+        if tipo is not None and meta["tipo"] != tipo:
+            raise ValueError(f"{ruta} es un checkpoint de '{meta['tipo']}', no de '{tipo}'")
+
+        inicio = _alinear(_CABECERA.size + tam_meta)
+        arreglos = {}
+        for nombre, info in meta["arreglos"].items():
+            dtype = np.dtype(info["dtype"])
+            forma = tuple(info["forma"])
+            cantidad = int(np.prod(forma))
+            if cantidad == 0:
+                arreglos[nombre] = np.empty(forma, dtype=dtype)
+            elif mmap:
+                arreglos[nombre] = np.memmap(ruta, dtype=dtype, mode="c", shape=forma,
+                                             offset=inicio + info["offset"])
+            else:
+                archivo.seek(inicio + info["offset"])
+                arreglos[nombre] = np.fromfile(archivo, dtype=dtype, count=cantidad).reshape(forma)
+    return meta["datos"], arreglos
+
+
+### Estado del generador global 'random'
+def estado_rng():
+    """(metadatos, arreglo uint32) con el estado de 'random'"""
+    version, interno, gauss = random.getstate()
+    return {"version": version, "gauss": gauss}, np.array(interno, dtype=np.uint32)
+
+
+def restaurar_rng(meta, interno):
+    random.setstate((meta["version"], tuple(int(v) for v in interno), meta["gauss"]))
+
+
+### Conversión de colecciones de posiciones
+def _posiciones(conjunto):
+    """Arreglo (n, 2) int32 de posiciones (x, y), en el orden de iteración"""
+    return np.array(list(conjunto), dtype=np.int32).reshape(-1, 2)
+
+
+def _tuplas(arreglo):
+    return [tuple(pos) for pos in arreglo.tolist()]
+
+
+def _tupla(valor):
+    """JSON devuelve listas: posiciones y contenidos vuelven a ser tuplas"""
+    return tuple(_tupla(v) for v in valor) if isinstance(valor, list) else valor
+
+
+def _validar_tamano(datos, entorno):
+    if (datos["ancho"], datos["alto"]) != (entorno.ancho, entorno.alto):
+        raise ValueError(f"El checkpoint es de un mundo de {datos['ancho']}x{datos['alto']}, "
+                         f"no de {entorno.ancho}x{entorno.alto}")
+
+
+### Simulaciones multi-agente (competencia y evitación de objetivos)
+def guardar_multi_agente(ruta, paso, entorno, agentes, bus=None):
+    """Comida, agentes (posición, objetivo, puntos y mensajes sin procesar),
+    bus (mensajes pendientes, reclamos y estadísticas) y estado de 'random'"""
+    filas = [(a.id, a.x, a.y, a.comida_recolectada,
+              *(a.objetivo if a.objetivo is not None else (-1, -1))) for a in agentes]
+    meta_rng, interno = estado_rng()
+    datos = {
+        "paso": paso,
+        "ancho": entorno.ancho,
+        "alto": entorno.alto,
+        "rng": meta_rng,
+        "mensajes": [list(getattr(a, "mensajes", ())) for a in agentes],
+        "asignacion_central": [getattr(a, "asignacion_central", False) for a in agentes],
+        "bus": None if bus is None else {
+            "pendientes": [[*msg, x, y] for msg, x, y in bus.pendientes.values()],
+            "reclamos": [[*pos, dueno] for pos, dueno in bus.reclamos.duenos.items()],
+            "publicados": bus.publicados,
+            "entregados": bus.entregados,
+        },
+    }
+    arreglos = {
+        "rng": interno,
+        "comida": _posiciones(entorno.comida),
+        "agentes": np.array(filas, dtype=np.int64).reshape(-1, 6),
+    }
+    guardar(ruta, "multi_agente", datos, arreglos)
+
+
+def restaurar_multi_agente(ruta, entorno, agentes, bus=None, mmap=True):
+    """Vuelca el checkpoint sobre 'entorno', 'agentes' y 'bus' ya creados
+    (mismo tamaño y cantidad de agentes). Retorna el paso guardado."""
+    datos, arreglos = cargar(ruta, "multi_agente", mmap)
+    _validar_tamano(datos, entorno)
+    if len(arreglos["agentes"]) != len(agentes):
+        raise ValueError(f"El checkpoint tiene {len(arreglos['agentes'])} agentes, "
+                         f"no {len(agentes)}")
+    if (datos["bus"] is None) != (bus is None):
+        raise ValueError("El checkpoint y la simulación no coinciden en el uso del bus")
+
+    entorno.comida = set(_tuplas(arreglos["comida"]))
+    entorno.indice_comida = IndiceEspacial(entorno.ancho, entorno.alto,
+                                           entorno.indice_comida.tam_cubeta, entorno.comida)
+
+    por_id = {agente.id: agente for agente in agentes}
+    filas = arreglos["agentes"].tolist()
+    for fila, mensajes, central in zip(filas, datos["mensajes"], datos["asignacion_central"]):
+        id_agente, x, y, comida, ox, oy = fila
+        agente = por_id[id_agente]
+        agente.x, agente.y = x, y
+        agente.comida_recolectada = comida
+        agente.objetivo = (ox, oy) if ox >= 0 else None
+        if hasattr(agente, "mensajes"):
+            agente.mensajes = [Mensaje(de, tipo, _tupla(contenido))
+                               for de, tipo, contenido in mensajes]
+            agente.asignacion_central = central
+
+    if bus is not None:
+        bus.pendientes = {}
+        for de, tipo, contenido, x, y in datos["bus"]["pendientes"]:
+            contenido = _tupla(contenido)
+            clave = (tipo, contenido) if bus.radio is None else (tipo, contenido, x, y)
+            bus.pendientes[clave] = (Mensaje(de, tipo, contenido), x, y)
+        bus.reclamos.duenos = {(x, y): dueno for x, y, dueno in datos["bus"]["reclamos"]}
+        bus.publicados = datos["bus"]["publicados"]
+        bus.entregados = datos["bus"]["entregados"]
+
+    restaurar_rng(datos["rng"], arreglos["rng"])
+    return datos["paso"]
+
+
+### Recolección con mapa de calor (agentObjet_AreasComida)
+def guardar_recoleccion(ruta, paso, entorno, agente, visitadas):
+    """Comida y obstáculos, agente (plan, destino, mapa de calor y campos de
+    flujo cacheados), casillas visitadas y estado de 'random'"""
+    meta_rng, interno = estado_rng()
+    cache = agente.cache_campos
+    n = entorno.ancho * entorno.alto
+    datos = {
+        "paso": paso,
+        "ancho": entorno.ancho,
+        "alto": entorno.alto,
+        "rng": meta_rng,
+        "version_obstaculos": entorno.version_obstaculos,
+        "agente": {
+            "x": agente.x, "y": agente.y,
+            "energia": agente.energia,
+            "puntos": agente.puntos_recolectados,
+            "plan": list(agente.plan),
+            "destino": agente.destino,
+            "version_campo": agente.version_campo,
+        },
+        "cache": {"version": cache.version, "aciertos": cache.aciertos,
+                  "fallos": cache.fallos, "invalidaciones": cache.invalidaciones},
+    }
+    arreglos = {
+        "rng": interno,
+        "comida": _posiciones(entorno.comida),
+        "valor_comida": np.array(list(entorno.comida.values()), dtype=np.int32),
+        "obstaculos": _posiciones(entorno.obstaculos),
+        "visitadas": _posiciones(visitadas),
+        "cache_claves": _posiciones(cache.campos),
+        "cache_campos": np.array([np.frombuffer(c, dtype=np.uint8) for c in cache.campos.values()],
+                                 dtype=np.uint8).reshape(-1, n),
+    }
+    if agente.campo is not None:
+        arreglos["campo"] = np.frombuffer(agente.campo, dtype=np.uint8)
+
+    calor = agente.calor
+    if isinstance(calor, MapaCalorDisperso):
+        datos["calor"] = {"tipo": "disperso", "tam_bloque": calor.tam_bloque}
+        tam = calor.tam_bloque
+        arreglos["calor_claves"] = _posiciones(calor.bloques)
+        arreglos["calor_bloques"] = np.array(list(calor.bloques.values()),
+                                             dtype=calor.dtype).reshape(-1, tam, tam)
+    else:
+        datos["calor"] = {"tipo": "denso"}
+        arreglos["calor"] = calor.valores
+    guardar(ruta, "recoleccion", datos, arreglos)
+
+
+def restaurar_recoleccion(ruta, entorno, agente, visitadas, mmap=True):
+    """Vuelca el checkpoint sobre 'entorno', 'agente' y el set 'visitadas'.
+    Retorna el paso guardado."""
+    datos, arreglos = cargar(ruta, "recoleccion", mmap)
+    _validar_tamano(datos, entorno)
+
+    entorno.comida = dict(zip(_tuplas(arreglos["comida"]), arreglos["valor_comida"].tolist()))
+    entorno.obstaculos = set(_tuplas(arreglos["obstaculos"]))
+    entorno.version_obstaculos = datos["version_obstaculos"]
+    visitadas.clear()
+    visitadas.update(_tuplas(arreglos["visitadas"]))
+
+    estado = datos["agente"]
+    agente.x, agente.y = estado["x"], estado["y"]
+    agente.energia = estado["energia"]
+    agente.puntos_recolectados = estado["puntos"]
+    agente.plan = deque(estado["plan"])
+    agente.destino = _tupla(estado["destino"])
+    agente.version_campo = estado["version_campo"]
+    agente.campo = bytearray(arreglos["campo"]) if "campo" in arreglos else None
+
+    # Cache nueva (los bloqueos se recalculan con los obstáculos restaurados)
+    cache = agente.cache_campos = CacheCamposFlujo(entorno, agente.cache_campos.capacidad)
+    cache.campos = OrderedDict(zip(_tuplas(arreglos["cache_claves"]),
+                                   (bytearray(c) for c in arreglos["cache_campos"])))
+    for campo, valor in datos["cache"].items():
+        setattr(cache, campo, valor)
+
+    # El mapa de calor usa los arreglos del checkpoint sin copiarlos
+    if datos["calor"]["tipo"] == "disperso":
+        bloques = arreglos["calor_bloques"]
+        agente.calor = MapaCalorDisperso(entorno.ancho, entorno.alto, dtype=bloques.dtype,
+                                         tam_bloque=datos["calor"]["tam_bloque"])
+        agente.calor.cargar_bloques(zip(_tuplas(arreglos["calor_claves"]), bloques))
+    else:
+        agente.calor = MapaCalor(entorno.ancho, entorno.alto, dtype=arreglos["calor"].dtype)
+        agente.calor.cargar(arreglos["calor"])
+
+    restaurar_rng(datos["rng"], arreglos["rng"])
+    return datos["paso"]
+
+
+### Limpieza con memoria de visitados (agentReact_Memoria, agenReact_TiposSuciedad,
+### agentReact_Obstaculos)
+# Puntos del agente según el escenario
+_PUNTOS_LIMPIEZA = ("suciedad_limpiada", "puntos_limpieza")
+
+
+def guardar_limpieza(ruta, paso, entorno, agente):
+    """Suciedad y obstáculos (set, diccionarios o planos densos), agente
+    (posición, puntos, visitados y estado de la cobertura) y estado de 'random'"""
+    meta_rng, interno = estado_rng()
+    datos = {
+        "paso": paso,
+        "ancho": entorno.ancho,
+        "alto": entorno.alto,
+        "rng": meta_rng,
+        "agente": {"x": agente.x, "y": agente.y,
+                   "puntos": {nombre: getattr(agente, nombre)
+                              for nombre in _PUNTOS_LIMPIEZA if hasattr(agente, nombre)}},
+    }
+    arreglos = {"rng": interno}
+
+    if hasattr(entorno, "plano_suciedad"):
+        # EntornoGridDenso: los planos van tal cual
+        datos["entorno"] = {"tipo": "denso", "items_suciedad": entorno.items_suciedad}
+        arreglos["plano_suciedad"] = entorno.plano_suciedad
+        arreglos["plano_obstaculos"] = entorno.plano_obstaculos
+    else:
+        suciedad = entorno.suciedad
+        datos["entorno"] = {"tipo": "conjunto" if isinstance(suciedad, set) else "valores"}
+        arreglos["suciedad"] = _posiciones(suciedad)
+        if isinstance(suciedad, dict):
+            arreglos["valor_suciedad"] = np.array(list(suciedad.values()), dtype=np.uint8)
+        obstaculos = getattr(entorno, "obstaculos", None)
+        if obstaculos is not None:
+            # Íconos como índice en 'tipos_obstaculos_posibles'
+            tipos = entorno.tipos_obstaculos_posibles
+            datos["entorno"]["tipos_obstaculos"] = tipos
+            arreglos["obstaculos"] = _posiciones(obstaculos)
+            arreglos["tipo_obstaculos"] = np.array([tipos.index(t) for t in obstaculos.values()],
+                                                   dtype=np.uint8)
+
+    visitados = agente.visitados
+    if isinstance(visitados, MemoriaVisitados):
+        datos["visitados"] = "compacta"
+        arreglos["visitados"] = np.frombuffer(visitados.celdas, dtype=np.uint8)
+    else:
+        datos["visitados"] = "conjunto"
+        arreglos["visitados"] = _posiciones(visitados)
+
+    if agente.cobertura is not None:
+        datos["cobertura"] = agente.cobertura.estado()
+        arreglos["frontera"] = _posiciones(agente.cobertura.frontera)
+    guardar(ruta, "limpieza", datos, arreglos)
+
+
+def restaurar_limpieza(ruta, entorno, agente, mmap=True):
+    """Vuelca el checkpoint sobre 'entorno' y 'agente' ya creados (mismo
+    tamaño y mismos modos). Retorna el paso guardado."""
+    datos, arreglos = cargar(ruta, "limpieza", mmap)
+    _validar_tamano(datos, entorno)
+    estado = datos["entorno"]
+    if (estado["tipo"] == "denso") != hasattr(entorno, "plano_suciedad"):
+        raise ValueError("El checkpoint y la simulación no coinciden en el modo denso")
+    if (datos["visitados"] == "compacta") != isinstance(agente.visitados, MemoriaVisitados):
+        raise ValueError("El checkpoint y la simulación no coinciden en la memoria de visitados")
+    if ("cobertura" in datos) != (agente.cobertura is not None):
+        raise ValueError("El checkpoint y la simulación no coinciden en la cobertura")
+
+    if estado["tipo"] == "denso":
+        # Se copia sobre los planos existentes: sus vistas planas siguen valiendo
+        entorno.plano_suciedad[...] = arreglos["plano_suciedad"]
+        entorno.plano_obstaculos[...] = arreglos["plano_obstaculos"]
+        entorno.items_suciedad = estado["items_suciedad"]
+    else:
+        posiciones = _tuplas(arreglos["suciedad"])
+        if estado["tipo"] == "conjunto":
+            entorno.suciedad = set(posiciones)
+        else:
+            entorno.suciedad = dict(zip(posiciones, arreglos["valor_suciedad"].tolist()))
+        if "obstaculos" in arreglos:
+            tipos = estado["tipos_obstaculos"]
+            entorno.obstaculos = dict(zip(_tuplas(arreglos["obstaculos"]),
+                                          (tipos[i] for i in arreglos["tipo_obstaculos"].tolist())))
+
+    agente.x, agente.y = datos["agente"]["x"], datos["agente"]["y"]
+    for nombre, valor in datos["agente"]["puntos"].items():
+        setattr(agente, nombre, valor)
+    if datos["visitados"] == "compacta":
+        agente.visitados.cargar(arreglos["visitados"])
+    else:
+        agente.visitados = set(_tuplas(arreglos["visitados"]))
+    if agente.cobertura is not None:
+        agente.cobertura.restaurar(datos["cobertura"], _tuplas(arreglos["frontera"]),
+                                   entorno.ancho, entorno.alto)
+
+    restaurar_rng(datos["rng"], arreglos["rng"])
+    return datos["paso"]
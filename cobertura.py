@@ -0,0 +1,141 @@
+from collections import deque
+
+# Desplazamiento de cada dirección, en el orden de planificador.DIRECCIONES
+_DELTAS = (("arriba", 0, -1), ("abajo", 0, 1), ("izquierda", -1, 0), ("derecha", 1, 0))
+
+MODOS = ("frontera", "barrido")
+
+
+class PlanificadorCobertura:
+    """Estrategia de cobertura para SimpleLimpiezaAgente.
+
+    Mantiene de forma incremental la frontera: celdas libres conocidas
+    (vecinas de alguna celda visitada, sin obstáculo) que aún no se visitaron.
+
+    - "frontera": mientras haya un vecino sin visitar, el agente decide como
+      siempre; cuando todos sus vecinos están visitados, en lugar de caminar
+      al azar sigue el camino más corto (BFS por celdas ya visitadas, que se
+      sabe que están libres) hasta la celda de frontera más cercana.
+    - "barrido": recorre la habitación en boustrofedón (columna por columna,
+      alternando el sentido) desde la esquina más cercana. Pensado para
+      habitaciones sin obstáculos; si un obstáculo corta el barrido, esa
+      celda se salta y ese paso se decide como en "frontera".
+    """
+
+    def __init__(self, modo="frontera"):
+        if modo not in MODOS:
+            raise ValueError(f"Modo de cobertura desconocido: {modo}. Opciones: {', '.join(MODOS)}")
+        self.modo = modo
+        self.frontera = set()
+        self.plan = deque()  # Direcciones hacia 'objetivo'
+        self.objetivo = None
+        self._orden = None   # Celdas del barrido, en orden
+        self._indice = 0
+
+    def estado(self):
+        """Estado serializable a JSON, salvo la frontera (ver checkpoint.py)"""
+        return {"modo": self.modo, "plan": list(self.plan), "objetivo": self.objetivo,
+                # El orden del barrido se rearma desde su primera celda (una esquina)
+                "inicio_barrido": self._orden[0] if self._orden else None,
+                "indice": self._indice}
+
+    def restaurar(self, estado, frontera, ancho, alto):
+        """Vuelve al 'estado' de 'estado()' con el conjunto 'frontera'"""
+        self.modo = estado["modo"]
+        self.frontera = set(frontera)
+        self.plan = deque(estado["plan"])
+        self.objetivo = tuple(estado["objetivo"]) if estado["objetivo"] is not None else None
+        inicio = estado["inicio_barrido"]
+        self._orden = orden_boustrofedon(ancho, alto, inicio) if inicio is not None else None
+        self._indice = estado["indice"]
+
+    def registrar(self, posicion, vecinos_libres, visitados):
+        """Actualiza la frontera al pasar por 'posicion'"""
+        self.frontera.discard(posicion)
+        for vecino in vecinos_libres:
+            if vecino not in visitados:
+                self.frontera.add(vecino)
+
+    def siguiente(self, posicion, movimientos_validos, visitados, entorno):
+        """Dirección a tomar, o None para que el agente decida como antes
+        (hay un vecino sin visitar, o ya no queda frontera alcanzable).
+
+        'movimientos_validos' es {direccion: (x, y)} sin obstáculos ni bordes.
+        """
+        self.registrar(posicion, movimientos_validos.values(), visitados)
+
+        if self.modo == "barrido":
+            direccion = self._barrido(posicion, movimientos_validos, visitados, entorno)
+            if direccion is not None:
+                self.plan.clear()  # El camino guardado partía de otra celda
+                return direccion
+
+        if any(pos not in visitados for pos in movimientos_validos.values()):
+            self.plan.clear()
+            return None
+        return self._hacia_frontera(posicion, visitados)
+
+    def _hacia_frontera(self, posicion, visitados):
+        if not self.plan or self.objetivo in visitados:
+            self.plan = self._camino_a_frontera(posicion, visitados)
+        return self.plan.popleft() if self.plan else None
+
+    def _camino_a_frontera(self, posicion, visitados):
+        """BFS desde 'posicion' por celdas visitadas hasta la frontera más cercana"""
+        if not self.frontera:
+            return deque()
+        previo = {posicion: None}
+        cola = deque([posicion])
+        while cola:
+            actual = cola.popleft()
+            x, y = actual
+            for direccion, dx, dy in _DELTAS:
+                vecino = (x + dx, y + dy)
+                if vecino in previo:
+                    continue
+                if vecino in self.frontera:
+                    # Reconstruir el camino hacia atrás
+                    self.objetivo = vecino
+                    camino = deque([direccion])
+                    while previo[actual] is not None:
+                        actual, paso = previo[actual]
+                        camino.appendleft(paso)
+                    return camino
+                if vecino in visitados:
+                    previo[vecino] = (actual, direccion)
+                    cola.append(vecino)
+        return deque()
+
+    def _barrido(self, posicion, movimientos_validos, visitados, entorno):
+        if self._orden is None:
+            self._orden = orden_boustrofedon(entorno.ancho, entorno.alto, posicion)
+        orden = self._orden
+        while self._indice < len(orden) and orden[self._indice] in visitados:
+            self._indice += 1
+        if self._indice == len(orden):
+            return None
+
+        # Un paso hacia la próxima celda del barrido (primero en la columna)
+        (x, y), (ox, oy) = posicion, orden[self._indice]
+        if oy != y:
+            direccion = "abajo" if oy > y else "arriba"
+        else:
+            direccion = "derecha" if ox > x else "izquierda"
+        if direccion not in movimientos_validos:
+            # Un obstáculo corta el barrido: se salta esa celda (si es
+            # alcanzable, la frontera la recoge al terminar el barrido)
+            self._indice += 1
+            return None
+        return direccion
+
+
+def orden_boustrofedon(ancho, alto, inicio):
+    """Celdas columna por columna, alternando el sentido, desde la esquina más cercana a 'inicio'"""
+    columnas = range(ancho) if inicio[0] < ancho / 2 else range(ancho - 1, -1, -1)
+    hacia_abajo = inicio[1] < alto / 2
+    orden = []
+    for x in columnas:
+        filas = range(alto) if hacia_abajo else range(alto - 1, -1, -1)
+        orden.extend((x, y) for y in filas)
+        hacia_abajo = not hacia_abajo
+    return orden
@@ -1,156 +1,210 @@
 import random
 import math
 
+import eventos
+from generacion_mundo import GeneradorMundo
+from indice_espacial import IndiceEspacial
+from nucleo import AgenteConIntencion, BucleTicks, CapaCeldas, EntornoBase, turnos_aleatorios
+from tick_sincrono import Intencion, ejecutar_tick_sincrono, paso_hacia
+
 # Renombrada la clase de 'Cooperativo' a 'Competitivo'
-class AgenteCompetitivo:
+class AgenteCompetitivo(AgenteConIntencion):
     """Agente que NO se comunica y compite por recursos"""
 
     def __init__(self, id, x, y, entorno):
-        self.id = id
-        self.x = x
-        self.y = y
-        self.entorno = entorno
+        super().__init__(id, x, y, entorno)
         self.comida_recolectada = 0
         self.objetivo = None
 
-    def percibir(self):
+    def percibir(self, vista=None):
         """Percibe comida cercana"""
         ### Aumentado el radio a 5 para más competencia
-        return self.entorno.obtener_comida_cercana(self.x, self.y, radio=5)
+        return (vista or self.entorno).obtener_comida_cercana(self.x, self.y, radio=5)
 
-    ### 'otros_agentes' ya no se necesita como parámetro
-    def decidir_y_actuar(self):
-        """Ciclo de decisión simple: ver y perseguir (sin comunicación)"""
+    ### 'otros_agentes' ya no se necesita: 'decidir_y_actuar' es el de AgenteConIntencion
+    def decidir(self, vista, rng=random):
+        """Fase de decisión: elige objetivo y movimiento sin modificar nada.
 
+        'vista' puede ser el entorno o una VistaEntorno de solo lectura.
+        """
         # Percibir entorno local
-        comida_local = self.percibir()
-        
+        comida_local = self.percibir(vista)
+        objetivo = self.objetivo
+
         # Verificar si el objetivo actual sigue siendo válido
-        if self.objetivo:
+        if objetivo:
             # Si la comida ya no está (otro agente la tomó), borra el objetivo
-            if not self.entorno.hay_comida(self.objetivo[0], self.objetivo[1]):
-                print(f"Agente {self.id}: Mi objetivo {self.objetivo} fue tomado. Buscando uno nuevo.")
-                self.objetivo = None
+            if not vista.hay_comida(objetivo[0], objetivo[1]):
+                eventos.detalle("Agente {}: Mi objetivo {} fue tomado. Buscando uno nuevo.", self.id, objetivo)
+                objetivo = None
 
         # Si no tiene un objetivo válido, buscar uno nuevo
-        if not self.objetivo:
+        if not objetivo:
             
             # La decisión se basa solo en 'comida_local'
             # (Ya no hay 'comida_compartida' ni 'objetivos_reclamados')
             if comida_local:
-                # Elige el objetivo más cercano que puede ver
-                self.objetivo = min(comida_local,
-                                  key=lambda p: math.hypot(p[0] - self.x, p[1] - self.y))
-                print(f"Agente {self.id}: Nuevo objetivo (egoísta) en {self.objetivo}.")
-
-        # Moverse hacia el objetivo
-        if self.objetivo:
-            if (self.x, self.y) == self.objetivo:
-                # Llegó al objetivo
-                if self.entorno.recolectar_comida(self.x, self.y):
-                    self.comida_recolectada += 1
-                    print(f"Agente {self.id}: ¡Recolecté comida en {self.objetivo}!")
-                self.objetivo = None # Limpiar objetivo
-            else:
-                # Movimiento simple paso a paso (eje X, luego eje Y)
-                nx, ny = self.x, self.y
-                dx = 1 if self.objetivo[0] > self.x else (-1 if self.objetivo[0] < self.x else 0)
-                dy = 1 if self.objetivo[1] > self.y else (-1 if self.objetivo[1] < self.y else 0)
-
-                # Moverse primero en X, si no, en Y
-                if dx != 0 and self.entorno.es_valido(self.x + dx, self.y):
-                    self.x += dx
-                elif dy != 0 and self.entorno.es_valido(self.x, self.y + dy):
-                    self.y += dy
+                # Elige el objetivo más cercano que puede ver (empates por posición,
+                # para no depender del orden de iteración del índice)
+                objetivo = min(comida_local,
+                               key=lambda p: (math.hypot(p[0] - self.x, p[1] - self.y), p))
+                eventos.detalle("Agente {}: Nuevo objetivo (egoísta) en {}.", self.id, objetivo)
+
+        # Moverse hacia el objetivo (o al azar)
+        recolectar, destino = paso_hacia(self.x, self.y, objetivo, vista, rng)
+        return Intencion(objetivo, recolectar, destino)
+
+    def aplicar(self, intencion):
+        """Fase de compromiso: recolecta o se mueve según la intención"""
+        self.objetivo = intencion.objetivo
+        if intencion.recolectar:
+            # Llegó al objetivo (si otro lo tomó antes en este tick, no hay nada)
+            if self.entorno.recolectar_comida(self.x, self.y):
+                self.comida_recolectada += 1
+                eventos.detalle("Agente {}: ¡Recolecté comida en {}!", self.id, self.objetivo)
+            self.objetivo = None # Limpiar objetivo
         else:
-            # Movimiento aleatorio si no hay objetivo
-            direccion = random.choice([(0, 1), (0, -1), (1, 0), (-1, 0)])
-            nx, ny = self.x + direccion[0], self.y + direccion[1]
-            if self.entorno.es_valido(nx, ny):
-                self.x, self.y = nx, ny
+            self.x, self.y = intencion.destino
 
 
-class EntornoMultiAgente:
+class EntornoMultiAgente(EntornoBase):
     """Entorno para múltiples agentes"""
-    def __init__(self, ancho, alto):
-        self.ancho = ancho
-        self.alto = alto
+
+    CAPAS = (CapaCeldas("comida", "🍎"),)
+    # Los agentes se muestran con su id (con emojis hasta el 3)
+    ICONOS_ID = {1: "1️⃣", 2: "2️⃣", 3: "3️⃣"}
+
+    def __init__(self, ancho, alto, num_comida=15, tam_cubeta=5, generador=None):
+        super().__init__(ancho, alto)
         self.comida = set()
-        for _ in range(15):
-            x, y = random.randint(0, ancho-1), random.randint(0, alto-1)
-            self.comida.add((x, y))
+        # Sin generador, las posiciones repetidas se pierden: puede haber menos
+        # de 'num_comida'; con generador, exactamente 'num_comida' celdas distintas
+        self.sembrar(self.comida, num_comida, generador=generador)
 
-    def es_valido(self, x, y):
-        return 0 <= x < self.ancho and 0 <= y < self.alto
+        # Índice espacial para no recorrer toda la comida en cada consulta
+        self.indice_comida = IndiceEspacial(ancho, alto, tam_cubeta, self.comida)
 
     def hay_comida(self, x, y):
         return (x, y) in self.comida
 
     def obtener_comida_cercana(self, x, y, radio):
-        return [pos for pos in self.comida
-                if abs(pos[0] - x) + abs(pos[1] - y) <= radio]
+        return self.indice_comida.consultar_radio(x, y, radio)
 
     def recolectar_comida(self, x, y):
         if (x, y) in self.comida:
             self.comida.remove((x, y))
+            self.indice_comida.quitar((x, y))
             return True
         return False
 
-    def mostrar(self, agentes):
-        grid = [["⬜" for _ in range(self.ancho)] for _ in range(self.alto)]
-        for pos in self.comida:
-            grid[pos[1]][pos[0]] = "🍎"
-        
-        for agente in agentes:
-            emoji_id = {1: "1️⃣", 2: "2️⃣", 3: "3️⃣"}.get(agente.id, f"{agente.id}")
-            grid[agente.y][agente.x] = emoji_id
-            
-        for fila in grid:
-            print(" ".join(fila))
-        print()
+    def icono_agente(self, agente):
+        return self.ICONOS_ID.get(agente.id, f"{agente.id}")
+
+
+def ejecutar_paso(agentes, sincrono=False, tick=0, ejecutor=None):
+    """Un tick: todos los agentes deciden y actúan en orden aleatorio.
+
+    Con 'sincrono', todos deciden sobre el mismo estado (en paralelo si hay
+    'ejecutor') y los conflictos se resuelven con prioridad rotativa por tick.
+    """
+    if sincrono:
+        if agentes:
+            ejecutar_tick_sincrono(agentes, agentes[0].entorno, tick, ejecutor)
+        return
+
+    agentes_mezclados = turnos_aleatorios(agentes)
+
+    for agente in agentes_mezclados:
+        agente.decidir_y_actuar()
 
 
 # Simulación multi-agente
-def simular_multi_agente(num_agentes=3, pasos=25):
-    entorno = EntornoMultiAgente(10, 10)
+def simular_multi_agente(num_agentes=3, pasos=25, semilla=None, sincrono=False, ejecutor=None,
+                         disposicion=None, ruta_checkpoint=None, checkpoint_cada=10, reanudar=None,
+                         bifurcar=None, grabador=None, metricas=None, ancho=10, alto=10):
+    """'ruta_checkpoint' guarda el estado cada 'checkpoint_cada' pasos;
+    'reanudar' continúa desde un checkpoint (con los mismos parámetros) y
+    'bifurcar' es una semilla nueva para seguir desde ese estado.
+    'grabador' (GrabadorTrayectorias) registra a cada agente en cada paso.
+    'metricas' (MetricasSimulacion) exporta métricas en vivo, ver metricas.py.
+    'ancho' x 'alto' es el tamaño del grid (comida con la densidad del de 10x10)."""
+    # Semilla opcional para episodios reproducibles
+    if semilla is not None:
+        random.seed(semilla)
+
+    # Disposición opcional: mundo con GeneradorMundo (ver generacion_mundo.py)
+    generador = GeneradorMundo(disposicion) if disposicion is not None else None
+    entorno = EntornoMultiAgente(ancho, alto, ancho * alto * 15 // 100, generador=generador)
     agentes = []
-    for i in range(num_agentes):
-        while True:
-            x, y = random.randint(0, 9), random.randint(0, 9)
-            # Asegurar que no inicien sobre comida
-            if (x,y) not in entorno.comida:
-                # Usamos el AgenteCompetitivo (el del código anterior)
-                agentes.append(AgenteCompetitivo(i+1, x, y, entorno))
-                break
-
-    print("=== SIMULACIÓN: SISTEMA MULTI-AGENTE (COMPETENCIA) ===\n")
-    print("Estado inicial:")
-    entorno.mostrar(agentes)
-
-    for paso in range(pasos):
-        print(f"\n--- Paso {paso + 1} ---") 
-        
-        agentes_mezclados = random.sample(agentes, len(agentes))
-        
-        for agente in agentes_mezclados:
-            agente.decidir_y_actuar()
-
+    if generador is not None:
+        # Celdas de inicio distintas y sin comida, sin reintentos
+        for i, (x, y) in enumerate(generador.celdas(ancho, alto, num_agentes, entorno.comida)):
+            agentes.append(AgenteCompetitivo(i+1, x, y, entorno))
+    else:
+        for i in range(num_agentes):
+            while True:
+                x, y = random.randint(0, ancho - 1), random.randint(0, alto - 1)
+                # Asegurar que no inicien sobre comida
+                if (x,y) not in entorno.comida:
+                    # Usamos el AgenteCompetitivo (el del código anterior)
+                    agentes.append(AgenteCompetitivo(i+1, x, y, entorno))
+                    break
+
+    ### Checkpoints opcionales (ver checkpoint.py; NumPy se importa solo en este modo)
+    checkpoints = None
+    paso_inicial = 0
+    if ruta_checkpoint is not None or reanudar is not None:
+        import checkpoint as checkpoints
+    if reanudar is not None:
+        # Continuar desde el checkpoint: mundo, agentes y estado de 'random'
+        paso_inicial = checkpoints.restaurar_multi_agente(reanudar, entorno, agentes)
+        if bifurcar is not None:
+            random.seed(bifurcar)  # Otra secuencia aleatoria desde el mismo estado
+
+    eventos.info("=== SIMULACIÓN: SISTEMA MULTI-AGENTE (COMPETENCIA) ===\n")
+    eventos.info("Estado inicial:")
+    if eventos.habilitado(eventos.INFO):
+        entorno.mostrar(agentes)
+
+    ### Métricas en vivo opcionales (ver metricas.py)
+    if metricas is not None:
+        metricas.iniciar(lambda: len(entorno.comida),
+                         lambda: {a.id: a.comida_recolectada for a in agentes})
+
+    def actuar(paso):
+        eventos.detalle("\n--- Paso {} ---", paso + 1)
+
+        ### Trayectorias opcionales (ver trayectorias.py)
+        if grabador is not None:
+            grabador.antes_del_paso(agentes)
+        ejecutar_paso(agentes, sincrono, paso, ejecutor)
+        if grabador is not None:
+            grabador.despues_del_paso(paso + 1, agentes)
+
+    def observar(paso):
         # Mostrar el entorno en pasos clave
-        if (paso + 1) % 5 == 0 or len(entorno.comida) == 0:
-            print(f"\nEstado en Paso {paso + 1}:")
+        if ((paso + 1) % 5 == 0 or len(entorno.comida) == 0) and eventos.habilitado(eventos.DETALLE):
+            eventos.detalle("\nEstado en Paso {}:", paso + 1)
             entorno.mostrar(agentes)
             for agente in agentes:
-                print(f"Agente {agente.id}: {agente.comida_recolectada} comida | Objetivo: {agente.objetivo}")
+                eventos.detalle("Agente {}: {} comida | Objetivo: {}", agente.id, agente.comida_recolectada, agente.objetivo)
+
+    guardar = None
+    if ruta_checkpoint is not None:
+        def guardar(paso):
+            if (paso + 1) % checkpoint_cada == 0:
+                checkpoints.guardar_multi_agente(ruta_checkpoint, paso + 1, entorno, agentes)
 
-        if len(entorno.comida) == 0:
-            print("\n¡Toda la comida ha sido recolectada!")
-            break
+    bucle = BucleTicks(pasos, paso_inicial, metricas)
+    bucle.ejecutar(actuar, observar, terminado=lambda: len(entorno.comida) == 0, guardar=guardar)
+    if bucle.completado:
+        eventos.info("\n¡Toda la comida ha sido recolectada!")
 
-    print("\nResultado final:")
+    eventos.info("\nResultado final:")
     total = sum(a.comida_recolectada for a in agentes)
     for agente in agentes:
-        print(f"Agente {agente.id}: {agente.comida_recolectada} comida")
-    print(f"Total recolectado: {total}")
+        eventos.info("Agente {}: {} comida", agente.id, agente.comida_recolectada)
+    eventos.info("Total recolectado: {}", total)
 
     
     # Comprobar que haya agentes para evitar un error si la lista está vacía
@@ -164,9 +218,17 @@ def simular_multi_agente(num_agentes=3, pasos=25):
         empatados = [a.id for a in agentes if a.comida_recolectada == puntaje_max]
         
         if len(empatados) > 1:
-            print(f"\n ¡Hay un empate entre los agentes: {empatados} con {puntaje_max} comidas!")
+            eventos.info("\n ¡Hay un empate entre los agentes: {} con {} comidas!", empatados, puntaje_max)
         else:
-            print(f"\n Ganador: Agente {ganador.id} con {ganador.comida_recolectada} comidas!")
+            eventos.info("\n Ganador: Agente {} con {} comidas!", ganador.id, ganador.comida_recolectada)
+
+    return {
+        "puntos": total,
+        "pasos": bucle.pasos_dados,
+        "pasos_hasta_completar": bucle.pasos_dados if bucle.completado else None,
+        "comida_por_agente": {agente.id: agente.comida_recolectada for agente in agentes},
+        "restante": len(entorno.comida),
+    }
 
 if __name__ == "__main__":
     simular_multi_agente()
\ No newline at end of file
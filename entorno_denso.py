@@ -0,0 +1,91 @@
+import random
+import numpy as np
+
+from nucleo import ICONOS_SUCIEDAD, VALORES, CapaPlano, EntornoBase
+
+
+class EntornoGridDenso(EntornoBase):
+    """Entorno: Grid 2D con suciedad y obstáculos guardados en arreglos densos uint8.
+
+    Misma interfaz que EntornoGrid, pero sin diccionarios de tuplas:
+    un plano con el valor de la suciedad y otro con el tipo de obstáculo.
+    """
+
+    tipos_obstaculos_posibles = ["🧱", "🌳"]
+
+    # Capas de menor a mayor prioridad: suciedad, obstáculos (tipo + 1 en el plano)
+    CAPAS = (CapaPlano("plano_suciedad", ICONOS_SUCIEDAD),
+             CapaPlano("plano_obstaculos", dict(enumerate(tipos_obstaculos_posibles, 1))))
+
+    def __init__(self, ancho, alto, num_suciedad, num_obstaculos=0, generador=None):
+        super().__init__(ancho, alto)
+
+        # Planos indexados [x, y] (como el heatmap de AgenteRecolector)
+        # suciedad: 0 = limpio, 1..3 = valor | obstáculos: 0 = libre, 1.. = tipo + 1
+        self.plano_suciedad = np.zeros((ancho, alto), dtype=np.uint8)
+        self.plano_obstaculos = np.zeros((ancho, alto), dtype=np.uint8)
+
+        # Vistas planas que comparten memoria con los arreglos:
+        # indexarlas con un entero no crea tuplas ni escalares de NumPy
+        self._suciedad = memoryview(self.plano_suciedad.reshape(-1))
+        self._obstaculos = memoryview(self.plano_obstaculos.reshape(-1))
+
+        self.items_suciedad = num_suciedad
+
+        ### Con un GeneradorMundo: máscaras de NumPy, sin listas de celdas
+        ### (así un mundo de millones de celdas se arma en tiempo de NumPy)
+        if generador is not None:
+            rng = generador.rng_numpy()
+            mascara = generador.mascara(ancho, alto, num_suciedad)
+            self.plano_suciedad[mascara] = rng.integers(1, 4, size=num_suciedad, dtype=np.uint8)
+            mascara = generador.mascara(ancho, alto, num_obstaculos, ocupadas=mascara)
+            self.plano_obstaculos[mascara] = rng.integers(
+                1, len(self.tipos_obstaculos_posibles) + 1, size=num_obstaculos, dtype=np.uint8)
+            return
+
+        # Celdas distintas para suciedad y obstáculos, sin reintentos
+        celdas = random.sample(range(ancho * alto), num_suciedad + num_obstaculos)
+        celdas_suciedad = celdas[:num_suciedad]
+        celdas_obstaculos = celdas[num_suciedad:]
+
+        self.plano_suciedad.reshape(-1)[celdas_suciedad] = random.choices(
+            VALORES, k=num_suciedad)
+        self.plano_obstaculos.reshape(-1)[celdas_obstaculos] = random.choices(
+            range(1, len(self.tipos_obstaculos_posibles) + 1), k=num_obstaculos)
+
+    def valor_suciedad(self, x, y):
+        """Retorna el valor de la suciedad en (x, y), o 0 si no hay."""
+        if 0 <= x < self.ancho and 0 <= y < self.alto:
+            return self._suciedad[x * self.alto + y]
+        return 0
+
+    def hay_obstaculo(self, x, y):
+        if 0 <= x < self.ancho and 0 <= y < self.alto:
+            return self._obstaculos[x * self.alto + y] != 0
+        return False
+
+    def limpiar(self, x, y):
+        """Elimina la suciedad en (x, y) y retorna su valor (0 si no había)"""
+        valor = self.valor_suciedad(x, y)
+        if valor:
+            self._suciedad[x * self.alto + y] = 0
+            self.items_suciedad -= 1
+        return valor
+
+    def items_restantes(self):
+        """Cantidad de celdas que todavía tienen suciedad"""
+        return self.items_suciedad
+
+    def suciedad_total(self):
+        """Suma de los valores de toda la suciedad restante"""
+        return int(self.plano_suciedad.sum(dtype=np.int64))
+
+    def celdas_sucias_en_ventana(self, x_min, y_min, x_max, y_max):
+        """Lista de (x, y) con suciedad dentro de la ventana (límites incluidos)"""
+        x_min, y_min = max(0, x_min), max(0, y_min)
+        x_max, y_max = min(self.ancho - 1, x_max), min(self.alto - 1, y_max)
+        if x_min > x_max or y_min > y_max:
+            return []
+        ventana = self.plano_suciedad[x_min:x_max + 1, y_min:y_max + 1]
+        xs, ys = np.nonzero(ventana)
+        return list(zip((xs + x_min).tolist(), (ys + y_min).tolist()))
@@ -0,0 +1,94 @@
+"""Sumidero de eventos para los mensajes de las simulaciones.
+
+Los agentes y los bucles 'simular_*' no llaman a print directamente, sino a
+'eventos.detalle(...)' o 'eventos.info(...)' con el formato diferido:
+
+    eventos.detalle("Paso {}: Moviéndose {}", paso + 1, accion)
+
+El mensaje solo se formatea si el registro activo acepta ese nivel. Cuando un
+nivel está filtrado, la función del módulo se reemplaza por una que no hace
+nada, así que el modo silencioso no formatea ni escribe.
+"""
+from collections import deque
+from contextlib import contextmanager
+
+DETALLE = 10    # Trazas por paso ("Registrando nueva posición...", "Moviéndose ...")
+INFO = 20       # Títulos, estado inicial/final y resultados
+SILENCIO = 100  # Nada pasa el filtro
+
+
+class RegistroEventos:
+    """Filtra eventos por nivel, los imprime y opcionalmente los guarda en un buffer circular"""
+
+    def __init__(self, nivel=DETALLE, salida=print, capacidad_buffer=None):
+        self.nivel = nivel
+        self.salida = salida  # None = no imprimir
+        # Buffer circular con los últimos eventos: [(nivel, mensaje), ...]
+        self.buffer = deque(maxlen=capacidad_buffer) if capacidad_buffer else None
+
+    def habilitado(self, nivel):
+        return nivel >= self.nivel
+
+    def emitir(self, nivel, mensaje, *args):
+        if nivel < self.nivel:
+            return
+        if args:
+            mensaje = mensaje.format(*args)
+        if self.salida is not None:
+            self.salida(mensaje)
+        if self.buffer is not None:
+            self.buffer.append((nivel, mensaje))
+
+
+def silencioso():
+    """Registro para corridas sin consola: no formatea ni guarda nada"""
+    return RegistroEventos(nivel=SILENCIO, salida=None)
+
+
+def _nada(mensaje, *args):
+    pass
+
+
+def _emisor(nivel):
+    if not _registro.habilitado(nivel):
+        return _nada
+    emitir = _registro.emitir
+
+    def emisor(mensaje, *args):
+        emitir(nivel, mensaje, *args)
+    return emisor
+
+
+def configurar(registro):
+    """Activa 'registro' como sumidero global. Retorna el registro anterior."""
+    global _registro, detalle, info
+    anterior = _registro
+    _registro = registro
+    detalle = _emisor(DETALLE)
+    info = _emisor(INFO)
+    return anterior
+
+
+def registro_actual():
+    return _registro
+
+
+def habilitado(nivel):
+    """Permite saltar trabajo costoso (p. ej. 'mostrar') si nadie lo va a ver"""
+    return _registro.habilitado(nivel)
+
+
+@contextmanager
+def usar(registro):
+    """Usa 'registro' dentro del bloque 'with' y luego restaura el anterior"""
+    anterior = configurar(registro)
+    try:
+        yield registro
+    finally:
+        configurar(anterior)
+
+
+# Por defecto se imprime todo, igual que antes
+_registro = RegistroEventos()
+detalle = _emisor(DETALLE)
+info = _emisor(INFO)
@@ -1,211 +1,364 @@
 import random
 
-class AgenteCooperativo:
+import eventos
+from bus_mensajes import BusMensajes, Mensaje
+from generacion_mundo import GeneradorMundo
+from indice_espacial import IndiceEspacial
+from nucleo import AgenteConIntencion, BucleTicks, CapaCeldas, EntornoBase, turnos_aleatorios
+from tick_sincrono import Intencion, ejecutar_tick_sincrono, paso_hacia
+
+class AgenteCooperativo(AgenteConIntencion):
     """Agente que puede comunicarse con otros para evitar objetivos duplicados"""
 
-    def __init__(self, id, x, y, entorno):
-        self.id = id
-        self.x = x
-        self.y = y
-        self.entorno = entorno
+    def __init__(self, id, x, y, entorno, bus=None):
+        super().__init__(id, x, y, entorno)
         self.comida_recolectada = 0
         self.objetivo = None
-        self.mensajes = []  # Mensajes recibidos
+        self.mensajes = []  # Mensajes recibidos (registros Mensaje)
+        # Destinatarios de los mensajes directos, sin bus (ver 'conectar')
+        self.otros_agentes = []
+
+        ### Con bus: la comida se publica una vez y se entrega en lote por tick,
+        ### y los objetivos 'voy_a' van al registro de reclamos del bus
+        self.bus = bus
+        if bus is not None:
+            bus.suscribir(self, ['comida_encontrada'])
+
+        ### Si es True, el objetivo lo fija un AsignadorObjetivos cada tick
+        self.asignacion_central = False
 
     def enviar_mensaje(self, destinatarios, tipo, contenido):
         """Comunica información a otros agentes"""
+        if self.bus is not None:
+            self.bus.publicar(self, tipo, contenido)
+            return
         for agente in destinatarios:
             agente.recibir_mensaje(self.id, tipo, contenido)
 
     def recibir_mensaje(self, remitente, tipo, contenido):
         """Recibe mensajes de otros agentes"""
-        self.mensajes.append({
-            'de': remitente,
-            'tipo': tipo,
-            'contenido': contenido
-        })
+        self.mensajes.append(Mensaje(remitente, tipo, contenido))
+
+    def reclamar_objetivo(self):
+        """Avisa que 'self.objetivo' ya tiene dueño"""
+        if self.bus is not None:
+            self.bus.reclamos.reclamar(self.id, self.objetivo)
+        else:
+            self.enviar_mensaje(self.otros_agentes, 'voy_a', self.objetivo)
+
+    def soltar_objetivo(self):
+        if self.bus is not None:
+            self.bus.reclamos.liberar(self.id, self.objetivo)
+        self.objetivo = None
 
     def procesar_mensajes(self):
-        """Procesa mensajes recibidos, separando comida de objetivos reclamados"""
+        """Procesa mensajes recibidos, separando comida de objetivos reclamados.
+
+        Solo lee: la bandeja se vacía al aplicar la intención del tick.
+        Con bus, los reclamos están además en su registro ('esta_reclamado').
+        """
         comida_reportada = []
-        ### Lista para guardar objetivos que otros agentes ya eligieron
-        objetivos_reclamados = []
+        ### Conjunto para guardar objetivos que otros agentes ya eligieron
+        objetivos_reclamados = set()
         
         for msg in self.mensajes:
-            if msg['tipo'] == 'comida_encontrada':
-                comida_reportada.append(msg['contenido'])
+            ### El bus también entrega al remitente lo que él mismo publicó
+            if msg.de == self.id:
+                continue
+            if msg.tipo == 'comida_encontrada':
+                comida_reportada.append(msg.contenido)
             ### Procesar el nuevo tipo de mensaje
-            elif msg['tipo'] == 'voy_a':
-                objetivos_reclamados.append(msg['contenido'])
-                
-        self.mensajes.clear()
+            elif msg.tipo == 'voy_a':
+                objetivos_reclamados.add(msg.contenido)
         
-        ### Retorna ambas listas
+        ### Retorna la lista de comida y el conjunto de reclamos
         return comida_reportada, objetivos_reclamados
 
-    def percibir(self):
+    def esta_reclamado(self, pos, objetivos_reclamados):
+        """True si otro agente ya eligió 'pos' (por mensaje o en el registro del bus)"""
+        if pos in objetivos_reclamados:
+            return True
+        return self.bus is not None and pos in self.bus.reclamos
+
+    def percibir(self, vista=None):
         """Percibe comida cercana"""
-        return self.entorno.obtener_comida_cercana(self.x, self.y, radio=3)
+        return (vista or self.entorno).obtener_comida_cercana(self.x, self.y, radio=3)
 
-    def decidir_y_actuar(self, otros_agentes):
-        """Ciclo de decisión mejorado con evitación de objetivos"""
+    def decidir(self, vista, rng=random):
+        """Fase de decisión: lee mensajes y reclamos, y elige objetivo y
+        movimiento sin modificar el entorno, el bus ni al agente.
+
+        'vista' puede ser el entorno o una VistaEntorno de solo lectura.
+        """
+        objetivo = self.objetivo
+
+        ### Con asignación centralizada no hay que negociar: solo moverse
+        if self.asignacion_central:
+            recolectar, destino = paso_hacia(self.x, self.y, objetivo, vista, rng)
+            return Intencion(objetivo, recolectar, destino)
         
         # Procesar comunicaciones
         ### Recibe dos listas
         comida_compartida, objetivos_reclamados = self.procesar_mensajes()
 
         # Percibir entorno local
-        comida_local = self.percibir()
+        comida_local = self.percibir(vista)
 
-        # Compartir descubrimientos con otros 
-        if comida_local and otros_agentes:
-            for pos in comida_local:
-                self.enviar_mensaje(otros_agentes, 'comida_encontrada', pos)
+        # Compartir descubrimientos con otros (se envían al aplicar)
+        mensajes = tuple(('comida_encontrada', pos) for pos in comida_local)
 
         # Decidir objetivo
+        soltar = reclamar = None
         
         ### Verificar si el objetivo actual sigue siendo válido
-        if self.objetivo:
+        if objetivo:
             # Si la comida ya no está (otro agente la tomó), borra el objetivo
-            if not self.entorno.hay_comida(self.objetivo[0], self.objetivo[1]):
-                print(f"Agente {self.id}: Mi objetivo {self.objetivo} ya fue tomado. Buscando uno nuevo.")
-                self.objetivo = None
+            if not vista.hay_comida(objetivo[0], objetivo[1]):
+                eventos.detalle("Agente {}: Mi objetivo {} ya fue tomado. Buscando uno nuevo.", self.id, objetivo)
+                soltar, objetivo = objetivo, None
 
         # Si no tiene un objetivo válido, buscar uno nuevo
-        if not self.objetivo:
+        if not objetivo:
             # Combina la comida local y la compartida
             todas_opciones = list(set(comida_local + comida_compartida))
             
             ### Lógica de evitación
             # Filtra la lista, quitando objetivos ya reclamados por otros
+            # (con bus, el reclamo del objetivo soltado es propio y se libera)
+            liberado = soltar if self.bus is not None else None
             opciones_disponibles = [
                 pos for pos in todas_opciones
-                if pos not in objetivos_reclamados
+                if pos == liberado or not self.esta_reclamado(pos, objetivos_reclamados)
             ]
 
             # Elige el objetivo más cercano de la lista disponible
+            # (empates por posición, para no depender del orden de los conjuntos)
             if opciones_disponibles:
-                self.objetivo = min(opciones_disponibles,
-                                    key=lambda p: abs(p[0] - self.x) + abs(p[1] - self.y))
+                objetivo = min(opciones_disponibles,
+                               key=lambda p: (abs(p[0] - self.x) + abs(p[1] - self.y), p))
                 
                 ### Comunica la decisión a otros agentes
-                print(f"Agente {self.id}: Objetivo fijado en {self.objetivo}. Comunicando...")
-                self.enviar_mensaje(otros_agentes, 'voy_a', self.objetivo)
-
-        # Moverse hacia el objetivo
-        if self.objetivo:
-            if (self.x, self.y) == self.objetivo:
-                # Llegó al objetivo
-                if self.entorno.recolectar_comida(self.x, self.y):
-                    self.comida_recolectada += 1
-                    print(f"Agente {self.id}: ¡Recolecté comida en {self.objetivo}!")
-                self.objetivo = None # Limpiar objetivo
-            else:
-                # Movimiento simple paso a paso (eje X, luego eje Y)
-                nx, ny = self.x, self.y
-                dx = 1 if self.objetivo[0] > self.x else (-1 if self.objetivo[0] < self.x else 0)
-                dy = 1 if self.objetivo[1] > self.y else (-1 if self.objetivo[1] < self.y else 0)
-
-                # Moverse primero en X, si no, en Y
-                if dx != 0 and self.entorno.es_valido(self.x + dx, self.y):
-                    self.x += dx
-                elif dy != 0 and self.entorno.es_valido(self.x, self.y + dy):
-                    self.y += dy
+                eventos.detalle("Agente {}: Objetivo fijado en {}. Comunicando...", self.id, objetivo)
+                reclamar = objetivo
+
+        # Moverse hacia el objetivo (o al azar)
+        recolectar, destino = paso_hacia(self.x, self.y, objetivo, vista, rng)
+        return Intencion(objetivo, recolectar, destino, mensajes, soltar, reclamar)
+
+    def aplicar(self, intencion):
+        """Fase de compromiso: envía mensajes, actualiza reclamos y recolecta
+        o se mueve según la intención"""
+        if not self.asignacion_central:
+            self.mensajes.clear()
+            if intencion.mensajes and (self.otros_agentes or self.bus is not None):
+                for tipo, contenido in intencion.mensajes:
+                    self.enviar_mensaje(self.otros_agentes, tipo, contenido)
+
+        if intencion.soltar:
+            self.soltar_objetivo()
+        self.objetivo = intencion.objetivo
+
+        if intencion.reclamar:
+            if self.bus is not None and intencion.reclamar in self.bus.reclamos:
+                ### Tick sincrónico: otro agente lo reclamó antes en esta fase
+                eventos.detalle("Agente {}: {} ya fue reclamado. Buscando uno nuevo.", self.id, self.objetivo)
+                self.objetivo = None
+                return
+            self.reclamar_objetivo()
+
+        if intencion.recolectar:
+            # Llegó al objetivo
+            if self.entorno.recolectar_comida(self.x, self.y):
+                self.comida_recolectada += 1
+                eventos.detalle("Agente {}: ¡Recolecté comida en {}!", self.id, self.objetivo)
+            self.soltar_objetivo() # Limpiar objetivo
         else:
-            # Movimiento aleatorio si no hay objetivo
-            direccion = random.choice([(0, 1), (0, -1), (1, 0), (-1, 0)])
-            nx, ny = self.x + direccion[0], self.y + direccion[1]
-            if self.entorno.es_valido(nx, ny):
-                self.x, self.y = nx, ny
+            self.x, self.y = intencion.destino
 
 
-class EntornoMultiAgente:
+class EntornoMultiAgente(EntornoBase):
     """Entorno para múltiples agentes"""
 
-    def __init__(self, ancho, alto):
-        self.ancho = ancho
-        self.alto = alto
+    CAPAS = (CapaCeldas("comida", "🍎"),)
+    # Los agentes se muestran con su id (con emojis hasta el 3)
+    ICONOS_ID = {1: "1️⃣", 2: "2️⃣", 3: "3️⃣"}
+
+    def __init__(self, ancho, alto, num_comida=15, tam_cubeta=5, generador=None):
+        super().__init__(ancho, alto)
         self.comida = set()
-        for _ in range(15):
-            x, y = random.randint(0, ancho-1), random.randint(0, alto-1)
-            self.comida.add((x, y))
+        # Sin generador, las posiciones repetidas se pierden: puede haber menos
+        # de 'num_comida'; con generador, exactamente 'num_comida' celdas distintas
+        self.sembrar(self.comida, num_comida, generador=generador)
 
-    def es_valido(self, x, y):
-        return 0 <= x < self.ancho and 0 <= y < self.alto
+        # Índice espacial para no recorrer toda la comida en cada consulta
+        self.indice_comida = IndiceEspacial(ancho, alto, tam_cubeta, self.comida)
 
     ### Método para que los agentes verifiquen la comida
     def hay_comida(self, x, y):
         return (x, y) in self.comida
 
     def obtener_comida_cercana(self, x, y, radio):
-        return [pos for pos in self.comida
-                if abs(pos[0] - x) + abs(pos[1] - y) <= radio]
+        return self.indice_comida.consultar_radio(x, y, radio)
 
     def recolectar_comida(self, x, y):
         if (x, y) in self.comida:
             self.comida.remove((x, y))
+            self.indice_comida.quitar((x, y))
             return True
         return False
 
-    def mostrar(self, agentes):
-        grid = [["⬜" for _ in range(self.ancho)] for _ in range(self.alto)]
-        for pos in self.comida:
-            grid[pos[1]][pos[0]] = "🍎"
-        
-        # Mostrar agentes
-        for agente in agentes:
-            # El ID se cambió por emojis
-            emoji_id = {1: "1️⃣", 2: "2️⃣", 3: "3️⃣"}.get(agente.id, f"{agente.id}")
-            grid[agente.y][agente.x] = emoji_id
-            
-        for fila in grid:
-            print(" ".join(fila))
-        print()
+    def icono_agente(self, agente):
+        return self.ICONOS_ID.get(agente.id, f"{agente.id}")
+
+
+def conectar(agentes):
+    """Sin bus, cada agente envía sus mensajes directamente a todos los demás"""
+    for agente in agentes:
+        agente.otros_agentes = [a for a in agentes if a.id != agente.id]
+
+
+def ejecutar_paso(agentes, bus=None, asignador=None, sincrono=False, tick=0, ejecutor=None):
+    """Un tick: todos los agentes deciden y actúan en orden aleatorio.
+
+    Con 'sincrono', todos deciden sobre el mismo estado (en paralelo si hay
+    'ejecutor') y los conflictos se resuelven con prioridad rotativa por tick.
+    Este modo necesita el bus: los reclamos se resuelven en su registro.
+    Sin bus, los agentes tienen que estar conectados (ver 'conectar').
+    """
+    if asignador is not None:
+        # Etapa de asignación: un solo problema resuelto para todos
+        asignador.asignar(agentes)
+
+    if sincrono:
+        if bus is None:
+            raise ValueError("El tick sincrónico necesita un BusMensajes")
+        if agentes:
+            ejecutar_tick_sincrono(agentes, agentes[0].entorno, tick, ejecutor)
+        bus.entregar()
+        return
+
+    # Reordenar agentes aleatoriamente en cada paso
+    # Esto evita que el Agente 1 siempre tenga la "ventaja" de actuar primero
+    agentes_mezclados = turnos_aleatorios(agentes)
+
+    for agente in agentes_mezclados:
+        agente.decidir_y_actuar()
+    if bus is not None:
+        bus.entregar()  # Una sola entrega por tick
 
 
 # Simulación multi-agente
-def simular_multi_agente(num_agentes=3, pasos=25):
-    entorno = EntornoMultiAgente(10, 10)
+def simular_multi_agente(num_agentes=3, pasos=25, semilla=None, usar_bus=None,
+                         radio_comunicacion=None, asignacion=None, sincrono=False, ejecutor=None,
+                         disposicion=None, ruta_checkpoint=None, checkpoint_cada=10, reanudar=None,
+                         bifurcar=None, grabador=None, metricas=None, ancho=10, alto=10):
+    """'usar_bus' entrega los mensajes en lote con un BusMensajes (llegan al
+    tick siguiente); None lo usa solo si el modo lo necesita ('sincrono' o
+    'radio_comunicacion'), si no, los mensajes van directo como siempre.
+    'ruta_checkpoint' guarda el estado cada 'checkpoint_cada' pasos;
+    'reanudar' continúa desde un checkpoint (con los mismos parámetros) y
+    'bifurcar' es una semilla nueva para seguir desde ese estado.
+    'grabador' (GrabadorTrayectorias) registra a cada agente en cada paso.
+    'metricas' (MetricasSimulacion) exporta métricas en vivo, ver metricas.py.
+    'ancho' x 'alto' es el tamaño del grid (comida con la densidad del de 10x10)."""
+    # Semilla opcional para episodios reproducibles
+    if semilla is not None:
+        random.seed(semilla)
+
+    # Disposición opcional: mundo con GeneradorMundo (ver generacion_mundo.py)
+    generador = GeneradorMundo(disposicion) if disposicion is not None else None
+    entorno = EntornoMultiAgente(ancho, alto, ancho * alto * 15 // 100, generador=generador)
+    if usar_bus is None:
+        usar_bus = sincrono or radio_comunicacion is not None
+    bus = BusMensajes(radio_comunicacion, entorno) if usar_bus else None
+    asignador = None
+    if asignacion is not None:
+        ### 'hungaro' o 'subasta' (NumPy se importa solo en este modo)
+        from asignacion import AsignadorObjetivos
+        asignador = AsignadorObjetivos(entorno, asignacion)
     agentes = []
-    for i in range(num_agentes):
-        while True:
-            x, y = random.randint(0, 9), random.randint(0, 9)
-            # Asegurar que no inicien sobre comida
-            if (x,y) not in entorno.comida:
-                agentes.append(AgenteCooperativo(i+1, x, y, entorno))
-                break
-
-    print("=== SIMULACIÓN: SISTEMA MULTI-AGENTE (EVITACIÓN DE OBJETIVOS) ===\n")
-    print("Estado inicial:")
-    entorno.mostrar(agentes)
-
-    for paso in range(pasos):
-        print(f"\n--- Paso {paso + 1} ---") 
-        
-        # Reordenar agentes aleatoriamente en cada paso
-        # Esto evita que el Agente 1 siempre tenga la "ventaja" de actuar primero
-        agentes_mezclados = random.sample(agentes, len(agentes))
-        
-        for agente in agentes_mezclados:
-            otros = [a for a in agentes if a.id != agente.id]
-            agente.decidir_y_actuar(otros)
+    if generador is not None:
+        # Celdas de inicio distintas y sin comida, sin reintentos
+        for i, (x, y) in enumerate(generador.celdas(ancho, alto, num_agentes, entorno.comida)):
+            agentes.append(AgenteCooperativo(i+1, x, y, entorno, bus))
+            agentes[-1].asignacion_central = asignador is not None
+    else:
+        for i in range(num_agentes):
+            while True:
+                x, y = random.randint(0, ancho - 1), random.randint(0, alto - 1)
+                # Asegurar que no inicien sobre comida
+                if (x,y) not in entorno.comida:
+                    agentes.append(AgenteCooperativo(i+1, x, y, entorno, bus))
+                    agentes[-1].asignacion_central = asignador is not None
+                    break
+    if bus is None:
+        conectar(agentes)
+
+    ### Checkpoints opcionales (ver checkpoint.py; NumPy se importa solo en este modo)
+    checkpoints = None
+    paso_inicial = 0
+    if ruta_checkpoint is not None or reanudar is not None:
+        import checkpoint as checkpoints
+    if reanudar is not None:
+        # Continuar desde el checkpoint: mundo, agentes, mensajes, bus y estado de 'random'
+        paso_inicial = checkpoints.restaurar_multi_agente(reanudar, entorno, agentes, bus)
+        if bifurcar is not None:
+            random.seed(bifurcar)  # Otra secuencia aleatoria desde el mismo estado
+
+    eventos.info("=== SIMULACIÓN: SISTEMA MULTI-AGENTE (EVITACIÓN DE OBJETIVOS) ===\n")
+    eventos.info("Estado inicial:")
+    if eventos.habilitado(eventos.INFO):
+        entorno.mostrar(agentes)
 
+    ### Métricas en vivo opcionales (ver metricas.py)
+    if metricas is not None:
+        metricas.iniciar(lambda: len(entorno.comida),
+                         lambda: {a.id: a.comida_recolectada for a in agentes},
+                         mensajes=lambda: sum(len(a.mensajes) for a in agentes),
+                         bus=bus)
+
+    def actuar(paso):
+        eventos.detalle("\n--- Paso {} ---", paso + 1)
+
+        ### Trayectorias opcionales (ver trayectorias.py)
+        if grabador is not None:
+            grabador.antes_del_paso(agentes)
+        ejecutar_paso(agentes, bus, asignador, sincrono, paso, ejecutor)
+        if grabador is not None:
+            grabador.despues_del_paso(paso + 1, agentes)
+
+    def observar(paso):
         # Mostrar el entorno en pasos clave
-        if (paso + 1) % 5 == 0 or len(entorno.comida) == 0:
-            print(f"\nEstado en Paso {paso + 1}:")
+        if ((paso + 1) % 5 == 0 or len(entorno.comida) == 0) and eventos.habilitado(eventos.DETALLE):
+            eventos.detalle("\nEstado en Paso {}:", paso + 1)
             entorno.mostrar(agentes)
             for agente in agentes:
-                print(f"Agente {agente.id}: {agente.comida_recolectada} comida | Objetivo: {agente.objetivo}")
+                eventos.detalle("Agente {}: {} comida | Objetivo: {}", agente.id, agente.comida_recolectada, agente.objetivo)
 
-        if len(entorno.comida) == 0:
-            print("\n¡Toda la comida ha sido recolectada!")
-            break
+    guardar = None
+    if ruta_checkpoint is not None:
+        def guardar(paso):
+            if (paso + 1) % checkpoint_cada == 0:
+                checkpoints.guardar_multi_agente(ruta_checkpoint, paso + 1, entorno, agentes, bus)
 
-    print("\nResultado final:")
+    bucle = BucleTicks(pasos, paso_inicial, metricas)
+    bucle.ejecutar(actuar, observar, terminado=lambda: len(entorno.comida) == 0, guardar=guardar)
+    if bucle.completado:
+        eventos.info("\n¡Toda la comida ha sido recolectada!")
+
+    eventos.info("\nResultado final:")
     total = sum(a.comida_recolectada for a in agentes)
     for agente in agentes:
-        print(f"Agente {agente.id}: {agente.comida_recolectada} comida")
-    print(f"Total recolectado: {total}")
+        eventos.info("Agente {}: {} comida", agente.id, agente.comida_recolectada)
+    eventos.info("Total recolectado: {}", total)
+
+    return {
+        "puntos": total,
+        "pasos": bucle.pasos_dados,
+        "pasos_hasta_completar": bucle.pasos_dados if bucle.completado else None,
+        "comida_por_agente": {agente.id: agente.comida_recolectada for agente in agentes},
+        "restante": len(entorno.comida),
+    }
 
 
 if __name__ == "__main__":
@@ -0,0 +1,130 @@
+import importlib
+import math
+import os
+
+import eventos
+
+# Escenarios disponibles: nombre -> (módulo, función, parámetros por defecto)
+ESCENARIOS = {
+    "memoria": ("agentReact_Memoria", "simular_limpieza", {}),
+    "tipos_suciedad": ("agenReact_TiposSuciedad", "simular_limpieza", {}),
+    "obstaculos": ("agentReact_Obstaculos", "simular_limpieza", {}),
+    "areas_comida": ("agentObjet_AreasComida", "simular_recoleccion", {"graficar": False}),
+    "competencia": ("competirRecursos_multiagente", "simular_multi_agente", {}),
+    "cooperacion": ("evitarObjetivos_multiagente", "simular_multi_agente", {}),
+}
+
+Z_95 = 1.96  # Intervalo de confianza del 95% (aproximación normal)
+
+
+def cargar_escenario(nombre):
+    """Importa el módulo del escenario y retorna (función, parámetros por defecto)"""
+    if nombre not in ESCENARIOS:
+        raise ValueError(f"Escenario desconocido: {nombre}. Opciones: {', '.join(ESCENARIOS)}")
+    modulo, funcion, por_defecto = ESCENARIOS[nombre]
+    return getattr(importlib.import_module(modulo), funcion), por_defecto
+
+
+def ejecutar_episodio(escenario, semilla, parametros=None):
+    """Corre un episodio sin salida por consola y retorna su resultado"""
+    simular, por_defecto = cargar_escenario(escenario)
+    argumentos = dict(por_defecto, **(parametros or {}))
+    with eventos.usar(eventos.silencioso()):
+        resultado = simular(semilla=semilla, **argumentos)
+    resultado["semilla"] = semilla
+    return resultado
+
+
+def _ejecutar_lote(escenario, semillas, parametros):
+    # Un lote por tarea: reparte el costo de enviar trabajo entre procesos
+    return [ejecutar_episodio(escenario, semilla, parametros) for semilla in semillas]
+
+
+def ejecutar_experimento(escenario, episodios=1000, semilla_base=0, procesos=None,
+                         parametros=None):
+    """Corre 'episodios' episodios con semillas consecutivas en un pool de procesos.
+
+    Retorna la lista de resultados ordenada por semilla.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    semillas = list(range(semilla_base, semilla_base + episodios))
+    if procesos == 1:
+        return _ejecutar_lote(escenario, semillas, parametros)
+
+    from concurrent.futures import ProcessPoolExecutor  # Solo con varios procesos
+
+    # Unos 4 lotes por proceso para equilibrar la carga sin mucho overhead
+    tam_lote = max(1, math.ceil(episodios / (procesos * 4)))
+    lotes = [semillas[i:i + tam_lote] for i in range(0, episodios, tam_lote)]
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        futuros = [pool.submit(_ejecutar_lote, escenario, lote, parametros) for lote in lotes]
+        return [r for futuro in futuros for r in futuro.result()]
+
+
+def _metricas(resultado):
+    """Aplana un resultado en pares (métrica, valor numérico)"""
+    for clave, valor in resultado.items():
+        if clave == "semilla":
+            continue
+        if isinstance(valor, dict):
+            for subclave, subvalor in valor.items():
+                yield f"{clave}[{subclave}]", subvalor
+        elif isinstance(valor, bool):
+            yield clave, int(valor)
+        elif valor is not None:
+            yield clave, valor
+
+
+def resumir(resultados):
+    """Estadísticas por métrica: n, media, desviación estándar e IC 95%.
+
+    'pasos_hasta_completar' solo cuenta los episodios completados;
+    'tasa_completado' es la fracción de episodios que terminaron el trabajo.
+    """
+    valores = {}
+    for resultado in resultados:
+        for clave, valor in _metricas(resultado):
+            valores.setdefault(clave, []).append(valor)
+    if resultados:
+        valores["tasa_completado"] = [
+            int(r.get("pasos_hasta_completar") is not None) for r in resultados]
+
+    resumen = {}
+    for clave, datos in valores.items():
+        n = len(datos)
+        media = sum(datos) / n
+        desv = math.sqrt(sum((d - media) ** 2 for d in datos) / (n - 1)) if n > 1 else 0.0
+        margen = Z_95 * desv / math.sqrt(n)
+        resumen[clave] = {
+            "n": n,
+            "media": media,
+            "desv": desv,
+            "ic95": (media - margen, media + margen),
+        }
+    return resumen
+
+
+def mostrar_resumen(escenario, resumen):
+    print(f"=== EXPERIMENTO: {escenario} ===\n")
+    print(f"{'métrica':<26} {'n':>6} {'media':>10} {'desv':>10} {'IC 95%':>22}")
+    for clave, est in resumen.items():
+        bajo, alto = est["ic95"]
+        print(f"{clave:<26} {est['n']:>6} {est['media']:>10.3f} {est['desv']:>10.3f} "
+              f"[{bajo:>9.3f}, {alto:>9.3f}]")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Monte Carlo de episodios con semilla")
+    parser.add_argument("escenario", choices=sorted(ESCENARIOS))
+    parser.add_argument("-n", "--episodios", type=int, default=1000)
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla del primer episodio")
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--pasos", type=int, default=None)
+    args = parser.parse_args()
+
+    parametros = {"pasos": args.pasos} if args.pasos is not None else None
+    resultados = ejecutar_experimento(args.escenario, args.episodios, args.semilla,
+                                      args.procesos, parametros)
+    mostrar_resumen(args.escenario, resumir(resultados))
@@ -0,0 +1,164 @@
+import random
+
+DISPOSICIONES = ("uniforme", "grupos", "franjas")
+
+# Hasta este número de celdas, la disposición uniforme se muestrea con el
+# módulo random (sin NumPy); por encima, con una máscara de NumPy
+UMBRAL_NUMPY = 1 << 16
+
+
+class GeneradorMundo:
+    """Ubica ítems en celdas distintas de un grid, sin bucles de reintento.
+
+    Las celdas se muestrean sin reemplazo de una vez (índices planos
+    x * alto + y, como los planos de EntornoGridDenso), así que el costo no
+    depende de la densidad y siempre se obtiene la cantidad pedida; si no
+    caben, ValueError.
+
+    Disposiciones:
+    - "uniforme": todas las celdas libres con la misma probabilidad.
+    - "grupos": comida o suciedad alrededor de 'num_grupos' centros al azar
+      (núcleo gaussiano de desvío 'dispersion'); lejos de los centros la
+      probabilidad es baja pero no nula, así que se puede llenar el grid.
+    - "franjas": en columnas con x % 'periodo' < 'grosor' (surcos,
+      estanterías); lo que no cabe en las franjas cae en el resto del grid.
+
+    Sin 'semilla' usa el módulo random, de modo que 'random.seed' en los
+    simular_* sigue haciendo reproducible el mundo; con 'semilla' usa su
+    propio random.Random. El RNG de NumPy se deriva del de Python en cada
+    llamada.
+    """
+
+    def __init__(self, disposicion="uniforme", semilla=None, num_grupos=3, dispersion=2.0,
+                 periodo=3, grosor=1):
+        if disposicion not in DISPOSICIONES:
+            raise ValueError(f"Disposición desconocida: {disposicion}. "
+                             f"Opciones: {', '.join(DISPOSICIONES)}")
+        self.disposicion = disposicion
+        self.rng = random.Random(semilla) if semilla is not None else random
+        self.num_grupos = num_grupos
+        self.dispersion = dispersion
+        self.periodo = periodo
+        self.grosor = grosor
+
+    def celdas(self, ancho, alto, cantidad, ocupadas=()):
+        """Lista de 'cantidad' tuplas (x, y) distintas, en orden aleatorio,
+        fuera de 'ocupadas' (iterable de (x, y) o máscara booleana [x, y])"""
+        if self.disposicion == "uniforme" and ancho * alto <= UMBRAL_NUMPY \
+                and not hasattr(ocupadas, "shape"):
+            return self._celdas_uniformes(ancho, alto, cantidad, ocupadas)
+
+        import numpy as np  # Mundos grandes o disposiciones con pesos
+
+        indices = np.flatnonzero(self.mascara(ancho, alto, cantidad, ocupadas))
+        self.rng_numpy().shuffle(indices)
+        xs, ys = np.divmod(indices, alto)
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def _celdas_uniformes(self, ancho, alto, cantidad, ocupadas):
+        ocupadas = {(x, y) for x, y in ocupadas if 0 <= x < ancho and 0 <= y < alto}
+        _validar(cantidad, ancho * alto - len(ocupadas), self.disposicion)
+        # Entre 'cantidad + ocupadas' celdas distintas hay al menos 'cantidad' libres
+        muestra = self.rng.sample(range(ancho * alto), cantidad + len(ocupadas))
+        celdas = (divmod(indice, alto) for indice in muestra)
+        return [celda for celda in celdas if celda not in ocupadas][:cantidad]
+
+    def mascara(self, ancho, alto, cantidad, ocupadas=()):
+        """Máscara booleana [x, y] con exactamente 'cantidad' celdas en True"""
+        import numpy as np
+
+        rng = self.rng_numpy()
+        n = ancho * alto
+        libres = _mascara_libres(ancho, alto, ocupadas)
+        pesos = self._pesos(ancho, alto)
+
+        if pesos is None:
+            total = n if libres is None else int(np.count_nonzero(libres))
+            _validar(cantidad, total, self.disposicion)
+            resultado = _mascara_uniforme(rng, libres, n, total, cantidad)
+        else:
+            if libres is not None:
+                pesos[~libres] = 0
+            _validar(cantidad, int(np.count_nonzero(pesos)), self.disposicion)
+            resultado = np.zeros(n, dtype=bool)
+            if cantidad:
+                # Muestreo ponderado sin reemplazo (Efraimidis-Spirakis):
+                # las 'cantidad' claves Exp(1) / peso más chicas (peso 0 da inf o nan:
+                # argpartition las deja al final)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    claves = rng.standard_exponential(n, dtype=np.float32) / pesos
+                resultado[np.argpartition(claves, cantidad - 1)[:cantidad]] = True
+        return resultado.reshape(ancho, alto)
+
+    def _pesos(self, ancho, alto):
+        """Pesos planos por celda (None = uniforme)"""
+        import numpy as np
+
+        if self.disposicion == "franjas":
+            columnas = (np.arange(ancho) % self.periodo) < self.grosor
+            # Mismo piso que en "grupos": las franjas se llenan primero
+            return np.repeat(np.where(columnas, 1.0, 1e-6).astype(np.float32), alto)
+        if self.disposicion == "grupos":
+            # Núcleos separables: exp(-dx²/2σ²) * exp(-dy²/2σ²) por centro
+            xs = np.arange(ancho)
+            ys = np.arange(alto)
+            pesos = np.zeros((ancho, alto), dtype=np.float32)
+            for _ in range(self.num_grupos):
+                cx, cy = self.rng.randrange(ancho), self.rng.randrange(alto)
+                fx = np.exp(-((xs - cx) ** 2) / (2 * self.dispersion ** 2))
+                fy = np.exp(-((ys - cy) ** 2) / (2 * self.dispersion ** 2))
+                pesos += np.outer(fx, fy)
+            # Piso pequeño: ninguna celda queda imposible
+            pesos += 1e-6 * max(1.0, pesos.max())
+            return pesos.reshape(-1)
+        return None
+
+    def rng_numpy(self):
+        """Generador de NumPy derivado del RNG de Python (reproducible con la semilla)"""
+        import numpy as np
+
+        return np.random.default_rng(self.rng.getrandbits(64))
+
+
+def _mascara_libres(ancho, alto, ocupadas):
+    """Máscara plana de celdas libres, o None si no hay ocupadas"""
+    import numpy as np
+
+    if hasattr(ocupadas, "shape"):
+        return ~np.asarray(ocupadas, dtype=bool).reshape(-1)
+    ocupadas = [(x, y) for x, y in ocupadas if 0 <= x < ancho and 0 <= y < alto]
+    if not ocupadas:
+        return None
+    libres = np.ones(ancho * alto, dtype=bool)
+    xs, ys = np.array(ocupadas).T
+    libres[xs * alto + ys] = False
+    return libres
+
+
+def _mascara_uniforme(rng, libres, n, total, cantidad):
+    """Máscara plana con 'cantidad' de las 'total' celdas libres, todas con la
+    misma probabilidad: Bernoulli con p = cantidad / total y después se corrige
+    la diferencia (del orden de raíz de n celdas) al azar entre las sobrantes
+    o las faltantes. Como el proceso trata igual a todas las celdas, el
+    conjunto resultante es uniforme, y cuesta O(n) sin permutar nada."""
+    import numpy as np
+
+    if total == 0:
+        return np.zeros(n, dtype=bool)
+    mascara = rng.random(n, dtype=np.float32) < cantidad / total
+    if libres is not None:
+        mascara &= libres
+    diferencia = int(np.count_nonzero(mascara)) - cantidad
+    if diferencia > 0:
+        sobrantes = np.flatnonzero(mascara)
+        mascara[rng.choice(sobrantes, diferencia, replace=False)] = False
+    elif diferencia < 0:
+        faltantes = ~mascara if libres is None else libres & ~mascara
+        mascara[rng.choice(np.flatnonzero(faltantes), -diferencia, replace=False)] = True
+    return mascara
+
+
+def _validar(cantidad, disponibles, disposicion):
+    if cantidad > disponibles:
+        raise ValueError(f"No caben {cantidad} ítems: solo hay {disponibles} celdas "
+                         f"libres (disposición '{disposicion}')")
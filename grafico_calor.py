@@ -0,0 +1,181 @@
+"""Gráficos del mapa de calor de AgenteRecolector.
+
+Tres destinos con la misma interfaz, 'cuadro(paso, mapa)' y 'cerrar(mapa)':
+
+- GraficoEnVivo: ventana interactiva en el mismo proceso, con una pausa por
+  cuadro (el comportamiento original de simular_recoleccion).
+- GraficoEnSegundoPlano: los cuadros van por una cola a otro proceso que
+  dibuja la ventana. La simulación nunca espera: si la cola está llena,
+  el cuadro se descarta.
+- GrabadorCuadros: guarda copias de los cuadros y al cerrar los dibuja sin
+  ventana (backend Agg) como secuencia PNG o GIF animado.
+
+matplotlib se importa recién al crear un destino.
+"""
+import multiprocessing as mp
+import os
+import queue
+
+TITULO_INICIAL = "Mapa de Calor del Agente (Aprendizaje)"
+TITULO_FINAL = "Mapa de Calor Final"
+ESCALA = {"cmap": "viridis", "vmin": 0, "vmax": 5}
+
+
+def _titulo(paso):
+    return f"Mapa de Calor (Paso {paso})"
+
+
+class GraficoEnVivo:
+    """Ventana interactiva en el proceso de la simulación (bloquea 'pausa' segundos por cuadro)"""
+
+    def __init__(self, mapa, pausa=2.0):
+        import matplotlib.pyplot as plt
+        self.plt = plt
+        self.pausa = pausa
+        plt.ion()  # Activar modo interactivo
+        self.fig, self.ax = plt.subplots()
+        # Usamos .T (transpuesto) para que (x,y) de numpy coincida con (x,y) visual
+        self.im = self.ax.imshow(mapa.T, **ESCALA)
+        self.fig.colorbar(self.im, ax=self.ax)
+        self.ax.set_title(TITULO_INICIAL)
+
+    def cuadro(self, paso, mapa):
+        self.ax.set_title(_titulo(paso))
+        self.im.set_data(mapa.T)  # Actualizar datos del heatmap
+        self.fig.canvas.draw()
+        self.fig.canvas.flush_events()
+        self.plt.pause(self.pausa)
+
+    def cerrar(self, mapa):
+        """Muestra el gráfico final estático hasta que el usuario cierre la ventana"""
+        plt = self.plt
+        plt.ioff()
+        plt.figure()
+        plt.title(TITULO_FINAL)
+        plt.imshow(mapa.T, **ESCALA)
+        plt.colorbar()
+        plt.show()
+
+
+def _dibujar_en_segundo_plano(cola, mapa, intervalo):
+    """Proceso dibujante: toma cuadros de la cola hasta recibir ('fin', mapa)"""
+    import matplotlib.pyplot as plt
+    plt.ion()
+    fig, ax = plt.subplots()
+    im = ax.imshow(mapa.T, **ESCALA)
+    fig.colorbar(im, ax=ax)
+    ax.set_title(TITULO_INICIAL)
+    while True:
+        try:
+            paso, mapa = cola.get(timeout=intervalo)
+        except queue.Empty:
+            plt.pause(intervalo)  # Mantener la ventana viva
+            continue
+        if paso == "fin":
+            ax.set_title(TITULO_FINAL)
+            im.set_data(mapa.T)
+            plt.ioff()
+            plt.show()
+            return
+        ax.set_title(_titulo(paso))
+        im.set_data(mapa.T)
+        plt.pause(intervalo)
+
+
+class GraficoEnSegundoPlano:
+    """Ventana dibujada por otro proceso; 'cuadro' nunca bloquea"""
+
+    def __init__(self, mapa, intervalo=0.05, capacidad=2):
+        self.cola = mp.Queue(maxsize=capacidad)
+        self.proceso = mp.Process(target=_dibujar_en_segundo_plano,
+                                  args=(self.cola, mapa.copy(), intervalo))
+        self.proceso.start()
+        self.enviados = 0
+        self.descartados = 0
+
+    def cuadro(self, paso, mapa):
+        try:
+            # Copia: la cola serializa el arreglo más tarde, en otro hilo
+            self.cola.put_nowait((paso, mapa.copy()))
+            self.enviados += 1
+        except queue.Full:
+            self.descartados += 1
+
+    def cerrar(self, mapa):
+        """Envía el mapa final; la ventana queda abierta hasta que el usuario la cierre"""
+        self.cola.put(("fin", mapa.copy()))
+
+
+class GrabadorCuadros:
+    """Guarda los cuadros y al cerrar los escribe sin ventana.
+
+    formato="png": 'ruta' es una carpeta con calor_0005.png, calor_0010.png, ...
+    formato="gif": 'ruta' es el archivo del GIF animado.
+    """
+
+    def __init__(self, mapa, ruta, formato="gif", duracion=0.5):
+        if formato not in ("png", "gif"):
+            raise ValueError(f"Formato de cuadros desconocido: {formato}. Opciones: png, gif")
+        self.ruta = ruta
+        self.formato = formato
+        self.duracion = duracion  # Segundos por cuadro del GIF
+        self.cuadros = [(TITULO_INICIAL, 0, mapa.copy())]
+
+    def cuadro(self, paso, mapa):
+        self.cuadros.append((_titulo(paso), paso, mapa.copy()))
+
+    def cerrar(self, mapa):
+        """Dibuja todos los cuadros con Agg. Retorna las rutas escritas."""
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.cuadros.append((TITULO_FINAL, None, mapa.copy()))
+        # Figura sin pyplot: no toca el backend global ni abre ventanas
+        fig = Figure()
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        im = ax.imshow(self.cuadros[0][2].T, **ESCALA)
+        fig.colorbar(im, ax=ax)
+
+        if self.formato == "png":
+            os.makedirs(self.ruta, exist_ok=True)
+        escritas = []
+        imagenes = []
+        for titulo, paso, datos in self.cuadros:
+            ax.set_title(titulo)
+            im.set_data(datos.T)
+            if self.formato == "png":
+                nombre = "calor_final.png" if paso is None else f"calor_{paso:04d}.png"
+                escritas.append(os.path.join(self.ruta, nombre))
+                fig.savefig(escritas[-1])
+            else:
+                canvas.draw()
+                imagenes.append(_a_imagen(canvas))
+
+        if imagenes:
+            imagenes[0].save(self.ruta, save_all=True, append_images=imagenes[1:],
+                             duration=int(self.duracion * 1000), loop=0)
+            escritas.append(self.ruta)
+        return escritas
+
+
+def _a_imagen(canvas):
+    from PIL import Image  # Dependencia de matplotlib
+    # convert() copia: el buffer del canvas se reutiliza en el próximo cuadro
+    return Image.frombuffer("RGBA", canvas.get_width_height(), canvas.buffer_rgba(),
+                            "raw", "RGBA", 0, 1).convert("RGB")
+
+
+MODOS = ("vivo", "fondo", "png", "gif")
+
+
+def crear_grafico(modo, mapa, ruta=None):
+    """Destino para 'modo' en MODOS; 'ruta' solo para png/gif"""
+    if modo == "vivo":
+        return GraficoEnVivo(mapa)
+    if modo == "fondo":
+        return GraficoEnSegundoPlano(mapa)
+    if modo in ("png", "gif"):
+        return GrabadorCuadros(mapa, ruta or ("mapa_calor.gif" if modo == "gif" else "mapa_calor"),
+                               modo)
+    raise ValueError(f"Modo de gráfico desconocido: {modo}. Opciones: {', '.join(MODOS)}")
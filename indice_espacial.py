@@ -0,0 +1,81 @@
+class IndiceEspacial:
+    """Índice de cubetas uniformes sobre posiciones (x, y) de un grid.
+
+    Divide el grid en cubetas cuadradas de 'tam_cubeta' celdas de lado.
+    Las consultas por radio Manhattan solo recorren las cubetas que
+    pueden contener posiciones dentro del radio.
+    """
+
+    def __init__(self, ancho, alto, tam_cubeta=5, posiciones=()):
+        self.ancho = ancho
+        self.alto = alto
+        self.tam_cubeta = max(1, tam_cubeta)
+        self.columnas = (ancho + self.tam_cubeta - 1) // self.tam_cubeta
+        self.filas = (alto + self.tam_cubeta - 1) // self.tam_cubeta
+        # Solo se crean las cubetas ocupadas: { indice_cubeta: set de posiciones }
+        self.cubetas = {}
+        self.total = 0
+
+        for pos in posiciones:
+            self.agregar(pos)
+
+    def _cubeta(self, x, y):
+        return (y // self.tam_cubeta) * self.columnas + (x // self.tam_cubeta)
+
+    def agregar(self, pos):
+        """Agrega una posición al índice (ignora duplicados)"""
+        clave = self._cubeta(pos[0], pos[1])
+        cubeta = self.cubetas.get(clave)
+        if cubeta is None:
+            cubeta = self.cubetas[clave] = set()
+        if pos not in cubeta:
+            cubeta.add(pos)
+            self.total += 1
+
+    def quitar(self, pos):
+        """Quita una posición del índice. Retorna True si estaba."""
+        clave = self._cubeta(pos[0], pos[1])
+        cubeta = self.cubetas.get(clave)
+        if cubeta is None or pos not in cubeta:
+            return False
+        cubeta.remove(pos)
+        if not cubeta:
+            del self.cubetas[clave]  # No acumular cubetas vacías
+        self.total -= 1
+        return True
+
+    def __contains__(self, pos):
+        cubeta = self.cubetas.get(self._cubeta(pos[0], pos[1]))
+        return cubeta is not None and pos in cubeta
+
+    def __len__(self):
+        return self.total
+
+    def consultar_radio(self, x, y, radio):
+        """Retorna las posiciones a distancia Manhattan <= radio de (x, y)"""
+        t = self.tam_cubeta
+        bx_min = max(0, (x - radio) // t)
+        bx_max = min(self.columnas - 1, (x + radio) // t)
+        by_min = max(0, (y - radio) // t)
+        by_max = min(self.filas - 1, (y + radio) // t)
+
+        resultado = []
+        for by in range(by_min, by_max + 1):
+            # Distancia vertical mínima entre (x, y) y la fila de cubetas
+            y0 = by * t
+            dy = y0 - y if y < y0 else (y - (y0 + t - 1) if y > y0 + t - 1 else 0)
+            if dy > radio:
+                continue
+            base = by * self.columnas
+            for bx in range(bx_min, bx_max + 1):
+                cubeta = self.cubetas.get(base + bx)
+                if not cubeta:
+                    continue
+                x0 = bx * t
+                dx = x0 - x if x < x0 else (x - (x0 + t - 1) if x > x0 + t - 1 else 0)
+                if dx + dy > radio:
+                    continue  # Ninguna celda de la cubeta está dentro del radio
+                for pos in cubeta:
+                    if abs(pos[0] - x) + abs(pos[1] - y) <= radio:
+                        resultado.append(pos)
+        return resultado
@@ -0,0 +1,270 @@
+import heapq
+from array import array
+
+# Hasta este número de celdas, el mapa float64 se guarda en un array.array
+# (sin NumPy, que se importa recién si se piden los valores como arreglo);
+# por encima, en un arreglo de NumPy, cuyas páginas en cero no ocupan memoria
+UMBRAL_NUMPY = 1 << 16
+
+
+class MapaCalor:
+    """Mapa de calor con consulta de la celda más caliente sin recorrer el mapa.
+
+    Los valores viven en un arreglo denso plano (índice x * alto + y) y,
+    además, en un max-heap perezoso de (-valor, índice): cada incremento
+    agrega una entrada nueva y las entradas viejas se descartan al llegar a
+    la cima (su valor ya no coincide con el guardado). Incrementar y
+    reiniciar cuestan O(log n) amortizado; 'maximo' es O(1) amortizado.
+    Cuando sobran entradas viejas, el heap se compacta desde sus propias
+    entradas, sin recorrer el mapa.
+
+    'valores' expone el mapa como arreglo de NumPy [x, y] que comparte la
+    memoria (en mapas chicos se arma al pedirlo: gráfico, checkpoint,
+    impresión final). Con un 'dtype' de NumPy se guarda siempre en NumPy.
+
+    Los empates se resuelven por el menor índice plano (x * alto + y), igual
+    que np.argmax. Los valores solo deben cambiar a través de estos métodos.
+    """
+
+    def __init__(self, ancho, alto, dtype=None):
+        self.ancho = ancho
+        self.alto = alto
+        if dtype is None and ancho * alto <= UMBRAL_NUMPY:
+            self._plano = array("d", [0.0]) * (ancho * alto)
+            self._valores = None  # Vista de NumPy de '_plano', al pedir 'valores'
+        else:
+            import numpy as np
+
+            self._valores = np.zeros((ancho, alto), dtype=np.float64 if dtype is None else dtype)
+            self._plano = self._valores.reshape(-1)  # Vista plana del mismo arreglo
+        self._heap = []
+        self._positivas = 0  # Celdas con valor > 0
+
+    @property
+    def valores(self):
+        """Arreglo de NumPy [x, y] con los valores (la misma memoria del mapa)"""
+        if self._valores is None:
+            import numpy as np
+
+            self._valores = np.frombuffer(self._plano, dtype=np.float64).reshape(
+                self.ancho, self.alto)
+        return self._valores
+
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        if isinstance(estado.get("_plano"), array):
+            estado["_valores"] = None  # Copiada, la vista quedaría desligada de '_plano'
+        return estado
+
+    ### Almacenamiento (MapaCalorDisperso lo reemplaza)
+    def _leer(self, indice):
+        return float(self._plano[indice])
+
+    def _escribir(self, indice, valor):
+        self._plano[indice] = valor
+
+    def _entradas_positivas(self):
+        """Entradas del heap (-valor, índice plano) de las celdas con valor > 0"""
+        plano = self._plano
+        if isinstance(plano, array):
+            return [(-valor, indice) for indice, valor in enumerate(plano) if valor > 0]
+        import numpy as np
+
+        indices = np.flatnonzero(plano > 0)
+        return list(zip((-plano[indices].astype(np.float64)).tolist(), indices.tolist()))
+
+    def a_denso(self):
+        """Arreglo [x, y] con todos los valores (aquí, 'valores' mismo)"""
+        return self.valores
+
+    def ventana(self, x0, y0, ancho, alto):
+        """Arreglo [x, y] con los valores de 'ancho' x 'alto' celdas desde (x0, y0)"""
+        return self.valores[x0:x0 + ancho, y0:y0 + alto]
+
+    def memoria_bytes(self):
+        return len(self._plano) * self._plano.itemsize
+
+    def valor(self, x, y):
+        return self._leer(x * self.alto + y)
+
+    def incrementar(self, x, y, delta=1):
+        """Suma 'delta' (> 0) a la celda"""
+        indice = x * self.alto + y
+        anterior = self._leer(indice)
+        self._escribir(indice, anterior + delta)
+        # Releer: el dtype puede redondear o saturar
+        nuevo = self._leer(indice)
+        if nuevo <= 0:
+            return  # Redondeado a 0 (dtype entero): la celda sigue vacía
+        if anterior <= 0:
+            self._positivas += 1
+        heapq.heappush(self._heap, (-nuevo, indice))
+        # Demasiadas entradas viejas: quitarlas del heap
+        if len(self._heap) > 4 * self._positivas + 64:
+            self._compactar()
+
+    def reiniciar(self, x, y):
+        """Pone la celda en 0 (su entrada en el heap queda vieja)"""
+        indice = x * self.alto + y
+        if self._leer(indice) > 0:
+            self._positivas -= 1
+            self._escribir(indice, 0)
+
+    def _compactar(self):
+        """Deja en el heap una entrada vigente por celda: O(tamaño del heap).
+
+        Cada celda con valor > 0 tiene su entrada vigente (la del último
+        incremento), así que no hace falta recorrer el mapa.
+        """
+        leer = self._leer
+        vigentes = {}
+        for negativo, indice in self._heap:
+            if indice not in vigentes and leer(indice) == -negativo:
+                vigentes[indice] = negativo
+        self._heap = [(negativo, indice) for indice, negativo in vigentes.items()]
+        heapq.heapify(self._heap)
+
+    def _reconstruir(self):
+        """Rehace el heap recorriendo todo el mapa (solo al cargar valores de afuera)"""
+        self._heap = self._entradas_positivas()
+        heapq.heapify(self._heap)
+
+    def cargar(self, valores):
+        """Reemplaza todos los valores por el arreglo [x, y] 'valores', sin
+        copiarlo (p. ej. un memmap de checkpoint.py), y rehace el heap"""
+        self._valores = valores
+        self._plano = valores.reshape(-1)
+        self._reconstruir()
+        self._positivas = len(self._heap)
+
+    def maximo(self):
+        """(valor, (x, y)) de la celda más caliente, o (0.0, None) si todo es 0"""
+        heap = self._heap
+        leer = self._leer
+        while heap:
+            negativo, indice = heap[0]
+            if leer(indice) == -negativo:
+                return -negativo, divmod(indice, self.alto)
+            heapq.heappop(heap)
+        return 0.0, None
+
+    def top_k(self, k):
+        """Las 'k' celdas más calientes (valor > 0): [(valor, (x, y)), ...]"""
+        resultado = []
+        vistos = set()
+        # Se sacan entradas del heap y se devuelven al final
+        sacadas = []
+        heap = self._heap
+        leer = self._leer
+        while heap and len(resultado) < k:
+            entrada = heapq.heappop(heap)
+            negativo, indice = entrada
+            if leer(indice) != -negativo or indice in vistos:
+                continue  # Vieja o repetida: se descarta
+            vistos.add(indice)
+            sacadas.append(entrada)
+            resultado.append((-negativo, divmod(indice, self.alto)))
+        for entrada in sacadas:
+            heapq.heappush(heap, entrada)
+        return resultado
+
+
+class MapaCalorDisperso(MapaCalor):
+    """MapaCalor guardado en bloques de 'tam_bloque' x 'tam_bloque' celdas
+    que se crean al primer incremento. La memoria crece con la zona explorada
+    y no con el tamaño del mapa.
+
+    Por defecto los bloques son float32: los conteos enteros son exactos
+    hasta 2**24.
+    """
+
+    def __init__(self, ancho, alto, dtype="float32", tam_bloque=64):
+        import numpy as np
+
+        self.ancho = ancho
+        self.alto = alto
+        self.dtype = np.dtype(dtype)
+        # Con dtype entero se satura en lugar de desbordar
+        self._tope = np.iinfo(self.dtype).max if self.dtype.kind in "iu" else None
+        self.tam_bloque = tam_bloque
+        self.bloques = {}  # (bx, by) -> arreglo [x % tam, y % tam]
+        self._heap = []
+        self._positivas = 0
+
+    def _leer(self, indice):
+        x, y = divmod(indice, self.alto)
+        tam = self.tam_bloque
+        bloque = self.bloques.get((x // tam, y // tam))
+        if bloque is None:
+            return 0.0
+        return float(bloque[x % tam, y % tam])
+
+    def _escribir(self, indice, valor):
+        x, y = divmod(indice, self.alto)
+        tam = self.tam_bloque
+        clave = (x // tam, y // tam)
+        bloque = self.bloques.get(clave)
+        if bloque is None:
+            if not valor:
+                return  # Un cero en un bloque que no existe no cambia nada
+            import numpy as np
+
+            bloque = self.bloques[clave] = np.zeros((tam, tam), dtype=self.dtype)
+        if self._tope is not None:
+            valor = min(valor, self._tope)
+        bloque[x % tam, y % tam] = valor
+
+    def _entradas_positivas(self):
+        import numpy as np
+
+        tam = self.tam_bloque
+        todos_indices = []
+        todos_valores = []
+        for (bx, by), bloque in self.bloques.items():
+            xs, ys = np.nonzero(bloque > 0)
+            todos_indices.append((xs + bx * tam) * self.alto + (ys + by * tam))
+            todos_valores.append(bloque[xs, ys])
+        if not todos_indices:
+            return []
+        valores = np.concatenate(todos_valores).astype(np.float64)
+        return list(zip((-valores).tolist(), np.concatenate(todos_indices).tolist()))
+
+    def a_denso(self):
+        """Arreglo [x, y] float64 armado desde los bloques (cuesta O(ancho x alto))"""
+        import numpy as np
+
+        denso = np.zeros((self.ancho, self.alto))
+        tam = self.tam_bloque
+        for (bx, by), bloque in self.bloques.items():
+            x0, y0 = bx * tam, by * tam
+            x1, y1 = min(self.ancho, x0 + tam), min(self.alto, y0 + tam)
+            denso[x0:x1, y0:y1] = bloque[:x1 - x0, :y1 - y0]
+        return denso
+
+    def ventana(self, x0, y0, ancho, alto):
+        """Arreglo [x, y] float64 de la ventana, armado solo con los bloques que la tocan"""
+        import numpy as np
+
+        x1, y1 = min(self.ancho, x0 + ancho), min(self.alto, y0 + alto)
+        ventana = np.zeros((x1 - x0, y1 - y0))
+        tam = self.tam_bloque
+        for bx in range(x0 // tam, (x1 - 1) // tam + 1):
+            for by in range(y0 // tam, (y1 - 1) // tam + 1):
+                bloque = self.bloques.get((bx, by))
+                if bloque is None:
+                    continue
+                # Intersección del bloque con la ventana
+                ax0, ay0 = max(x0, bx * tam), max(y0, by * tam)
+                ax1, ay1 = min(x1, (bx + 1) * tam), min(y1, (by + 1) * tam)
+                ventana[ax0 - x0:ax1 - x0, ay0 - y0:ay1 - y0] = bloque[
+                    ax0 - bx * tam:ax1 - bx * tam, ay0 - by * tam:ay1 - by * tam]
+        return ventana
+
+    def memoria_bytes(self):
+        return sum(bloque.nbytes for bloque in self.bloques.values())
+
+    def cargar_bloques(self, bloques):
+        """Reemplaza todos los bloques ({(bx, by): arreglo}, sin copiarlos) y rehace el heap"""
+        self.bloques = dict(bloques)
+        self._reconstruir()
+        self._positivas = len(self._heap)
@@ -0,0 +1,327 @@
+"""Métricas en vivo de simulaciones largas.
+
+Un RegistroMetricas guarda contadores y medidores con etiquetas y los expone
+en formato de texto de Prometheus (ServidorMetricas, solo en localhost) o
+los vuelca cada tanto a un archivo JSONL (VolcadorJSONL). Los bucles
+'simular_*' aceptan 'metricas' (una MetricasSimulacion):
+
+    registro = metricas.RegistroMetricas()
+    with metricas.ServidorMetricas(registro, puerto=9464), \\
+            metricas.VolcadorJSONL(registro, "metricas.jsonl", intervalo=30):
+        simular_multi_agente(pasos=10 ** 6, metricas=metricas.MetricasSimulacion(registro))
+
+o desde la consola: python metricas.py cooperacion --episodios 1000 --puerto 9464
+
+Por tick solo se cuenta el tick y se lee el reloj. Lo demás (restante,
+puntos por agente, mensajes, cache de campos) se lee cada 'intervalo'
+segundos, así que los valores expuestos pueden tener ese atraso.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TIPO_CONTENIDO = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Metrica:
+    """Contador ("counter") o medidor ("gauge"), con una serie por combinación de etiquetas"""
+
+    def __init__(self, nombre, tipo, ayuda, etiquetas=()):
+        self.nombre = nombre
+        self.tipo = tipo
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self.valores = {}  # tupla de valores de las etiquetas -> número
+
+    def fijar(self, valor, *etiquetas):
+        self.valores[etiquetas] = valor
+
+    def sumar(self, valor=1, *etiquetas):
+        self.valores[etiquetas] = self.valores.get(etiquetas, 0) + valor
+
+    def quitar(self, *etiquetas):
+        self.valores.pop(etiquetas, None)
+
+    def series(self):
+        # list() copia de una vez: el hilo de la simulación puede estar escribiendo
+        return list(self.valores.items())
+
+
+class RegistroMetricas:
+    def __init__(self):
+        self.metricas = {}  # nombre -> Metrica
+
+    def _obtener(self, nombre, tipo, ayuda, etiquetas):
+        metrica = self.metricas.get(nombre)
+        if metrica is None:
+            metrica = self.metricas[nombre] = Metrica(nombre, tipo, ayuda, etiquetas)
+        elif metrica.tipo != tipo or metrica.etiquetas != tuple(etiquetas):
+            raise ValueError(f"La métrica {nombre} ya existe como {metrica.tipo} "
+                             f"con etiquetas {metrica.etiquetas}")
+        return metrica
+
+    def contador(self, nombre, ayuda, etiquetas=()):
+        return self._obtener(nombre, "counter", ayuda, etiquetas)
+
+    def medidor(self, nombre, ayuda, etiquetas=()):
+        return self._obtener(nombre, "gauge", ayuda, etiquetas)
+
+    def texto_prometheus(self):
+        """Todas las métricas en el formato de texto de Prometheus (0.0.4)"""
+        lineas = []
+        for metrica in list(self.metricas.values()):
+            lineas.append(f"# HELP {metrica.nombre} {_escapar(metrica.ayuda, comillas=False)}")
+            lineas.append(f"# TYPE {metrica.nombre} {metrica.tipo}")
+            for valores, valor in metrica.series():
+                if valores:
+                    pares = ",".join(f'{etiqueta}="{_escapar(str(v))}"'
+                                     for etiqueta, v in zip(metrica.etiquetas, valores))
+                    lineas.append(f"{metrica.nombre}{{{pares}}} {_numero(valor)}")
+                else:
+                    lineas.append(f"{metrica.nombre} {_numero(valor)}")
+        return "\n".join(lineas) + "\n"
+
+    def instantanea(self):
+        """{nombre: [{"etiquetas": {...}, "valor": v}, ...]} serializable a JSON"""
+        return {metrica.nombre: [{"etiquetas": dict(zip(metrica.etiquetas, valores)),
+                                  "valor": valor}
+                                 for valores, valor in metrica.series()]
+                for metrica in list(self.metricas.values())}
+
+
+def _escapar(texto, comillas=True):
+    texto = texto.replace("\\", "\\\\").replace("\n", "\\n")
+    return texto.replace('"', '\\"') if comillas else texto
+
+
+def _numero(valor):
+    if isinstance(valor, float) and valor != valor:
+        return "NaN"
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class MetricasSimulacion:
+    """Métricas de los bucles 'simular_*' en un RegistroMetricas.
+
+    El bucle llama a 'iniciar' con funciones que leen el estado (restante,
+    puntos por agente y, si existen, mensajes en las bandejas, el bus y la
+    cache de campos), a 'paso' en cada tick y a 'terminar' al salir. Con más
+    de 'max_agentes' agentes solo se exporta el total de puntos.
+    """
+
+    def __init__(self, registro, escenario="simulacion", intervalo=1.0, max_agentes=50,
+                 reloj=time.monotonic):
+        self.escenario = escenario
+        self.intervalo = intervalo
+        self.max_agentes = max_agentes
+        self.reloj = reloj
+        e = ("escenario",)
+        self.m_ticks = registro.contador("simulacion_ticks_total", "Ticks simulados", e)
+        self.m_episodios = registro.contador("simulacion_episodios_total",
+                                             "Episodios terminados", e)
+        self.m_tps = registro.medidor("simulacion_ticks_por_segundo",
+                                      "Ticks por segundo desde la muestra anterior", e)
+        self.m_restante = registro.medidor("simulacion_restante",
+                                           "Comida o suciedad que queda en el entorno", e)
+        self.m_puntos = registro.medidor("simulacion_puntos", "Puntos de todos los agentes", e)
+        self.m_puntos_agente = registro.medidor("simulacion_puntos_agente", "Puntos por agente",
+                                                ("escenario", "agente"))
+        self.m_bandejas = registro.medidor("agentes_mensajes_en_bandeja",
+                                           "Mensajes en las bandejas de los agentes", e)
+        self.m_publicados = registro.contador("bus_mensajes_publicados_total",
+                                              "Mensajes publicados en el bus", e)
+        self.m_entregados = registro.contador("bus_mensajes_entregados_total",
+                                              "Mensajes entregados por el bus", e)
+        self.m_aciertos = registro.contador("cache_campos_aciertos_total",
+                                            "Aciertos de la cache de campos de flujo", e)
+        self.m_fallos = registro.contador("cache_campos_fallos_total",
+                                          "Fallos de la cache de campos de flujo", e)
+        self.m_tasa = registro.medidor("cache_campos_tasa_aciertos",
+                                       "Aciertos sobre consultas de la cache de campos", e)
+        self._pendientes = 0   # Ticks todavía no sumados a 'm_ticks'
+        self._proxima = 0.0
+        self._anterior = None  # (momento, ticks) de la muestra anterior
+        self._agentes = set()  # Etiquetas 'agente' exportadas
+        self._base_bus = self._base_cache = (0, 0)
+        self._fuentes = None
+
+    def iniciar(self, restante, puntos, mensajes=None, bus=None, cache=None):
+        """'restante' y 'mensajes' retornan un número; 'puntos', {id: puntos}.
+
+        Los contadores del bus y de la cache son acumulados: se suman
+        respecto de su valor al iniciar, así siguen creciendo entre episodios.
+        """
+        self._fuentes = (restante, puntos, mensajes, bus, cache)
+        if bus is not None:
+            self._base_bus = (bus.publicados, bus.entregados)
+        if cache is not None:
+            self._base_cache = (cache.aciertos, cache.fallos)
+        self._proxima = 0.0  # Muestra en el primer tick
+        self._muestrear(self.reloj())
+
+    def paso(self):
+        self._pendientes += 1
+        ahora = self.reloj()
+        if ahora >= self._proxima:
+            self._muestrear(ahora)
+
+    def terminar(self):
+        self._muestrear(self.reloj())
+        self.m_episodios.sumar(1, self.escenario)
+        self._fuentes = None
+
+    def _muestrear(self, ahora):
+        e = self.escenario
+        self._proxima = ahora + self.intervalo
+        self.m_ticks.sumar(self._pendientes, e)
+        ticks = self.m_ticks.valores[(e,)]
+        self._pendientes = 0
+        if self._anterior is not None and ahora > self._anterior[0]:
+            self.m_tps.fijar((ticks - self._anterior[1]) / (ahora - self._anterior[0]), e)
+        self._anterior = (ahora, ticks)
+        if self._fuentes is None:
+            return
+
+        restante, puntos, mensajes, bus, cache = self._fuentes
+        self.m_restante.fijar(restante(), e)
+        por_agente = puntos()
+        self.m_puntos.fijar(sum(por_agente.values()), e)
+        if len(por_agente) <= self.max_agentes:
+            for agente, valor in por_agente.items():
+                self.m_puntos_agente.fijar(valor, e, str(agente))
+            for agente in self._agentes - {str(a) for a in por_agente}:
+                self.m_puntos_agente.quitar(e, agente)
+            self._agentes = {str(a) for a in por_agente}
+        if mensajes is not None:
+            self.m_bandejas.fijar(mensajes(), e)
+        if bus is not None:
+            publicados, entregados = bus.publicados, bus.entregados
+            self.m_publicados.sumar(publicados - self._base_bus[0], e)
+            self.m_entregados.sumar(entregados - self._base_bus[1], e)
+            self._base_bus = (publicados, entregados)
+        if cache is not None:
+            aciertos, fallos = cache.aciertos, cache.fallos
+            self.m_aciertos.sumar(aciertos - self._base_cache[0], e)
+            self.m_fallos.sumar(fallos - self._base_cache[1], e)
+            self._base_cache = (aciertos, fallos)
+            consultas = aciertos + fallos
+            self.m_tasa.fijar(aciertos / consultas if consultas else 0.0, e)
+
+
+class ServidorMetricas:
+    """Servidor HTTP en un hilo de fondo: GET /metrics con el texto de Prometheus.
+
+    Escucha solo en 'host' (127.0.0.1 por defecto); con puerto=0 el sistema
+    elige uno libre y queda en 'puerto'.
+    """
+
+    def __init__(self, registro, puerto=9464, host="127.0.0.1"):
+        registro_http = registro
+
+        class Manejador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                cuerpo = registro_http.texto_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", TIPO_CONTENIDO)
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, *args):
+                pass  # Sin una línea por consulta en la consola
+
+        self.servidor = ThreadingHTTPServer((host, puerto), Manejador)
+        self.servidor.daemon_threads = True
+        self.host, self.puerto = self.servidor.server_address[:2]
+        self._hilo = threading.Thread(target=self.servidor.serve_forever,
+                                      name="servidor-metricas", daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        if self._hilo is None:
+            return
+        self.servidor.shutdown()
+        self.servidor.server_close()
+        self._hilo.join()
+        self._hilo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.detener()
+
+
+class VolcadorJSONL:
+    """Agrega a 'ruta' una línea JSON con todas las métricas cada 'intervalo' segundos
+    (y una última al detener)"""
+
+    def __init__(self, registro, ruta, intervalo=10.0):
+        self.registro = registro
+        self.ruta = ruta
+        self.intervalo = intervalo
+        self.lineas = 0
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._volcar_cada_intervalo,
+                                      name="volcador-metricas", daemon=True)
+        self._hilo.start()
+
+    def volcar(self):
+        linea = json.dumps({"tiempo": time.time(), "metricas": self.registro.instantanea()})
+        with open(self.ruta, "a", encoding="utf-8") as archivo:
+            archivo.write(linea + "\n")
+        self.lineas += 1
+
+    def _volcar_cada_intervalo(self):
+        while not self._detener.wait(self.intervalo):
+            self.volcar()
+
+    def detener(self):
+        if self._hilo is None:
+            return
+        self._detener.set()
+        self._hilo.join()
+        self._hilo = None
+        self.volcar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.detener()
+
+
+if __name__ == "__main__":
+    import argparse
+    from contextlib import ExitStack
+
+    from experimentos import ESCENARIOS, ejecutar_episodio
+
+    parser = argparse.ArgumentParser(description="Episodios seguidos con métricas en vivo")
+    parser.add_argument("escenario", choices=sorted(ESCENARIOS))
+    parser.add_argument("--episodios", type=int, default=1000)
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla del primer episodio")
+    parser.add_argument("--pasos", type=int, default=None)
+    parser.add_argument("--puerto", type=int, default=9464, help="0 = sin servidor HTTP")
+    parser.add_argument("--jsonl", default=None, help="Archivo JSONL para los volcados")
+    parser.add_argument("--intervalo-jsonl", type=float, default=10.0)
+    args = parser.parse_args()
+
+    registro = RegistroMetricas()
+    metricas = MetricasSimulacion(registro, args.escenario)
+    parametros = {"metricas": metricas}
+    if args.pasos is not None:
+        parametros["pasos"] = args.pasos
+    with ExitStack() as pila:
+        if args.puerto:
+            servidor = pila.enter_context(ServidorMetricas(registro, args.puerto))
+            print(f"Métricas en http://{servidor.host}:{servidor.puerto}/metrics")
+        if args.jsonl:
+            pila.enter_context(VolcadorJSONL(registro, args.jsonl, args.intervalo_jsonl))
+        for semilla in range(args.semilla, args.semilla + args.episodios):
+            ejecutar_episodio(args.escenario, semilla, parametros)
+    print(registro.texto_prometheus(), end="")
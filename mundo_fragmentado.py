@@ -0,0 +1,247 @@
+import multiprocessing as mp
+import os
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from poblacion_vectorizada import PoblacionCompetitiva
+
+# Columnas de un agente en tránsito entre teselas (coordenadas globales)
+_ID, _X, _Y, _OBJ_X, _OBJ_Y, _PUNTOS = range(6)
+
+
+def _limites(total, partes):
+    """Bordes de 'partes' franjas casi iguales de [0, total)"""
+    return np.linspace(0, total, partes + 1).astype(np.int64)
+
+
+def _a_filas(ids, poblacion, mascara, ox, oy):
+    """Agentes seleccionados por 'mascara' como filas (k, 6) en coordenadas globales"""
+    filas = np.empty((int(np.count_nonzero(mascara)), 6), dtype=np.int64)
+    filas[:, _ID] = ids[mascara]
+    filas[:, _X] = poblacion.x[mascara] + ox
+    filas[:, _Y] = poblacion.y[mascara] + oy
+    for columna, objetivo, origen in ((_OBJ_X, poblacion.objetivo_x, ox),
+                                      (_OBJ_Y, poblacion.objetivo_y, oy)):
+        valores = objetivo[mascara]
+        filas[:, columna] = np.where(valores >= 0, valores + origen, -1)
+    filas[:, _PUNTOS] = poblacion.puntos[mascara]
+    return filas
+
+
+def _trabajador(conexion, nombre, ancho, alto, tesela, radio, semilla, barrera):
+    """Proceso de una tesela: avanza a sus agentes sobre una copia local de
+    la tesela más un halo de 'radio' celdas y escribe de vuelta solo su tesela.
+
+    'barrera' (compartida por todas las teselas) separa las copias de los
+    halos de las escrituras: ninguna tesela escribe antes de que todas copien.
+    Si este proceso falla, aborta la barrera para no dejar a las demás
+    esperando; si la abortó otra tesela (o 'cerrar'), termina sin error.
+
+    Órdenes: ("paso", inmigrantes) -> emigrantes | ("estado", None) -> filas | ("fin", None)
+    """
+    memoria = shared_memory.SharedMemory(name=nombre)
+    mundo = np.ndarray((ancho, alto), dtype=bool, buffer=memoria.buf)
+    x0, x1, y0, y1 = tesela
+    # El halo cubre la percepción de los agentes del borde
+    hx0, hx1 = max(0, x0 - radio), min(ancho, x1 + radio)
+    hy0, hy1 = max(0, y0 - radio), min(alto, y1 + radio)
+    poblacion = PoblacionCompetitiva(hx1 - hx0, hy1 - hy0, mundo[hx0:hx1, hy0:hy1],
+                                     [], [], radio, semilla)
+    ids = np.empty(0, dtype=np.int64)
+
+    try:
+        while True:
+            orden, datos = conexion.recv()
+            if orden == "fin":
+                break
+            if orden == "estado":
+                conexion.send(_a_filas(ids, poblacion, np.ones(ids.size, dtype=bool), hx0, hy0))
+                continue
+
+            # Traspaso: los inmigrantes llegan al inicio del tick
+            if len(datos):
+                actuales = _a_filas(ids, poblacion, np.ones(ids.size, dtype=bool), hx0, hy0)
+                filas = np.concatenate((actuales, datos))
+                ids = filas[:, _ID].copy()
+                poblacion.x = filas[:, _X] - hx0
+                poblacion.y = filas[:, _Y] - hy0
+                poblacion.objetivo_x = np.where(filas[:, _OBJ_X] >= 0, filas[:, _OBJ_X] - hx0, -1)
+                poblacion.objetivo_y = np.where(filas[:, _OBJ_Y] >= 0, filas[:, _OBJ_Y] - hy0, -1)
+                poblacion.puntos = filas[:, _PUNTOS].copy()
+
+            # Tesela + halo tal como quedaron al final del tick anterior
+            poblacion.comida = mundo[hx0:hx1, hy0:hy1].copy()
+            try:
+                barrera.wait()
+            except threading.BrokenBarrierError:
+                break  # Otra tesela falló o el mundo se está cerrando
+            poblacion.paso()
+            # Solo se recolecta en la propia celda, que es de esta tesela
+            mundo[x0:x1, y0:y1] = poblacion.comida[x0 - hx0:x1 - hx0, y0 - hy0:y1 - hy0]
+
+            gx = poblacion.x + hx0
+            gy = poblacion.y + hy0
+            fuera = (gx < x0) | (gx >= x1) | (gy < y0) | (gy >= y1)
+            emigrantes = _a_filas(ids, poblacion, fuera, hx0, hy0)
+            if emigrantes.size:
+                quedan = ~fuera
+                ids = ids[quedan]
+                poblacion.x = poblacion.x[quedan]
+                poblacion.y = poblacion.y[quedan]
+                poblacion.objetivo_x = poblacion.objetivo_x[quedan]
+                poblacion.objetivo_y = poblacion.objetivo_y[quedan]
+                poblacion.puntos = poblacion.puntos[quedan]
+            conexion.send(emigrantes)
+    except BaseException:
+        barrera.abort()
+        raise
+    finally:
+        del mundo, poblacion
+        memoria.close()
+
+
+class MundoFragmentado:
+    """Mundo de AgenteCompetitivo repartido en teselas, una por proceso.
+
+    La comida vive en 'multiprocessing.shared_memory'. En cada tick, cada
+    proceso copia su tesela con un halo del radio de percepción, avanza a sus
+    agentes con el núcleo de PoblacionCompetitiva y escribe de vuelta su
+    tesela. Los agentes que cruzan un borde se traspasan al terminar el tick.
+    Una barrera entre procesos asegura que todos copian su halo antes de que
+    cualquiera escriba, así el resultado no depende de cómo se intercalen.
+
+    La comida del halo se ve como estaba al inicio del tick: lo que otra
+    tesela recolecte en el mismo tick se ve en el siguiente.
+    """
+
+    # Segundos que 'cerrar' espera a cada proceso antes de terminarlo
+    ESPERA_CIERRE = 5
+
+    def __init__(self, ancho, alto, num_agentes, num_comida, teselas=(2, 2), radio=5,
+                 semilla=None):
+        self.ancho = ancho
+        self.alto = alto
+        self.ticks = 0
+        inicial = PoblacionCompetitiva.aleatoria(ancho, alto, num_agentes, num_comida,
+                                                 radio, semilla)
+        self.comida_inicial = inicial.comida_restante()
+
+        self._bordes_x = _limites(ancho, teselas[0])
+        self._bordes_y = _limites(alto, teselas[1])
+        semillas = np.random.SeedSequence(semilla).spawn(teselas[0] * teselas[1])
+        self._conexiones = []
+        self._procesos = []
+        self._barrera = mp.Barrier(teselas[0] * teselas[1])
+        self.comida = None
+        self._memoria = shared_memory.SharedMemory(create=True, size=max(1, ancho * alto))
+        try:
+            self.comida = np.ndarray((ancho, alto), dtype=bool, buffer=self._memoria.buf)
+            self.comida[:] = inicial.comida
+            for i in range(teselas[0]):
+                for j in range(teselas[1]):
+                    tesela = (int(self._bordes_x[i]), int(self._bordes_x[i + 1]),
+                              int(self._bordes_y[j]), int(self._bordes_y[j + 1]))
+                    propia, remota = mp.Pipe()
+                    proceso = mp.Process(target=_trabajador,
+                                         args=(remota, self._memoria.name, ancho, alto,
+                                               tesela, radio, semillas[len(self._procesos)],
+                                               self._barrera),
+                                         daemon=True)
+                    self._conexiones.append(propia)
+                    proceso.start()
+                    remota.close()  # Así, si el proceso muere, 'recv' da EOFError
+                    self._procesos.append(proceso)
+
+            ids = np.arange(1, num_agentes + 1)
+            filas = np.column_stack((ids, inicial.x, inicial.y, inicial.objetivo_x,
+                                     inicial.objetivo_y, inicial.puntos))
+            self._pendientes = self._repartir(filas)
+        except BaseException:
+            # Sin esto, un fallo al lanzar los procesos deja la memoria compartida sin liberar
+            self.cerrar()
+            raise
+
+    def _repartir(self, filas):
+        """Agrupa filas de agentes por la tesela que contiene su posición"""
+        i = np.searchsorted(self._bordes_x[1:], filas[:, _X], side="right")
+        j = np.searchsorted(self._bordes_y[1:], filas[:, _Y], side="right")
+        tesela = i * (len(self._bordes_y) - 1) + j
+        return [filas[tesela == t] for t in range(len(self._procesos))]
+
+    def paso(self):
+        """Un tick en todas las teselas a la vez, con traspaso al final"""
+        for conexion, inmigrantes in zip(self._conexiones, self._pendientes):
+            conexion.send(("paso", inmigrantes))
+        # Esperar a todas las teselas funciona como barrera entre ticks
+        emigrantes = np.concatenate([conexion.recv() for conexion in self._conexiones])
+        self._pendientes = self._repartir(emigrantes)
+        self.ticks += 1
+
+    def agentes(self):
+        """Filas (id, x, y, objetivo_x, objetivo_y, puntos) de todos los agentes, por id"""
+        for conexion in self._conexiones:
+            conexion.send(("estado", None))
+        filas = np.concatenate([conexion.recv() for conexion in self._conexiones] +
+                               self._pendientes)
+        return filas[np.argsort(filas[:, _ID])]
+
+    def comida_restante(self):
+        return int(np.count_nonzero(self.comida))
+
+    def cerrar(self):
+        """Termina los procesos y libera la memoria compartida.
+
+        Funciona aunque algún proceso haya muerto: se aborta la barrera para
+        liberar a las teselas que esperan, se ignoran las conexiones rotas y
+        los procesos que no terminan en ESPERA_CIERRE segundos se matan.
+        """
+        if self._memoria is None:
+            return
+        try:
+            self._barrera.abort()
+            for conexion in self._conexiones:
+                try:
+                    conexion.send(("fin", None))
+                except OSError:  # BrokenPipeError: el proceso ya no está
+                    pass
+            for proceso in self._procesos:
+                proceso.join(self.ESPERA_CIERRE)
+                if proceso.is_alive():
+                    proceso.terminate()
+                    proceso.join()
+        finally:
+            for conexion in self._conexiones:
+                conexion.close()
+            self.comida = None
+            self._memoria.close()
+            self._memoria.unlink()
+            self._memoria = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+if __name__ == "__main__":
+    print("=== MUNDO FRAGMENTADO: UNA TESELA POR PROCESO ===\n")
+    lado, num_agentes, ticks = 4000, 400_000, 10
+    print(f"{lado}x{lado}, {num_agentes} agentes, {os.cpu_count()} núcleos")
+    for teselas in ((1, 1), (2, 1), (2, 2), (4, 2)):
+        with MundoFragmentado(lado, lado, num_agentes, num_comida=num_agentes * 2,
+                              teselas=teselas, semilla=0) as mundo:
+            mundo.paso()  # Calentamiento
+            inicio = time.perf_counter()
+            for _ in range(ticks):
+                mundo.paso()
+            por_tick = (time.perf_counter() - inicio) / ticks
+            agentes = mundo.agentes()
+            # Conservación: ningún agente ni comida se pierde en los traspasos
+            assert len(agentes) == num_agentes
+            assert agentes[:, _PUNTOS].sum() + mundo.comida_restante() == mundo.comida_inicial
+            print(f"  {teselas[0]}x{teselas[1]} teselas: {por_tick * 1000:8.2f} ms/tick "
+                  f"({num_agentes / por_tick:,.0f} agentes/s)")
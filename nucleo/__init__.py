@@ -0,0 +1,17 @@
+"""Núcleo común de las simulaciones.
+
+- EntornoBase (entorno.py): grid con es_valido, mover_agente, 'sembrar'
+  (generación del mundo, con o sin GeneradorMundo) y 'mostrar' por capas.
+- Capas (capas.py): cómo se dibuja cada estructura del entorno (set de
+  celdas, dict de valores o plano de NumPy).
+- BucleTicks (ticks.py): el bucle de pasos con perfilado, métricas,
+  condiciones de corte y checkpoints.
+- Agente y AgenteConIntencion (agente.py): el protocolo de los agentes.
+
+Los entornos y agentes de cada escenario heredan de aquí, así una mejora
+en el núcleo llega a todas las simulaciones a la vez.
+"""
+from nucleo.agente import Agente, AgenteConIntencion
+from nucleo.capas import ICONOS_SUCIEDAD, VALORES, CapaCeldas, CapaPlano, CapaValores
+from nucleo.entorno import EntornoBase
+from nucleo.ticks import BucleTicks, turnos_aleatorios
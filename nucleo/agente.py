@@ -0,0 +1,49 @@
+import random
+from abc import ABC, abstractmethod
+
+
+class Agente:
+    """Agente ubicado en una celda (x, y) del grid.
+
+    Es lo único que EntornoBase necesita para moverlo ('mover_agente') y
+    dibujarlo ('mostrar'); cada agente define cómo percibe y decide.
+    """
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    @property
+    def posicion(self):
+        return (self.x, self.y)
+
+
+class AgenteConIntencion(Agente, ABC):
+    """Agente en dos fases, el protocolo del tick sincrónico (tick_sincrono.py):
+
+    - decidir(vista, rng): elige qué hacer contra una vista de solo lectura
+      del entorno y retorna una Intencion, sin modificar nada.
+    - aplicar(intencion): ejecuta la intención sobre el entorno real.
+
+    Las subclases implementan ambas con esta misma firma: lo que cada agente
+    necesite además (p. ej. a quién enviar mensajes) va en sus atributos.
+    En el tick secuencial cada agente decide y aplica a su turno
+    ('decidir_y_actuar'). Necesita 'id' (prioridad y semilla del tick
+    sincrónico) y 'entorno'.
+    """
+
+    def __init__(self, id, x, y, entorno):
+        super().__init__(x, y)
+        self.id = id
+        self.entorno = entorno
+
+    @abstractmethod
+    def decidir(self, vista, rng=random):
+        """Retorna la Intencion del agente sin modificar nada"""
+
+    @abstractmethod
+    def aplicar(self, intencion):
+        """Ejecuta la Intencion sobre el entorno real"""
+
+    def decidir_y_actuar(self):
+        self.aplicar(self.decidir(self.entorno))
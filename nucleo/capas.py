@@ -0,0 +1,57 @@
+"""Capas del grid: cómo se dibuja cada estructura de celdas de un entorno.
+
+Cada capa nombra el atributo del entorno que guarda sus datos, así los
+entornos conservan sus estructuras ('suciedad', 'comida', 'obstaculos') y
+EntornoBase.mostrar las recorre en orden, de menor a mayor prioridad.
+"""
+
+# Valores posibles de la suciedad y de la comida, e íconos de la suciedad por valor
+VALORES = (1, 2, 3)
+ICONOS_SUCIEDAD = {1: "💧", 2: "💩", 3: "☣️"}
+
+
+class CapaCeldas:
+    """Conjunto de celdas (set de (x, y), o las claves de un dict) con un solo ícono"""
+
+    def __init__(self, atributo, icono):
+        self.atributo = atributo
+        self.icono = icono
+
+    def dibujar(self, grid, datos):
+        icono = self.icono
+        for x, y in datos:
+            grid[y][x] = icono
+
+
+class CapaValores:
+    """dict (x, y) -> valor; el ícono sale de 'iconos' (o es el valor mismo si es None)"""
+
+    def __init__(self, atributo, iconos=None, desconocido="❓"):
+        self.atributo = atributo
+        self.iconos = iconos
+        self.desconocido = desconocido
+
+    def dibujar(self, grid, datos):
+        if self.iconos is None:
+            for (x, y), icono in datos.items():
+                grid[y][x] = icono
+            return
+        obtener, desconocido = self.iconos.get, self.desconocido
+        for (x, y), valor in datos.items():
+            grid[y][x] = obtener(valor, desconocido)
+
+
+class CapaPlano:
+    """Arreglo denso indexado [x, y] (0 = vacío), como los planos de NumPy de
+    EntornoGridDenso. Solo usa '.nonzero()' e indexación: no importa NumPy."""
+
+    def __init__(self, atributo, iconos, desconocido="❓"):
+        self.atributo = atributo
+        self.iconos = iconos
+        self.desconocido = desconocido
+
+    def dibujar(self, grid, datos):
+        xs, ys = datos.nonzero()
+        obtener, desconocido = self.iconos.get, self.desconocido
+        for x, y, valor in zip(xs.tolist(), ys.tolist(), datos[xs, ys].tolist()):
+            grid[y][x] = obtener(valor, desconocido)
@@ -0,0 +1,85 @@
+import random
+
+import renderizador
+
+class EntornoBase:
+    """Grid de ancho x alto con capas (ver capas.py) y agentes encima.
+
+    Las subclases guardan cada capa en su propio atributo y la declaran en
+    CAPAS para que 'mostrar' la dibuje. 'sembrar' llena una capa con celdas
+    al azar, con o sin GeneradorMundo.
+    """
+
+    CAPAS = ()          # Capas en orden de dibujo (la última queda encima)
+    VACIO = "⬜"
+    ICONO_AGENTE = "🤖"
+
+    def __init__(self, ancho, alto):
+        self.ancho = ancho
+        self.alto = alto
+
+    def es_valido(self, x, y):
+        """Verifica si la posición está dentro del grid"""
+        return 0 <= x < self.ancho and 0 <= y < self.alto
+
+    def mover_agente(self, agente, direccion):
+        """Mueve el agente en la dirección especificada, sin salir del grid"""
+        if direccion == "arriba" and agente.y > 0:
+            agente.y -= 1
+        elif direccion == "abajo" and agente.y < self.alto - 1:
+            agente.y += 1
+        elif direccion == "izquierda" and agente.x > 0:
+            agente.x -= 1
+        elif direccion == "derecha" and agente.x < self.ancho - 1:
+            agente.x += 1
+
+    def sembrar(self, destino, cantidad, valores=None, evitar=(), distintas=False,
+                generador=None):
+        """Agrega 'cantidad' celdas al azar a la capa 'destino'.
+
+        'destino' es un set de (x, y) o, si hay 'valores', un dict
+        (x, y) -> valor elegido al azar entre 'valores'. Sin generador, cada
+        celda se sortea con 'random' y se vuelve a sortear si cae en alguna
+        capa de 'evitar' o, con 'distintas', si ya está en 'destino' (sin
+        'distintas' las repetidas se pierden o se pisan). Con un GeneradorMundo
+        las celdas son siempre distintas y no caen en 'evitar', sin reintentos.
+        """
+        if generador is not None:
+            ocupadas = evitar[0] if len(evitar) == 1 else set().union(*evitar)
+            celdas = generador.celdas(self.ancho, self.alto, cantidad, ocupadas=ocupadas)
+            if valores is None:
+                destino.update(celdas)
+            else:
+                destino.update(zip(celdas, generador.rng.choices(valores, k=len(celdas))))
+            return
+
+        x_max, y_max = self.ancho - 1, self.alto - 1
+        reintentar = distintas or bool(evitar)
+        for _ in range(cantidad):
+            while True:
+                pos = (random.randint(0, x_max), random.randint(0, y_max))
+                if not reintentar or not ((distintas and pos in destino)
+                                          or any(pos in capa for capa in evitar)):
+                    break
+            if valores is None:
+                destino.add(pos)
+            else:
+                destino[pos] = random.choice(valores)
+
+    def icono_agente(self, agente):
+        return self.ICONO_AGENTE
+
+    def mostrar(self, agentes):
+        """Dibuja las capas y encima los agentes ('agentes' puede ser uno solo),
+        un cuadro por escritura"""
+        if not renderizador.listo():
+            return
+        fila_vacia = [self.VACIO] * self.ancho
+        grid = [fila_vacia[:] for _ in range(self.alto)]
+        for capa in self.CAPAS:
+            capa.dibujar(grid, getattr(self, capa.atributo))
+        if not isinstance(agentes, (list, tuple)):
+            agentes = (agentes,)
+        for agente in agentes:
+            grid[agente.y][agente.x] = self.icono_agente(agente)
+        renderizador.dibujar(grid)
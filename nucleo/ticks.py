@@ -0,0 +1,59 @@
+import random
+
+import perfilado
+
+
+class BucleTicks:
+    """Bucle de pasos común a todos los 'simular_*'.
+
+    Cada tick: marca el inicio para el perfilador, llama a 'actuar(paso)',
+    marca el fin, avisa a las métricas y llama a 'observar(paso)' (registro y
+    dibujo, fuera del tiempo medido). Después corta si 'detener()' (p. ej. sin
+    energía) o 'terminado()' (objetivo cumplido: 'completado') dan True, y si
+    no, llama a 'guardar(paso)' (checkpoints). 'paso' empieza en 0; al
+    reanudar, en 'paso_inicial'.
+
+    'metricas' es una MetricasSimulacion ya iniciada: el bucle llama a su
+    'paso()' en cada tick y a 'terminar()' al salir.
+    """
+
+    def __init__(self, pasos, paso_inicial=0, metricas=None):
+        self.pasos = pasos
+        self.paso_inicial = paso_inicial
+        self.metricas = metricas
+        self.pasos_dados = paso_inicial
+        self.completado = False
+        self.detenido = False
+
+    def ejecutar(self, actuar, observar=None, terminado=None, detener=None, guardar=None):
+        metricas = self.metricas
+        for paso in range(self.paso_inicial, self.pasos):
+            self.pasos_dados = paso + 1
+            perfilado.inicio_tick()  # Funciones vacías sin perfilador (ver perfilado.py)
+            actuar(paso)
+            perfilado.fin_tick()
+            if metricas is not None:
+                metricas.paso()
+
+            if observar is not None:
+                observar(paso)
+
+            if detener is not None and detener():
+                self.detenido = True
+                break
+            if terminado is not None and terminado():
+                self.completado = True
+                break
+
+            if guardar is not None:
+                guardar(paso)
+
+        if metricas is not None:
+            metricas.terminar()
+        return self
+
+
+def turnos_aleatorios(agentes):
+    """Orden de actuación del tick: al azar, para que ningún agente tenga
+    siempre la ventaja de actuar primero"""
+    return random.sample(agentes, len(agentes))
@@ -0,0 +1,295 @@
+"""Perfilado opcional por fases del ciclo de los agentes.
+
+Con un Perfilador activo, los métodos de cada fase (percibir, decidir,
+actuar, procesar mensajes, consultas y cambios del entorno, dibujo...) se
+envuelven con un temporizador de perf_counter_ns y un contador de llamadas,
+y los bucles 'simular_*' marcan el inicio y el fin de cada tick para armar
+un histograma de latencia por tick:
+
+    with perfilado.usar(perfilado.Perfilador()) as perfilador:
+        simular_recoleccion(pasos=200, graficar=False)
+    print(perfilador.reporte())
+
+o desde la consola: python perfilado.py areas_comida --pasos 200
+
+Sin perfilador activo las clases quedan intactas, y 'inicio_tick' y
+'fin_tick' son funciones vacías, como los niveles filtrados de 'eventos'. El
+costo es de dos llamadas vacías por tick.
+
+Las fases anidadas (p. ej. 'procesar_mensajes' dentro de 'decidir') se
+cuentan en el total de la externa; el tiempo "propio" descuenta las fases
+internas. Con un 'ejecutor' de hilos cada hilo lleva su propia pila, pero
+las sumas no se sincronizan; con procesos, lo que corre en otros procesos
+no se mide.
+"""
+import functools
+import importlib
+import threading
+import time
+from contextlib import contextmanager
+
+# Fases instrumentadas: módulo -> {clase: métodos}
+# (los métodos heredados se instrumentan en la clase que los define)
+FASES = {
+    "nucleo.entorno": {"EntornoBase": ("mover_agente", "mostrar")},
+    "agentReact_Memoria": {
+        "SimpleLimpiezaAgente": ("percibir", "decidir_y_actuar"),
+        "EntornoGrid": ("limpiar",),
+    },
+    "agenReact_TiposSuciedad": {
+        "SimpleLimpiezaAgente": ("percibir", "decidir_y_actuar"),
+        "EntornoGrid": ("limpiar",),
+    },
+    "agentReact_Obstaculos": {
+        "SimpleLimpiezaAgente": ("percibir", "decidir_y_actuar"),
+        "EntornoGrid": ("limpiar",),
+    },
+    "entorno_denso": {
+        "EntornoGridDenso": ("limpiar",),
+    },
+    "agentObjet_AreasComida": {
+        "AgenteRecolector": ("percibir", "decidir", "actuar", "planificar_ruta", "seguir_campo"),
+        "EntornoRecoleccion": ("obtener_comida_visible", "recolectar_comida"),
+    },
+    "competirRecursos_multiagente": {
+        "AgenteCompetitivo": ("percibir", "decidir", "aplicar"),
+        "EntornoMultiAgente": ("obtener_comida_cercana", "recolectar_comida"),
+    },
+    "evitarObjetivos_multiagente": {
+        "AgenteCooperativo": ("procesar_mensajes", "percibir", "decidir", "aplicar",
+                              "enviar_mensaje"),
+        "EntornoMultiAgente": ("obtener_comida_cercana", "recolectar_comida"),
+    },
+    "bus_mensajes": {"BusMensajes": ("publicar", "entregar")},
+    "planificador": {"CacheCamposFlujo": ("campo",)},
+    "asignacion": {"AsignadorObjetivos": ("asignar",)},
+}
+
+
+class HistogramaLatencia:
+    """Histograma de latencias en nanosegundos con cubetas de potencias de 2.
+
+    La cubeta b cuenta los valores en [2**(b-1), 2**b): memoria fija y
+    percentiles con error menor a un factor 2 (acotados por el máximo real).
+    """
+
+    def __init__(self):
+        self.cubetas = [0] * 65
+        self.cantidad = 0
+        self.suma = 0
+        self.minimo = None
+        self.maximo = 0
+
+    def agregar(self, ns):
+        self.cubetas[ns.bit_length()] += 1
+        self.cantidad += 1
+        self.suma += ns
+        if self.minimo is None or ns < self.minimo:
+            self.minimo = ns
+        if ns > self.maximo:
+            self.maximo = ns
+
+    def media(self):
+        return self.suma / self.cantidad if self.cantidad else 0.0
+
+    def percentil(self, p):
+        """Cota superior del percentil 'p' (0-100), en ns"""
+        if not self.cantidad:
+            return 0
+        objetivo = p / 100 * self.cantidad
+        acumulado = 0
+        for b, conteo in enumerate(self.cubetas):
+            acumulado += conteo
+            if conteo and acumulado >= objetivo:
+                return min(1 << b, self.maximo)
+        return self.maximo
+
+    def rangos(self):
+        """[(desde_ns, hasta_ns, conteo)] de las cubetas entre la primera y la última usadas"""
+        usadas = [b for b, conteo in enumerate(self.cubetas) if conteo]
+        if not usadas:
+            return []
+        return [(1 << (b - 1) if b else 0, 1 << b, self.cubetas[b])
+                for b in range(usadas[0], usadas[-1] + 1)]
+
+
+class Perfilador:
+    """Tiempos y llamadas por fase, y latencia por tick"""
+
+    def __init__(self, fases=None, reloj=time.perf_counter_ns):
+        self.fases_instrumentadas = FASES if fases is None else fases
+        self.reloj = reloj
+        # "modulo:Clase.metodo" -> [llamadas, ns totales, ns propios]
+        self.fases = {}
+        self.ticks = HistogramaLatencia()
+        self._inicio_tick = None
+        self._local = threading.local()
+        self._originales = []  # (clase, método, función original)
+
+    def instrumentar(self):
+        """Envuelve los métodos de FASES (importa sus módulos)"""
+        if self._originales:
+            return
+        for nombre_modulo, clases in self.fases_instrumentadas.items():
+            modulo = importlib.import_module(nombre_modulo)
+            for nombre_clase, metodos in clases.items():
+                clase = getattr(modulo, nombre_clase)
+                for metodo in metodos:
+                    original = clase.__dict__.get(metodo)
+                    if not callable(original):
+                        continue  # Heredado o no es una función: se omite
+                    clave = f"{nombre_modulo}:{nombre_clase}.{metodo}"
+                    self._originales.append((clase, metodo, original))
+                    setattr(clase, metodo, self._envolver(original, clave))
+
+    def desinstrumentar(self):
+        """Restaura los métodos originales"""
+        for clase, metodo, original in reversed(self._originales):
+            setattr(clase, metodo, original)
+        self._originales = []
+
+    def _envolver(self, original, clave):
+        fase = self.fases.setdefault(clave, [0, 0, 0])
+        reloj = self.reloj
+        local = self._local
+
+        @functools.wraps(original)
+        def envoltura(*args, **kwargs):
+            # Pila por hilo con el tiempo de las fases anidadas de cada nivel
+            pila = local.__dict__.setdefault("pila", [])
+            pila.append(0)
+            inicio = reloj()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                total = reloj() - inicio
+                anidadas = pila.pop()
+                if pila:
+                    pila[-1] += total
+                fase[0] += 1
+                fase[1] += total
+                fase[2] += total - anidadas
+        return envoltura
+
+    def inicio_tick(self):
+        self._inicio_tick = self.reloj()
+
+    def fin_tick(self):
+        if self._inicio_tick is not None:
+            self.ticks.agregar(self.reloj() - self._inicio_tick)
+            self._inicio_tick = None
+
+    def resumen(self):
+        """Diccionario serializable: fases con llamadas y ns, y latencia por tick"""
+        return {
+            "fases": {clave: {"llamadas": llamadas, "total_ns": total, "propio_ns": propio}
+                      for clave, (llamadas, total, propio) in self.fases.items() if llamadas},
+            "ticks": {
+                "cantidad": self.ticks.cantidad,
+                "media_ns": self.ticks.media(),
+                "min_ns": self.ticks.minimo or 0,
+                "max_ns": self.ticks.maximo,
+                **{f"p{p}_ns": self.ticks.percentil(p) for p in (50, 90, 99)},
+                "histograma": self.ticks.rangos(),
+            },
+        }
+
+    def reporte(self, ancho_barra=40):
+        """Reporte de fin de corrida en texto"""
+        ticks = self.ticks
+        lineas = [f"=== PERFIL: {ticks.cantidad} ticks ===", ""]
+        if ticks.cantidad:
+            lineas.append(
+                f"Latencia por tick: media {_formato_ns(ticks.media())}, "
+                f"p50 {_formato_ns(ticks.percentil(50))}, p90 {_formato_ns(ticks.percentil(90))}, "
+                f"p99 {_formato_ns(ticks.percentil(99))}, máx {_formato_ns(ticks.maximo)}")
+            mayor = max(conteo for _, _, conteo in ticks.rangos())
+            for desde, hasta, conteo in ticks.rangos():
+                barra = "#" * round(conteo / mayor * ancho_barra)
+                lineas.append(f"  [{_formato_ns(desde):>9}, {_formato_ns(hasta):>9})  "
+                              f"{barra:<{ancho_barra}} {conteo}")
+            lineas.append("")
+
+        usadas = [(clave, datos) for clave, datos in self.fases.items() if datos[0]]
+        usadas.sort(key=lambda item: item[1][2], reverse=True)
+        propio_total = sum(datos[2] for _, datos in usadas) or 1
+        ancho = max((len(clave) for clave, _ in usadas), default=4)
+        lineas.append("Fases por tiempo propio (sin las fases anidadas):")
+        lineas.append(f"  {'fase':<{ancho}} {'llamadas':>9} {'total':>10} {'propio':>10} "
+                      f"{'por llamada':>11} {'%':>6}")
+        for clave, (llamadas, total, propio) in usadas:
+            lineas.append(f"  {clave:<{ancho}} {llamadas:>9} {_formato_ns(total):>10} "
+                          f"{_formato_ns(propio):>10} {_formato_ns(total / llamadas):>11} "
+                          f"{propio / propio_total:>6.1%}")
+        return "\n".join(lineas)
+
+
+def _formato_ns(ns):
+    for unidad, escala in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= escala:
+            return f"{ns / escala:.2f} {unidad}"
+    return f"{ns:.0f} ns"
+
+
+def _nada():
+    pass
+
+
+def configurar(perfilador):
+    """Activa 'perfilador' (None desactiva). Retorna el anterior."""
+    global _perfilador, inicio_tick, fin_tick
+    anterior = _perfilador
+    if anterior is not None:
+        anterior.desinstrumentar()
+    _perfilador = perfilador
+    if perfilador is None:
+        inicio_tick = fin_tick = _nada
+    else:
+        perfilador.instrumentar()
+        inicio_tick = perfilador.inicio_tick
+        fin_tick = perfilador.fin_tick
+    return anterior
+
+
+def actual():
+    return _perfilador
+
+
+@contextmanager
+def usar(perfilador):
+    """Perfila dentro del bloque 'with' y luego restaura el estado anterior"""
+    anterior = configurar(perfilador)
+    try:
+        yield perfilador
+    finally:
+        configurar(anterior)
+
+
+# Por defecto, sin perfilado
+_perfilador = None
+inicio_tick = fin_tick = _nada
+
+
+if __name__ == "__main__":
+    import argparse
+
+    # Los bucles 'simular_*' usan el módulo importado, no este '__main__'
+    import perfilado
+    from experimentos import ESCENARIOS, ejecutar_episodio
+
+    parser = argparse.ArgumentParser(description="Perfil por fases de un episodio")
+    parser.add_argument("escenario", choices=sorted(ESCENARIOS))
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--pasos", type=int, default=None)
+    parser.add_argument("--agentes", type=int, default=None,
+                        help="Agentes (escenarios multi-agente)")
+    args = parser.parse_args()
+
+    parametros = {}
+    if args.pasos is not None:
+        parametros["pasos"] = args.pasos
+    if args.agentes is not None:
+        parametros["num_agentes"] = args.agentes
+    with perfilado.usar(perfilado.Perfilador()) as perfilador:
+        ejecutar_episodio(args.escenario, args.semilla, parametros)
+    print(perfilador.reporte())
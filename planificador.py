@@ -0,0 +1,210 @@
+import heapq
+from array import array
+from collections import OrderedDict, deque
+
+# Códigos de movimiento, en el mismo orden que exploraba planificar_ruta
+DIRECCIONES = ("arriba", "abajo", "izquierda", "derecha")
+
+_LIBRE = 255     # Celda libre aún no alcanzada
+_BLOQUEADA = 254
+# bloqueos (0 libre / 1 obstáculo) -> estado inicial de la búsqueda
+_ESTADO_INICIAL = bytes([_LIBRE, _BLOQUEADA]) + bytes(254)
+
+
+def mapa_bloqueos(entorno):
+    """bytearray plano (índice y * ancho + x) con 1 en cada obstáculo"""
+    bloqueos = bytearray(entorno.ancho * entorno.alto)
+    for (x, y) in entorno.obstaculos:
+        bloqueos[y * entorno.ancho + x] = 1
+    return bloqueos
+
+
+def planificar(ancho, alto, bloqueos, inicio, objetivo, a_estrella=False):
+    """Ruta de 'inicio' a 'objetivo' como deque de direcciones.
+
+    Cada celda guarda solo el código del movimiento con que se llegó a ella
+    (un byte); el camino se reconstruye una vez al final. Retorna un deque
+    vacío si el objetivo no es alcanzable o si ya se está en él.
+    """
+    ox, oy = int(inicio[0]), int(inicio[1])
+    dx, dy = int(objetivo[0]), int(objetivo[1])
+    if not (0 <= dx < ancho and 0 <= dy < alto) or (ox, oy) == (dx, dy):
+        return deque()
+    origen = oy * ancho + ox
+    destino = dy * ancho + dx
+    if bloqueos[destino]:
+        return deque()
+
+    # Un byte por celda: libre, bloqueada o código de movimiento (0..3)
+    via = bytearray(bloqueos).translate(_ESTADO_INICIAL)
+    via[origen] = _BLOQUEADA  # No volver al origen
+
+    if a_estrella:
+        encontrado = _a_estrella(ancho, alto, via, origen, destino, dx, dy)
+    else:
+        encontrado = _bfs(ancho, alto, via, origen, destino)
+    if not encontrado:
+        return deque()
+
+    # Reconstrucción: retroceder desde el destino siguiendo los códigos
+    retroceso = (-ancho, ancho, -1, 1)
+    camino = deque()
+    idx = destino
+    while idx != origen:
+        movimiento = via[idx]
+        camino.appendleft(DIRECCIONES[movimiento])
+        idx -= retroceso[movimiento]
+    return camino
+
+
+def _bfs(ancho, alto, via, origen, destino):
+    ultima_fila = (alto - 1) * ancho
+    cola = [origen]
+    # Recorrer la lista mientras crece funciona como cola FIFO sin tuplas
+    for idx in cola:
+        if idx == destino:
+            return True
+        x = idx % ancho
+        if idx >= ancho and via[idx - ancho] == _LIBRE:
+            via[idx - ancho] = 0
+            cola.append(idx - ancho)
+        if idx < ultima_fila and via[idx + ancho] == _LIBRE:
+            via[idx + ancho] = 1
+            cola.append(idx + ancho)
+        if x > 0 and via[idx - 1] == _LIBRE:
+            via[idx - 1] = 2
+            cola.append(idx - 1)
+        if x < ancho - 1 and via[idx + 1] == _LIBRE:
+            via[idx + 1] = 3
+            cola.append(idx + 1)
+    return False
+
+
+def _a_estrella(ancho, alto, via, origen, destino, dx, dy):
+    ultima_fila = (alto - 1) * ancho
+    costo = array("i", [-1]) * (ancho * alto)  # -1 = sin costo conocido
+    costo[origen] = 0
+    y0, x0 = divmod(origen, ancho)
+    # (f, -g, índice): a igual f se expande primero el nodo más profundo
+    abiertos = [(abs(x0 - dx) + abs(y0 - dy), 0, origen)]
+    while abiertos:
+        _, g, idx = heapq.heappop(abiertos)
+        g = -g
+        if idx == destino:
+            return True
+        if g > costo[idx]:
+            continue  # Entrada obsoleta
+        y, x = divmod(idx, ancho)
+        g += 1
+        for vecino, movimiento, valido in (
+                (idx - ancho, 0, idx >= ancho),
+                (idx + ancho, 1, idx < ultima_fila),
+                (idx - 1, 2, x > 0),
+                (idx + 1, 3, x < ancho - 1)):
+            if not valido or via[vecino] == _BLOQUEADA:
+                continue
+            if costo[vecino] == -1 or g < costo[vecino]:
+                costo[vecino] = g
+                via[vecino] = movimiento
+                vy, vx = divmod(vecino, ancho)
+                heapq.heappush(abiertos, (g + abs(vx - dx) + abs(vy - dy), -g, vecino))
+    return False
+
+
+# Código de campo de flujo para la celda objetivo (0..3 son direcciones)
+EN_OBJETIVO = 4
+
+
+def campo_de_flujo(ancho, alto, bloqueos, objetivo):
+    """BFS inverso desde 'objetivo': para cada celda, el código de la dirección
+    que acerca al objetivo por un camino mínimo.
+
+    Celdas bloqueadas valen 254 e inalcanzables 255; el objetivo vale EN_OBJETIVO.
+    """
+    campo = bytearray(bloqueos).translate(_ESTADO_INICIAL)
+    tx, ty = int(objetivo[0]), int(objetivo[1])
+    if not (0 <= tx < ancho and 0 <= ty < alto):
+        return campo
+    destino = ty * ancho + tx
+    if campo[destino] == _BLOQUEADA:
+        return campo
+    campo[destino] = EN_OBJETIVO
+
+    ultima_fila = (alto - 1) * ancho
+    cola = [destino]
+    for idx in cola:
+        x = idx % ancho
+        # El vecino de arriba debe moverse "abajo" (1) para llegar a idx, etc.
+        if idx >= ancho and campo[idx - ancho] == _LIBRE:
+            campo[idx - ancho] = 1
+            cola.append(idx - ancho)
+        if idx < ultima_fila and campo[idx + ancho] == _LIBRE:
+            campo[idx + ancho] = 0
+            cola.append(idx + ancho)
+        if x > 0 and campo[idx - 1] == _LIBRE:
+            campo[idx - 1] = 3
+            cola.append(idx - 1)
+        if x < ancho - 1 and campo[idx + 1] == _LIBRE:
+            campo[idx + 1] = 2
+            cola.append(idx + 1)
+    return campo
+
+
+class CacheCamposFlujo:
+    """Cache LRU de campos de flujo por celda objetivo.
+
+    Se vacía cuando cambia 'entorno.version_obstaculos'. Seguir un campo ya
+    calculado cuesta una lectura del bytearray por paso.
+    """
+
+    def __init__(self, entorno, capacidad=16):
+        self.entorno = entorno
+        self.capacidad = capacidad
+        self.campos = OrderedDict()  # (x, y) -> bytearray, del menos al más reciente
+        self.version = entorno.version_obstaculos
+        self._bloqueos = None
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidaciones = 0
+
+    def _validar(self):
+        if self.version != self.entorno.version_obstaculos:
+            self.campos.clear()
+            self._bloqueos = None
+            self.version = self.entorno.version_obstaculos
+            self.invalidaciones += 1
+
+    def bloqueos(self):
+        """Mapa de bloqueos de la versión actual de los obstáculos"""
+        self._validar()
+        if self._bloqueos is None:
+            self._bloqueos = mapa_bloqueos(self.entorno)
+        return self._bloqueos
+
+    def campo(self, objetivo):
+        """Campo de flujo hacia 'objetivo' (calculado o tomado de la cache)"""
+        self._validar()
+        clave = (int(objetivo[0]), int(objetivo[1]))
+        campo = self.campos.get(clave)
+        if campo is not None:
+            self.aciertos += 1
+            self.campos.move_to_end(clave)
+            return campo
+
+        self.fallos += 1
+        campo = campo_de_flujo(self.entorno.ancho, self.entorno.alto, self.bloqueos(), clave)
+        self.campos[clave] = campo
+        if len(self.campos) > self.capacidad:
+            self.campos.popitem(last=False)  # Expulsar el menos usado
+        return campo
+
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+            "invalidaciones": self.invalidaciones,
+            "tamano": len(self.campos),
+            "capacidad": self.capacidad,
+        }
@@ -0,0 +1,231 @@
+import math
+import random
+import time
+
+import numpy as np
+
+# Movimientos del paseo aleatorio, en el orden de AgenteCompetitivo
+_PASEO = np.array([(0, 1), (0, -1), (1, 0), (-1, 0)], dtype=np.int64)
+
+
+def _desplazamientos_por_distancia(radio):
+    """Desplazamientos con |dx| + |dy| <= radio, agrupados por distancia euclídea"""
+    grupos = {}
+    for dx in range(-radio, radio + 1):
+        for dy in range(-radio, radio + 1):
+            if abs(dx) + abs(dy) <= radio:
+                grupos.setdefault(dx * dx + dy * dy, []).append((dx, dy))
+    return [np.array(grupos[d], dtype=np.int64) for d in sorted(grupos)]
+
+
+class PoblacionCompetitiva:
+    """Población de AgenteCompetitivo guardada como estructura de arreglos.
+
+    Posiciones, objetivos y puntos son arreglos NumPy y cada tick se calcula
+    para todos los agentes a la vez: elección de la comida visible más cercana
+    (distancia euclídea dentro del radio Manhattan), paso en X y luego en Y,
+    y conflictos de recolección (gana el agente con el turno más temprano).
+    """
+
+    def __init__(self, ancho, alto, comida, x, y, radio=5, semilla=None):
+        self.ancho = ancho
+        self.alto = alto
+        self.radio = radio
+        self.rng = np.random.default_rng(semilla)
+
+        self.comida = np.asarray(comida, dtype=bool).copy()  # [x, y] como mapa_comida
+        self.x = np.asarray(x, dtype=np.int64).copy()
+        self.y = np.asarray(y, dtype=np.int64).copy()
+        self.objetivo_x = np.full(self.x.size, -1, dtype=np.int64)  # -1 = sin objetivo
+        self.objetivo_y = np.full(self.x.size, -1, dtype=np.int64)
+        self.puntos = np.zeros(self.x.size, dtype=np.int64)
+
+        self._grupos = _desplazamientos_por_distancia(radio)
+        self._turno_recogida = np.zeros(ancho * alto, dtype=np.int64)
+
+    @classmethod
+    def aleatoria(cls, ancho, alto, num_agentes, num_comida, radio=5, semilla=None):
+        """Mundo aleatorio: comida en celdas distintas y agentes fuera de la comida"""
+        rng = np.random.default_rng(semilla)
+        celdas = rng.choice(ancho * alto, size=num_comida, replace=False)
+        comida = np.zeros(ancho * alto, dtype=bool)
+        comida[celdas] = True
+        libres = np.flatnonzero(~comida)
+        inicio = libres[rng.integers(0, libres.size, num_agentes)]
+        return cls(ancho, alto, comida.reshape(ancho, alto), inicio // alto, inicio % alto,
+                   radio, rng.integers(2 ** 63))
+
+    @classmethod
+    def desde_objetos(cls, entorno, agentes, radio=5, semilla=None):
+        """Copia el estado de un EntornoMultiAgente y sus AgenteCompetitivo"""
+        comida = np.zeros((entorno.ancho, entorno.alto), dtype=bool)
+        if entorno.comida:
+            cx, cy = zip(*entorno.comida)
+            comida[list(cx), list(cy)] = True
+        poblacion = cls(entorno.ancho, entorno.alto, comida,
+                        [a.x for a in agentes], [a.y for a in agentes], radio, semilla)
+        for i, agente in enumerate(agentes):
+            if agente.objetivo:
+                poblacion.objetivo_x[i], poblacion.objetivo_y[i] = agente.objetivo
+            poblacion.puntos[i] = agente.comida_recolectada
+        return poblacion
+
+    def comida_restante(self):
+        return int(np.count_nonzero(self.comida))
+
+    def paso(self):
+        """Un tick para toda la población.
+
+        Reproduce el orden aleatorio de 'random.sample' con un turno por agente:
+        la comida recolectada en el tick deja de ser visible solo para los
+        agentes con turno posterior al del que la tomó.
+        """
+        x, y, ox, oy = self.x, self.y, self.objetivo_x, self.objetivo_y
+        n = x.size
+        turno = np.empty(n, dtype=np.int64)
+        turno[self.rng.permutation(n)] = np.arange(n)
+        alto = self.alto
+        comida = self.comida.reshape(-1)
+        recogida = self._turno_recogida  # Turno en que se tomó cada celda (n = no)
+        recogida[:] = n
+        moviendo = np.ones(n, dtype=bool)
+
+        # Primera ola: agentes que ya estaban sobre su objetivo
+        con_objetivo = np.flatnonzero(ox >= 0)
+        celda_objetivo = ox[con_objetivo] * alto + oy[con_objetivo]
+        sobre = con_objetivo[comida[celda_objetivo] &
+                             (ox[con_objetivo] == x[con_objetivo]) &
+                             (oy[con_objetivo] == y[con_objetivo])]
+        celdas_tomadas = [self._recolectar(sobre, turno, moviendo)]
+
+        # Objetivos que ya no están cuando le toca a cada agente
+        con_objetivo = np.flatnonzero((ox >= 0) & moviendo)
+        celda_objetivo = ox[con_objetivo] * alto + oy[con_objetivo]
+        visible = comida[celda_objetivo] & (recogida[celda_objetivo] >= turno[con_objetivo])
+        tomados = con_objetivo[~visible]
+        ox[tomados] = -1
+        oy[tomados] = -1
+
+        nuevos = np.flatnonzero((ox < 0) & moviendo)
+        self._elegir_objetivos(nuevos, turno)
+
+        # Segunda ola: objetivo recién elegido en la propia celda
+        sobre = nuevos[(ox[nuevos] >= 0) & (ox[nuevos] == x[nuevos]) & (oy[nuevos] == y[nuevos])]
+        sobre = sobre[recogida[x[sobre] * alto + y[sobre]] == n]
+        celdas_tomadas.append(self._recolectar(sobre, turno, moviendo))
+
+        for celdas in celdas_tomadas:
+            comida[celdas] = False
+
+        # Paso hacia el objetivo: primero en X, si no, en Y
+        persiguen = np.flatnonzero(moviendo & (ox >= 0))
+        dx = np.sign(ox[persiguen] - x[persiguen])
+        dy = np.sign(oy[persiguen] - y[persiguen])
+        en_x = dx != 0
+        x[persiguen[en_x]] += dx[en_x]
+        y[persiguen[~en_x]] += dy[~en_x]
+
+        # Paseo aleatorio para los que no tienen objetivo
+        pasean = np.flatnonzero(moviendo & (ox < 0))
+        direccion = _PASEO[self.rng.integers(0, 4, pasean.size)]
+        nx = x[pasean] + direccion[:, 0]
+        ny = y[pasean] + direccion[:, 1]
+        validos = (nx >= 0) & (nx < self.ancho) & (ny >= 0) & (ny < self.alto)
+        x[pasean[validos]] = nx[validos]
+        y[pasean[validos]] = ny[validos]
+
+    def _recolectar(self, sobre, turno, moviendo):
+        """Recolección de los agentes 'sobre' su objetivo. Por celda gana el de
+        turno más temprano, que no se mueve en este tick; los demás verán la
+        celda vacía y elegirán otro objetivo. Retorna las celdas tomadas."""
+        if sobre.size == 0:
+            return sobre
+        orden = sobre[np.argsort(turno[sobre], kind="stable")]
+        celdas = self.x[orden] * self.alto + self.y[orden]
+        celdas_unicas, primeros = np.unique(celdas, return_index=True)
+        ganadores = orden[primeros]
+        self.puntos[ganadores] += 1
+        self._turno_recogida[celdas_unicas] = turno[ganadores]
+        self.objetivo_x[ganadores] = -1
+        self.objetivo_y[ganadores] = -1
+        moviendo[ganadores] = False
+        return celdas_unicas
+
+    def _elegir_objetivos(self, sin_objetivo, turno):
+        """Comida más cercana dentro del radio, probando desplazamientos de
+        menor a mayor distancia (empates en orden aleatorio)"""
+        comida = self.comida.reshape(-1)
+        recogida = self._turno_recogida
+        pendientes = sin_objetivo
+        for grupo in self._grupos:
+            if pendientes.size == 0:
+                break
+            for dx, dy in grupo[self.rng.permutation(len(grupo))]:
+                nx = self.x[pendientes] + dx
+                ny = self.y[pendientes] + dy
+                dentro = np.flatnonzero((nx >= 0) & (nx < self.ancho) &
+                                        (ny >= 0) & (ny < self.alto))
+                celdas = nx[dentro] * self.alto + ny[dentro]
+                hay = np.zeros(pendientes.size, dtype=bool)
+                hay[dentro] = comida[celdas] & (recogida[celdas] >= turno[pendientes[dentro]])
+                elegidos = pendientes[hay]
+                self.objetivo_x[elegidos] = nx[hay]
+                self.objetivo_y[elegidos] = ny[hay]
+                pendientes = pendientes[~hay]
+                if pendientes.size == 0:
+                    break
+
+
+def comparar_con_objetos(episodios=300, num_agentes=3, pasos=25, semilla=0):
+    """Comida total recolectada por episodio en ambos modelos, desde el mismo
+    estado inicial. Retorna (media, IC 95%) de cada uno."""
+    import eventos
+    from competirRecursos_multiagente import AgenteCompetitivo, EntornoMultiAgente, ejecutar_paso
+
+    totales = {"objetos": [], "vectorizado": []}
+    with eventos.usar(eventos.silencioso()):
+        for episodio in range(episodios):
+            random.seed(semilla + episodio)
+            entorno = EntornoMultiAgente(10, 10)
+            agentes = []
+            for i in range(num_agentes):
+                while True:
+                    x, y = random.randint(0, 9), random.randint(0, 9)
+                    if (x, y) not in entorno.comida:
+                        agentes.append(AgenteCompetitivo(i + 1, x, y, entorno))
+                        break
+            poblacion = PoblacionCompetitiva.desde_objetos(entorno, agentes,
+                                                           semilla=semilla + episodio)
+            for _ in range(pasos):
+                ejecutar_paso(agentes)
+                poblacion.paso()
+            totales["objetos"].append(sum(a.comida_recolectada for a in agentes))
+            totales["vectorizado"].append(int(poblacion.puntos.sum()))
+
+    resumen = {}
+    for modelo, datos in totales.items():
+        media = sum(datos) / len(datos)
+        desv = math.sqrt(sum((d - media) ** 2 for d in datos) / (len(datos) - 1))
+        margen = 1.96 * desv / math.sqrt(len(datos))
+        resumen[modelo] = (media, (media - margen, media + margen))
+    return resumen
+
+
+if __name__ == "__main__":
+    print("=== POBLACIÓN VECTORIZADA DE AGENTES COMPETITIVOS ===\n")
+    print("Equivalencia con el modelo por objetos (10x10, 3 agentes, 25 pasos):")
+    for modelo, (media, (bajo, alto)) in comparar_con_objetos().items():
+        print(f"  {modelo:<12} comida total media {media:.3f}  IC 95% [{bajo:.3f}, {alto:.3f}]")
+
+    print("\nRendimiento (un núcleo):")
+    for num_agentes, lado in ((1_000, 200), (10_000, 600), (100_000, 2000), (300_000, 3500)):
+        poblacion = PoblacionCompetitiva.aleatoria(lado, lado, num_agentes,
+                                                   num_comida=num_agentes * 2, semilla=0)
+        poblacion.paso()  # Calentamiento
+        inicio = time.perf_counter()
+        ticks = 10
+        for _ in range(ticks):
+            poblacion.paso()
+        por_tick = (time.perf_counter() - inicio) / ticks
+        print(f"  {num_agentes:>7} agentes en {lado}x{lado}: {por_tick * 1000:8.2f} ms/tick "
+              f"({num_agentes / por_tick:,.0f} agentes/s)")
@@ -0,0 +1,113 @@
+"""Dibujo en consola de los cuadros de 'mostrar'.
+
+Los métodos 'mostrar' arman el cuadro como una lista de filas de celdas y
+llaman a 'renderizador.dibujar(filas)'. El renderizador activo escribe el
+cuadro completo con un solo 'write' o, en modo diferencial, solo las filas que
+cambiaron desde el cuadro anterior, ubicándolas con secuencias ANSI. Se
+redibujan filas enteras y no celdas sueltas porque el ancho en pantalla de
+los emojis ('☣️', '1️⃣') cambia según la terminal.
+
+Para mirar una corrida grande en el lugar, a 20 cuadros por segundo como
+máximo:
+
+    renderizador.configurar(renderizador.RenderizadorConsola(diferencial=True, fps_max=20))
+"""
+import sys
+import time
+from contextlib import contextmanager
+
+_LIMPIAR_PANTALLA = "\x1b[2J\x1b[H"
+_BORRAR_RESTO_LINEA = "\x1b[K"
+
+
+class RenderizadorConsola:
+    """Escribe cuadros de celdas con una sola escritura por cuadro"""
+
+    def __init__(self, salida=None, diferencial=False, fps_max=None, reloj=time.perf_counter):
+        self.salida = salida  # None = sys.stdout del momento
+        self.diferencial = diferencial
+        self.intervalo = 1.0 / fps_max if fps_max else 0.0
+        self.reloj = reloj
+        self._anterior = None  # Líneas del último cuadro dibujado (modo diferencial)
+        self._ultimo = None    # Momento del último cuadro dibujado
+        # Estadísticas
+        self.cuadros = 0
+        self.omitidos = 0
+        self.filas_escritas = 0
+
+    def listo(self):
+        """False si dibujar ahora superaría 'fps_max' (el cuadro se omite).
+        Se consulta antes de armar el cuadro para no hacer ese trabajo."""
+        if self.intervalo and self._ultimo is not None:
+            if self.reloj() - self._ultimo < self.intervalo:
+                self.omitidos += 1
+                return False
+        return True
+
+    def reiniciar(self):
+        """Olvida el cuadro anterior: el próximo se dibuja completo"""
+        self._anterior = None
+
+    def dibujar(self, filas):
+        lineas = [" ".join(fila) for fila in filas]
+        anterior = self._anterior
+
+        if not self.diferencial:
+            texto = "\n".join(lineas) + "\n\n"
+            escritas = len(lineas)
+        elif anterior is None or len(anterior) != len(lineas):
+            texto = _LIMPIAR_PANTALLA + "\n".join(lineas) + "\n"
+            escritas = len(lineas)
+        else:
+            partes = []
+            for i, linea in enumerate(lineas):
+                if linea != anterior[i]:
+                    partes.append(f"\x1b[{i + 1};1H{linea}{_BORRAR_RESTO_LINEA}")
+            # Dejar el cursor debajo del cuadro
+            partes.append(f"\x1b[{len(lineas) + 1};1H")
+            texto = "".join(partes)
+            escritas = len(partes) - 1
+
+        salida = self.salida or sys.stdout
+        salida.write(texto)
+        salida.flush()
+        if self.diferencial:
+            self._anterior = lineas
+        self._ultimo = self.reloj()
+        self.cuadros += 1
+        self.filas_escritas += escritas
+        return escritas
+
+
+def listo():
+    return _renderizador.listo()
+
+
+def dibujar(filas):
+    return _renderizador.dibujar(filas)
+
+
+def configurar(renderizador):
+    """Activa 'renderizador' para todos los 'mostrar'. Retorna el anterior."""
+    global _renderizador
+    anterior = _renderizador
+    _renderizador = renderizador
+    return anterior
+
+
+def actual():
+    return _renderizador
+
+
+@contextmanager
+def usar(renderizador):
+    """Usa 'renderizador' dentro del bloque 'with' y luego restaura el anterior"""
+    anterior = configurar(renderizador)
+    try:
+        yield renderizador
+    finally:
+        configurar(anterior)
+
+
+# Por defecto, cuadros completos sin límite de cuadros por segundo
+_renderizador = RenderizadorConsola()
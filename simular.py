@@ -0,0 +1,101 @@
+"""Punto de entrada único para correr cualquier escenario desde la consola.
+
+    python simular.py --listar
+    python simular.py obstaculos --pasos 50 --semilla 3 --ancho 12 --alto 12
+    python simular.py areas_comida --graficar png --ruta-grafico calor.png
+    python simular.py cooperacion --semilla 7 --nivel silencio --json
+
+Los escenarios salen de experimentos.ESCENARIOS y las opciones de cada uno,
+de la firma de su función 'simular_*' ('--pasos', '--semilla', '--ancho',
+'--alto', '--cobertura', ...). Solo se importa el módulo del escenario
+elegido, y NumPy y matplotlib se cargan recién si el modo elegido los usa
+('--denso', '--graficar', checkpoints, '--asignacion'...): una corrida corta
+sin esos modos arranca sin pagar su importación.
+"""
+import argparse
+import inspect
+import json
+
+import eventos
+from experimentos import ESCENARIOS, cargar_escenario
+
+NIVELES = {"detalle": eventos.DETALLE, "info": eventos.INFO, "silencio": eventos.SILENCIO}
+
+# Parámetros que reciben objetos de Python: no tienen opción en la consola
+SOLO_PYTHON = {"grabador", "metricas", "ejecutor"}
+
+
+def _valor(texto):
+    """Convierte un argumento de la consola: booleano, None, entero, real o texto"""
+    constantes = {"true": True, "false": False, "none": None}
+    if texto.lower() in constantes:
+        return constantes[texto.lower()]
+    for tipo in (int, float):
+        try:
+            return tipo(texto)
+        except ValueError:
+            pass
+    return texto
+
+
+def crear_parser(escenario=None, ayuda=True):
+    """Parser del lanzador; con 'escenario', incluye las opciones de su función"""
+    parser = argparse.ArgumentParser(description="Corre un escenario de simulación",
+                                     add_help=ayuda)
+    parser.add_argument("escenario", nargs="?", choices=sorted(ESCENARIOS))
+    parser.add_argument("--listar", action="store_true", help="Lista los escenarios y termina")
+    parser.add_argument("--nivel", choices=NIVELES, default="detalle",
+                        help="Mensajes en consola (por defecto: detalle)")
+    parser.add_argument("--json", action="store_true",
+                        help="Imprime el resultado como una línea JSON")
+    if escenario is None:
+        return parser
+
+    simular, por_defecto = cargar_escenario(escenario)
+    opciones = parser.add_argument_group(f"opciones de {ESCENARIOS[escenario][1]}")
+    for nombre, parametro in inspect.signature(simular).parameters.items():
+        if nombre in SOLO_PYTHON:
+            continue
+        defecto = por_defecto.get(nombre, parametro.default)
+        opcion = "--" + nombre.replace("_", "-")
+        # Solo los parámetros dados llegan a la función: el resto usa su valor por defecto
+        comunes = {"dest": nombre, "default": argparse.SUPPRESS,
+                   "help": f"(por defecto: {defecto})"}
+        if isinstance(defecto, bool):
+            # '--denso' equivale a '--denso true'; '--graficar png' también vale
+            opciones.add_argument(opcion, nargs="?", const=True, type=_valor, **comunes)
+        elif isinstance(defecto, (int, float, str)):
+            opciones.add_argument(opcion, type=type(defecto), **comunes)
+        else:
+            opciones.add_argument(opcion, type=_valor, **comunes)
+    return parser
+
+
+def main(argumentos=None):
+    # Primero solo el escenario: sus opciones dependen de la función que se importe
+    previo, _ = crear_parser(ayuda=False).parse_known_args(argumentos)
+    if previo.listar:
+        for nombre, (modulo, funcion, _) in sorted(ESCENARIOS.items()):
+            print(f"{nombre:<16} {modulo}.{funcion}")
+        return None
+    if previo.escenario is None:
+        parser = crear_parser()
+        parser.parse_args(argumentos)  # Atiende '--help'
+        parser.error("falta el escenario (ver --listar)")
+
+    args = vars(crear_parser(previo.escenario).parse_args(argumentos))
+    escenario = args.pop("escenario")
+    nivel = args.pop("nivel")
+    como_json = args.pop("json")
+    args.pop("listar")
+
+    simular, por_defecto = cargar_escenario(escenario)
+    with eventos.usar(eventos.RegistroEventos(nivel=NIVELES[nivel])):
+        resultado = simular(**dict(por_defecto, **args))
+    if como_json:
+        print(json.dumps(resultado, ensure_ascii=False, default=str))
+    return resultado
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Tick sincrónico en dos fases para las simulaciones multi-agente.
+
+1. Decisión: cada agente decide contra una vista de solo lectura del entorno
+   y retorna una Intencion, sin modificar nada. Como nadie escribe en esta
+   fase, las decisiones pueden correr en un pool de hilos o de procesos.
+2. Compromiso: las intenciones se aplican en un orden determinista que rota
+   con el tick. Si dos agentes quieren recolectar la misma comida, gana el
+   que va primero en esa rotación.
+"""
+import random
+from collections import namedtuple
+from itertools import repeat
+
+# objetivo: objetivo del agente tras decidir | recolectar: quiere recolectar en su celda
+# destino: posición tras moverse | mensajes: ((tipo, contenido), ...) a publicar
+# soltar: objetivo cuyo reclamo libera | reclamar: objetivo que reclama
+Intencion = namedtuple("Intencion", "objetivo recolectar destino mensajes soltar reclamar",
+                       defaults=((), None, None))
+
+_PASEO = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+
+class VistaEntorno:
+    """Vista de solo lectura de un EntornoMultiAgente para la fase de decisión"""
+
+    def __init__(self, entorno):
+        self._entorno = entorno
+        self.ancho = entorno.ancho
+        self.alto = entorno.alto
+
+    def es_valido(self, x, y):
+        return self._entorno.es_valido(x, y)
+
+    def hay_comida(self, x, y):
+        return self._entorno.hay_comida(x, y)
+
+    def obtener_comida_cercana(self, x, y, radio):
+        return self._entorno.obtener_comida_cercana(x, y, radio)
+
+
+def paso_hacia(x, y, objetivo, vista, rng=random):
+    """Movimiento de los agentes multi-agente: recolectar si está sobre el
+    objetivo, si no un paso en X (o en Y) hacia él, o un paso al azar.
+
+    Retorna (recolectar, destino).
+    """
+    if objetivo:
+        if (x, y) == objetivo:
+            return True, (x, y)
+        dx = 1 if objetivo[0] > x else (-1 if objetivo[0] < x else 0)
+        dy = 1 if objetivo[1] > y else (-1 if objetivo[1] < y else 0)
+
+        # Moverse primero en X, si no, en Y
+        if dx != 0 and vista.es_valido(x + dx, y):
+            return False, (x + dx, y)
+        if dy != 0 and vista.es_valido(x, y + dy):
+            return False, (x, y + dy)
+        return False, (x, y)
+
+    # Movimiento aleatorio si no hay objetivo
+    direccion = rng.choice(_PASEO)
+    nx, ny = x + direccion[0], y + direccion[1]
+    if vista.es_valido(nx, ny):
+        return False, (nx, ny)
+    return False, (x, y)
+
+
+def _decidir(agente, vista, semilla):
+    # Un generador por agente y tick: el resultado no depende de qué hilo
+    # o proceso ejecute la decisión
+    return agente.decidir(vista, random.Random(semilla))
+
+
+def ejecutar_tick_sincrono(agentes, entorno, tick, ejecutor=None):
+    """Ejecuta un tick en dos fases. 'ejecutor' es cualquier Executor de
+    concurrent.futures (None = decidir en el hilo actual)."""
+    vista = VistaEntorno(entorno)
+    base = random.getrandbits(64)
+    semillas = [hash((base, agente.id)) for agente in agentes]
+
+    # Fase 1: decisiones independientes
+    if ejecutor is None:
+        intenciones = [_decidir(a, vista, s) for a, s in zip(agentes, semillas)]
+    else:
+        # Pocos lotes grandes: con procesos, cada lote serializa una copia del mundo
+        lote = max(1, -(-len(agentes) // 8))
+        intenciones = list(ejecutor.map(_decidir, agentes, repeat(vista), semillas,
+                                        chunksize=lote))
+
+    # Fase 2: compromiso en orden rotativo
+    n = len(agentes)
+    if n == 0:
+        return
+    inicio = tick % n
+    for i in list(range(inicio, n)) + list(range(inicio)):
+        agentes[i].aplicar(intenciones[i])
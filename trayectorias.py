@@ -0,0 +1,156 @@
+import array
+import json
+import os
+import queue
+import sys
+import threading
+
+# Columnas de ancho fijo: nombre -> código de array.array (4, 4, 4, 4, 1 y 4 bytes)
+COLUMNAS = (("tick", "I"), ("agente", "I"), ("x", "i"), ("y", "i"),
+            ("accion", "B"), ("recompensa", "f"))
+_DTYPES = {"I": "u4", "i": "i4", "B": "u1", "f": "f4"}
+
+# Código de acción = posición en ACCIONES (None, sin acción, se guarda como "quieto")
+# Los nombres nuevos van al final: los códigos de grabaciones viejas no cambian
+ACCIONES = ("quieto", "arriba", "abajo", "izquierda", "derecha", "limpiar", "recolectar")
+CODIGOS = {accion: codigo for codigo, accion in enumerate(ACCIONES)}
+CODIGOS[None] = CODIGOS["quieto"]
+
+_MOVIMIENTOS = {(0, -1): "arriba", (0, 1): "abajo", (-1, 0): "izquierda", (1, 0): "derecha"}
+
+
+def accion_de_movimiento(x0, y0, x1, y1):
+    """Dirección del paso de (x0, y0) a (x1, y1), o "quieto" """
+    return _MOVIMIENTOS.get((x1 - x0, y1 - y0), "quieto")
+
+
+class GrabadorTrayectorias:
+    """Graba (tick, agente, x, y, acción, recompensa) por agente y por tick.
+
+    Cada columna va a su propio archivo '<columna>.col' en 'directorio', como
+    bytes crudos de ancho fijo, así que se lee con np.memmap (ver 'leer').
+    Las filas se juntan en bloques de 'filas_por_bloque' filas (array.array,
+    sin NumPy) y un hilo en segundo plano los escribe. La cola admite
+    'bloques_en_cola' bloques: si el disco no da abasto, 'registrar' espera
+    en lugar de acumular, y la memoria queda acotada (unos 21 bytes por fila
+    en cada bloque).
+    """
+
+    def __init__(self, directorio, filas_por_bloque=1 << 16, bloques_en_cola=4):
+        os.makedirs(directorio, exist_ok=True)
+        self.directorio = directorio
+        self.filas_por_bloque = filas_por_bloque
+        self.filas = 0
+        self._archivos = [open(os.path.join(directorio, f"{nombre}.col"), "wb")
+                          for nombre, _ in COLUMNAS]
+        self._cola = queue.Queue(maxsize=bloques_en_cola)
+        self._error = None
+        self._previos = None
+        self._nuevo_bloque()
+        self._hilo = threading.Thread(target=self._escribir, name="grabador-trayectorias",
+                                      daemon=True)
+        self._hilo.start()
+
+    def _nuevo_bloque(self):
+        self._bloque = tuple(array.array(codigo) for _, codigo in COLUMNAS)
+        # Métodos 'append' ya resueltos: 'registrar' es lo que más se llama
+        self._agregar = tuple(columna.append for columna in self._bloque)
+
+    def registrar(self, tick, agente, x, y, accion, recompensa=0):
+        """Agrega una fila; 'accion' es un nombre de ACCIONES o None"""
+        a_tick, a_agente, a_x, a_y, a_accion, a_recompensa = self._agregar
+        a_tick(tick)
+        a_agente(agente)
+        a_x(x)
+        a_y(y)
+        a_accion(CODIGOS[accion])
+        a_recompensa(recompensa)
+        if len(self._bloque[0]) >= self.filas_por_bloque:
+            self._enviar()
+
+    def antes_del_paso(self, agentes):
+        """Guarda posición y comida de cada agente (escenarios multi-agente)"""
+        self._previos = [(agente.x, agente.y, agente.comida_recolectada) for agente in agentes]
+
+    def despues_del_paso(self, tick, agentes):
+        """Registra a cada agente: la recompensa es la comida recolectada desde
+        'antes_del_paso'; la acción es "recolectar" si la hubo y, si no, sale
+        del cambio de posición"""
+        for agente, (x0, y0, comida) in zip(agentes, self._previos):
+            recompensa = agente.comida_recolectada - comida
+            if recompensa > 0:
+                accion = "recolectar"
+            else:
+                accion = accion_de_movimiento(x0, y0, agente.x, agente.y)
+            self.registrar(tick, agente.id, agente.x, agente.y, accion, recompensa)
+
+    def _enviar(self):
+        if self._error is not None:
+            raise self._error
+        self.filas += len(self._bloque[0])
+        self._cola.put(self._bloque)  # Espera si la cola está llena
+        self._nuevo_bloque()
+
+    def _escribir(self):
+        while True:
+            bloque = self._cola.get()
+            if bloque is None:
+                break
+            if self._error is not None:
+                continue  # Seguir vaciando la cola para no trabar 'registrar'
+            try:
+                for archivo, columna in zip(self._archivos, bloque):
+                    columna.tofile(archivo)
+            except OSError as error:
+                self._error = error
+
+    def cerrar(self):
+        """Escribe lo pendiente, espera al hilo y guarda 'meta.json'"""
+        if self._hilo is None:
+            return
+        if len(self._bloque[0]):
+            self._enviar()
+        self._cola.put(None)
+        self._hilo.join()
+        self._hilo = None
+        for archivo in self._archivos:
+            archivo.close()
+        if self._error is not None:
+            raise self._error
+        meta = {
+            "filas": self.filas,
+            "columnas": {nombre: _dtype(codigo) for nombre, codigo in COLUMNAS},
+            "acciones": ACCIONES,
+        }
+        with open(os.path.join(self.directorio, "meta.json"), "w", encoding="utf-8") as archivo:
+            json.dump(meta, archivo, indent=1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def _dtype(codigo):
+    orden = "<" if sys.byteorder == "little" else ">"
+    return orden + _DTYPES[codigo]
+
+
+def leer(directorio):
+    """{columna: np.memmap} de una grabación.
+
+    Las filas se cuentan por el tamaño de los archivos, así que también se
+    puede leer una grabación en curso o cortada (hasta el último bloque
+    escrito completo en todas las columnas).
+    """
+    import numpy as np
+
+    dtypes = {nombre: np.dtype(_dtype(codigo)) for nombre, codigo in COLUMNAS}
+    rutas = {nombre: os.path.join(directorio, f"{nombre}.col") for nombre in dtypes}
+    filas = min(os.path.getsize(rutas[nombre]) // dtype.itemsize
+                for nombre, dtype in dtypes.items())
+    if filas == 0:
+        return {nombre: np.empty(0, dtype=dtype) for nombre, dtype in dtypes.items()}
+    return {nombre: np.memmap(rutas[nombre], dtype=dtype, mode="r", shape=(filas,))
+            for nombre, dtype in dtypes.items()}